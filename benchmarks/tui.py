@@ -0,0 +1,320 @@
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import partial
+from importlib import metadata
+from pathlib import Path
+from typing import Final
+
+from textual.pilot import Pilot
+from textual.widgets import Button, Input, Select, Switch
+
+from sksmithy._cache import configure_render_cache
+from sksmithy._models import EstimatorType
+from sksmithy._skeletons import configure_skeletons, get_skeleton_table
+from sksmithy.tui import ForgeTUI
+from sksmithy.tui._components import FORGE_GROUP
+from sksmithy.tui._state import SWITCH_FIELDS
+from sksmithy.tui._tui import raw_preview
+
+RESULTS_DIR: Final[Path] = Path(__file__).parent / "results"
+
+# Lengths of the typed names and parameter lists, growing to expose work proportional to the input size
+NAME_LENGTHS: Final[tuple[int, ...]] = (8, 32, 128)
+PARAMS_LENGTHS: Final[tuple[int, ...]] = (2, 8, 32)
+
+# Relative increase of the p99 latency (or of the p99 memory) over the baseline reported as a regression
+REGRESSION_THRESHOLD: Final[float] = 0.25
+
+# An interaction of a session: its name, and the coroutine function performing it
+Interaction = tuple[str, Callable[[], Awaitable[None]]]
+
+
+@dataclass(frozen=True)
+class InteractionStats:
+    """Latency (in milliseconds) and peak memory allocated (in KiB) of an interaction, over all its samples."""
+
+    samples: int
+    p50_ms: float
+    p99_ms: float
+    p50_kib: float
+    p99_kib: float
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """Return the `q`-th percentile of `values` (nearest rank method), `nan` if `values` is empty."""
+    ordered = sorted(values)
+    if not ordered:
+        return math.nan
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def _settle(pilot: Pilot, wait_workers: bool = False) -> None:
+    """Wait for the app to handle all the pending messages, and optionally for its forge workers to complete.
+
+    `pilot.pause` waits for the process to be idle, polling with a granularity which would dominate the latency of
+    most interactions, hence the message queues of the app and its widgets are flushed instead. They are flushed
+    twice, to include the messages posted by the handlers of the first round (e.g. `Input.Changed`).
+    """
+    if wait_workers:
+        await pilot.app.workers.wait_for_complete(
+            [worker for worker in pilot.app.workers if worker.group == FORGE_GROUP and not worker.is_cancelled]
+        )
+    for _ in range(2):
+        await pilot._wait_for_screen()  # noqa: SLF001
+
+
+def _typing(pilot: Pilot, field: str, text: str, length: int) -> Iterable[Interaction]:
+    """Type `text` in the `field` input, one keystroke per interaction named after the field and `length`."""
+    widget = pilot.app.query_one(f"#{field}", Input)
+
+    async def keystroke(char: str) -> None:
+        widget.insert_text_at_cursor(char)
+        await _settle(pilot)
+
+    widget.value = ""
+    return ((f"type_{field}[{length}]", partial(keystroke, char)) for char in text)
+
+
+async def _select(pilot: Pilot, estimator_type: EstimatorType) -> None:
+    pilot.app.query_one("#estimator", Select).value = estimator_type.value
+    await _settle(pilot)
+
+
+def type_names(pilot: Pilot) -> Iterable[Interaction]:
+    """Type estimator names of growing length."""
+    for length in NAME_LENGTHS:
+        yield from _typing(pilot, "name", ("Mighty" * length)[:length], length)
+
+
+def type_params(pilot: Pilot) -> Iterable[Interaction]:
+    """Type required and optional parameter lists of growing length (i.e. number of parameters)."""
+    for length in PARAMS_LENGTHS:
+        yield from _typing(pilot, "required", ",".join(f"alpha_{idx}" for idx in range(length)), length)
+        yield from _typing(pilot, "optional", ",".join(f"beta_{idx}" for idx in range(length)), length)
+
+
+def toggle_switches(pilot: Pilot) -> Iterable[Interaction]:
+    """Select each estimator type and toggle each of its available switches on and off."""
+
+    async def toggle(switch_id: str) -> None:
+        switch = pilot.app.query_one(f"#{switch_id}", Switch)
+        if not switch.disabled:
+            switch.toggle()
+        await _settle(pilot)
+
+    for estimator_type in EstimatorType:
+        yield "select_estimator", partial(_select, pilot, estimator_type)
+        for switch_id in SWITCH_FIELDS:
+            for _ in range(2):
+                yield "toggle_switch", partial(toggle, switch_id)
+
+
+def forge_and_save(pilot: Pilot, output_dir: Path) -> Iterable[Interaction]:
+    """Forge and save each estimator type, with a valid form."""
+    app = pilot.app
+
+    async def forge() -> None:
+        app.query_one("#forge-btn", Button).press()
+        await _settle(pilot, wait_workers=True)
+
+    async def save() -> None:
+        app.query_one("#save-btn", Button).press()
+        await _settle(pilot, wait_workers=True)
+
+    app.query_one("#name", Input).value = "MightyEstimator"
+    app.query_one("#required", Input).value = "alpha,beta"
+    app.query_one("#optional", Input).value = "mu"
+    for estimator_type in EstimatorType:
+        yield "select_estimator", partial(_select, pilot, estimator_type)
+        app.query_one("#output-file", Input).value = str(output_dir / f"{estimator_type.name.lower()}.py")
+        yield "forge", forge
+        yield "save", save
+
+
+async def _run_session(
+    session: Callable[[Pilot], Iterable[Interaction]], track_memory: bool
+) -> AsyncIterator[tuple[str, float, float]]:
+    """Run `session` in a fresh headless app, yielding `(interaction, seconds, peak bytes)` for each interaction.
+
+    Peak memory is the maximum amount of memory allocated during the interaction, as traced by `tracemalloc`, hence
+    it is `nan` unless `track_memory`.
+
+    Each run starts cold: renders are memoized process-wide, beyond the lifetime of the app, hence otherwise forging
+    in any run but the first would only measure a cache lookup instead of rendering and formatting.
+    """
+    configure_render_cache()
+    if get_skeleton_table() is not None:
+        configure_skeletons()
+    raw_preview.cache_clear()
+
+    app = ForgeTUI()
+    async with app.run_test(size=None) as pilot:
+        await pilot.pause()
+        for name, interaction in session(pilot):
+            before = 0
+            if track_memory:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+
+            start = time.perf_counter()
+            await interaction()
+            elapsed = time.perf_counter() - start
+
+            peak = tracemalloc.get_traced_memory()[1] - before if track_memory else math.nan
+            yield name, elapsed, peak
+
+
+async def run_benchmark(
+    sessions: Mapping[str, Callable[[Pilot], Iterable[Interaction]]], repeat: int = 5
+) -> dict[str, InteractionStats]:
+    """Run each session `repeat` times to measure latency, and once more under `tracemalloc` to measure memory.
+
+    Memory is measured on a separate run since tracing allocations slows down the app considerably.
+
+    Parameters
+    ----------
+    sessions
+        Mapping from session name to a function returning the interactions of the session, given the app pilot.
+    repeat
+        Number of runs of each session measuring latency.
+
+    Returns
+    -------
+    dict[str, InteractionStats] : Statistics by `<session>/<interaction>`.
+    """
+    latencies: defaultdict[str, list[float]] = defaultdict(list)
+    memory: defaultdict[str, list[float]] = defaultdict(list)
+
+    for session_name, session in sessions.items():
+        for _ in range(repeat):
+            async for name, elapsed, _peak in _run_session(session, track_memory=False):
+                latencies[f"{session_name}/{name}"].append(elapsed)
+
+        tracemalloc.start()
+        try:
+            async for name, _elapsed, peak in _run_session(session, track_memory=True):
+                memory[f"{session_name}/{name}"].append(peak)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        key: InteractionStats(
+            samples=len(values),
+            p50_ms=percentile(values, 50) * 1_000,
+            p99_ms=percentile(values, 99) * 1_000,
+            p50_kib=percentile(memory[key], 50) / 1_024,
+            p99_kib=percentile(memory[key], 99) / 1_024,
+        )
+        for key, values in latencies.items()
+    }
+
+
+def git_commit() -> str:
+    """Return the current git commit hash (with a `-dirty` suffix for uncommitted changes), `unknown` outside git."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty.stdout.strip() else commit
+
+
+def save_results(results: Mapping[str, InteractionStats], output_dir: Path, commit: str | None = None) -> Path:
+    """Write `results` to `<output_dir>/<commit>.json`, along with the environment they were measured in."""
+    commit = commit or git_commit()
+    data = {
+        "commit": commit,
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "textual": metadata.version("textual"),
+        "results": {key: asdict(stats) for key, stats in results.items()},
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{commit}.json"
+    path.write_text(json.dumps(data, indent=2))
+    return path
+
+
+def load_results(path: Path) -> dict[str, InteractionStats]:
+    """Read the results written by `save_results`."""
+    return {key: InteractionStats(**stats) for key, stats in json.loads(path.read_text())["results"].items()}
+
+
+def compare(
+    baseline: Mapping[str, InteractionStats],
+    current: Mapping[str, InteractionStats],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> list[str]:
+    """Return a message for each interaction whose p99 latency or memory grew more than `threshold` over `baseline`.
+
+    Interactions missing from either results are not compared.
+    """
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        for metric, unit in (("p99_ms", "ms"), ("p99_kib", "KiB")):
+            before, after = getattr(baseline[key], metric), getattr(current[key], metric)
+            if after > before * (1 + threshold):
+                regressions.append(f"{key}: {metric} {before:.2f}{unit} -> {after:.2f}{unit}")
+    return regressions
+
+
+def format_results(results: Mapping[str, InteractionStats]) -> str:
+    """Format `results` as a plain text table."""
+    header = f"{'interaction':<40} {'samples':>8} {'p50 ms':>9} {'p99 ms':>9} {'p50 KiB':>9} {'p99 KiB':>9}"
+    rows = (
+        f"{key:<40} {stats.samples:>8} {stats.p50_ms:>9.2f} {stats.p99_ms:>9.2f} {stats.p50_kib:>9.1f} "
+        f"{stats.p99_kib:>9.1f}"
+        for key, stats in results.items()
+    )
+    return "\n".join([header, *rows])
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the TUI benchmark, store its results and optionally compare them with a baseline.
+
+    Returns 1 if some interactions regressed with respect to the baseline, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the TUI event handling latency and memory.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each session.")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR, help="Folder of the json results.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Results to compare against.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Regression threshold.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        sessions: dict[str, Callable[[Pilot], Iterable[Interaction]]] = {
+            "type_names": type_names,
+            "type_params": type_params,
+            "toggle_switches": toggle_switches,
+            "forge_and_save": lambda pilot: forge_and_save(pilot, Path(output_dir)),
+        }
+        results = asyncio.run(run_benchmark(sessions, repeat=args.repeat))
+
+    print(format_results(results))  # noqa: T201
+    print(f"\nResults saved at {save_results(results, args.output_dir)}")  # noqa: T201
+
+    if args.baseline is not None and (regressions := compare(load_results(args.baseline), results, args.threshold)):
+        print("\nRegressions:", *regressions, sep="\n- ")  # noqa: T201
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
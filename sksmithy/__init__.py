@@ -1,4 +1,5 @@
-from importlib import metadata
+from sksmithy._spec import ForgeResult, ForgeSpec
+from sksmithy._version import __version__
 
 __title__ = "sksmithy"
-__version__ = metadata.version("sklearn-smithy")
+__all__ = ("ForgeResult", "ForgeSpec", "__title__", "__version__")
@@ -1,9 +1,18 @@
+from pathlib import Path
 from typing import Annotated
 
-from typer import Option
+from typer import Argument, Option
 
-from sksmithy._callbacks import estimator_callback, linear_callback, name_callback, params_callback, tags_callback
-from sksmithy._models import EstimatorType
+from sksmithy._callbacks import (
+    estimator_callback,
+    linear_callback,
+    name_callback,
+    params_callback,
+    stdin_jsonl_callback,
+    tags_callback,
+    template_callback,
+)
+from sksmithy._models import EstimatorType, ProfileFormat
 from sksmithy._prompts import (
     PROMPT_DECISION_FUNCTION,
     PROMPT_ESTIMATOR,
@@ -99,6 +108,14 @@ tags_arg = Annotated[
     ),
 ]
 
+template_arg = Annotated[
+    str,
+    Option(
+        help="Name of the [bold green]template[/bold green] to render, see `smith templates` for the available ones",
+        callback=template_callback,
+    ),
+]
+
 output_file_arg = Annotated[
     str,
     Option(
@@ -106,3 +123,113 @@ output_file_arg = Annotated[
         help="[bold green]Destination file[/bold green] where to save the boilerplate code",
     ),
 ]
+
+spec_file_arg = Annotated[
+    Path,
+    Argument(
+        exists=True,
+        dir_okay=False,
+        help="[bold green]Spec file[/bold green] (TOML, JSON or YAML) listing the estimators to forge",
+    ),
+]
+
+jobs_arg = Annotated[
+    int | None,
+    Option(
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of [bold green]parallel processes[/bold green] used to render the estimators "
+        "[italic yellow](default: number of CPUs)[/italic yellow]",
+    ),
+]
+
+module_arg = Annotated[
+    Path | None,
+    Option(
+        "--module",
+        dir_okay=False,
+        help="Forge all the estimators into a [bold green]single module[/bold green] at the given path, with shared "
+        "imports [italic yellow](`output_file` of each estimator is ignored)[/italic yellow]",
+    ),
+]
+
+manifest_arg = Annotated[
+    Path | None,
+    Option(
+        "--manifest",
+        dir_okay=False,
+        help="[bold green]Manifest[/bold green] recording the inputs of each output file, used to re-render only the "
+        "estimators that changed [italic yellow](default: .<spec file name>.manifest.json next to the spec file)"
+        "[/italic yellow]",
+    ),
+]
+
+force_arg = Annotated[
+    bool,
+    Option(
+        "--force",
+        is_flag=True,
+        help="Re-render [bold green]all[/bold green] the estimators, regardless of the manifest",
+    ),
+]
+
+debounce_arg = Annotated[
+    float,
+    Option(
+        min=0.0,
+        help="Number of seconds to wait for a burst of edits to settle before [bold green]re-forging[/bold green]",
+    ),
+]
+
+profile_arg = Annotated[
+    bool,
+    Option(
+        "--profile",
+        is_flag=True,
+        help="Report [bold green]wall time[/bold green] and [bold green]peak memory[/bold green] of each forge phase: "
+        "template load, jinja render, ruff format and file write",
+    ),
+]
+
+profile_format_arg = Annotated[
+    ProfileFormat,
+    Option(help="Output format of the [bold green]profile[/bold green] report"),
+]
+
+stdin_jsonl_arg = Annotated[
+    bool,
+    Option(
+        "--stdin-jsonl",
+        is_flag=True,
+        is_eager=True,
+        callback=stdin_jsonl_callback,
+        help="Read one estimator spec per line (JSON) from stdin and write one JSON record per line to stdout, "
+        "with the [bold green]name[/bold green], the rendered [bold green]source[/bold green] and the "
+        "[bold green]errors[/bold green]. No prompt is shown",
+    ),
+]
+
+host_arg = Annotated[
+    str,
+    Option(help="[bold green]Host[/bold green] the server listens on"),
+]
+
+port_arg = Annotated[
+    int,
+    Option(help="[bold green]Port[/bold green] the server listens on"),
+]
+
+socket_arg = Annotated[
+    Path | None,
+    Option(
+        "--socket",
+        dir_okay=False,
+        help="[bold green]Unix socket[/bold green] the server listens on. If provided, host and port are ignored",
+    ),
+]
+
+workers_arg = Annotated[
+    int,
+    Option(min=1, help="Number of long-lived [bold green]ruff formatter[/bold green] workers"),
+]
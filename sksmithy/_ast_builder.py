@@ -0,0 +1,649 @@
+import ast
+import sys
+from collections.abc import Mapping
+from typing import Any, Final, cast
+
+from sksmithy._formatter import format_source, ruff_default_style, ruff_line_length
+from sksmithy._models import EstimatorType
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+INDENT: Final[str] = "    "
+
+_ATOM, _UNARY, _ARITH, _COMPARE, _TERNARY = 20, 12, 10, 5, 1
+_BINOPS: Final[dict[type[ast.operator], str]] = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*"}
+_CMPOPS: Final[dict[type[ast.cmpop], str]] = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.In: "in",
+}
+
+_CHECK_N_FEATURES: Final[str] = """
+if X.shape[1] != self.n_features_in_:
+    msg = f"X has {X.shape[1]} features but the estimator was fitted on {self.n_features_in_} features."
+    raise ValueError(msg)
+"""
+
+
+def _layout(node: Any, blank_before: int = 0, comment: str | None = None, **kwargs: Any) -> Any:  # noqa: ANN401
+    """Set layout attributes on `node` and return it."""
+    node.blank_before = blank_before
+    node.comment = comment
+    for key, value in kwargs.items():
+        setattr(node, key, value)
+    return node
+
+
+def _stmt(source: str, blank_before: int = 0, comment: str | None = None, **kwargs: Any) -> ast.stmt:  # noqa: ANN401
+    """Parse a single statement of fixed code."""
+    (node,) = ast.parse(source.strip()).body
+    return _layout(node, blank_before=blank_before, comment=comment, **kwargs)
+
+
+def _docstring(text: str, indent: int) -> ast.Expr:
+    """Build a docstring node, with `text` lines (but the first one) indented as the body of its definition."""
+    prefix = INDENT * indent
+    first, *lines = text.split("\n")
+    # Empty lines are not indented, except the last one, where the closing quotes are
+    value = "\n".join(
+        [first, *(f"{prefix}{line}" if line else line for line in lines[:-1]), *(prefix + line for line in lines[-1:])]
+    )
+    return _layout(ast.Expr(value=ast.Constant(value=value)))
+
+
+def _function(
+    name: str,
+    args: list[str],
+    body: list[ast.stmt],
+    defaults: Mapping[str, ast.expr] | None = None,
+    kwonly: list[str] | None = None,
+    decorators: list[str] | None = None,
+    blank_before: int = 1,
+    exploded: bool = False,
+) -> ast.FunctionDef:
+    """Build a method definition. `args` with a default (in `defaults`) should come last."""
+    defaults = defaults or {}
+    kwonly = kwonly or []
+
+    node = cast("ast.FunctionDef", ast.parse("def _(): pass").body[0])
+    node.name = name
+    node.args = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=arg) for arg in args],
+        vararg=None,
+        kwonlyargs=[ast.arg(arg=arg) for arg in kwonly],
+        kw_defaults=[defaults[arg] for arg in kwonly],
+        kwarg=None,
+        defaults=[defaults[arg] for arg in args if arg in defaults],
+    )
+    node.decorator_list = [ast.Name(id=decorator, ctx=ast.Load()) for decorator in decorators or []]
+    node.body = body
+    return _layout(node, blank_before=blank_before, exploded=exploded)
+
+
+def _class(name: str, bases: list[str], body: list[ast.stmt]) -> ast.ClassDef:
+    node = cast("ast.ClassDef", ast.parse("class _: pass").body[0])
+    node.name = name
+    node.bases = [ast.Name(id=base, ctx=ast.Load()) for base in bases]
+    node.body = body
+    return _layout(node, blank_before=2)
+
+
+def _imports(estimator_type: EstimatorType, linear: bool, sample_weight: bool) -> list[ast.stmt]:
+    is_classifier = estimator_type is EstimatorType.ClassifierMixin
+    is_selector = estimator_type is EstimatorType.SelectorMixin
+
+    imports: list[ast.stmt] = []
+    if is_classifier or is_selector:
+        imports.append(_stmt("import numpy as np"))
+
+    if is_classifier and linear:
+        base_imports = [
+            "from sklearn.base import BaseEstimator",
+            "from sklearn.linear_model._base import LinearClassifierMixin",
+        ]
+    elif estimator_type is EstimatorType.RegressorMixin and linear:
+        base_imports = [
+            f"from sklearn.base import {estimator_type.name}",
+            "from sklearn.linear_model._base import LinearModel",
+        ]
+    elif is_selector:
+        base_imports = ["from sklearn.base import BaseEstimator", "from sklearn.feature_selection import SelectorMixin"]
+    else:
+        base_imports = [f"from sklearn.base import BaseEstimator, {estimator_type.name}"]
+
+    imports.extend(
+        _stmt(source, blank_before=int(idx == 0 and bool(imports))) for idx, source in enumerate(base_imports)
+    )
+    imports.extend(
+        [
+            _stmt("from sklearn.utils import check_X_y"),
+            _stmt("from sklearn.utils.validation import check_is_fitted, check_array"),
+        ]
+    )
+    if sample_weight:
+        imports.append(_stmt("from sklearn.utils.validation import _check_sample_weight", blank_before=1))
+    return imports
+
+
+def _init(required: list[str], optional: list[str]) -> ast.FunctionDef:
+    body: list[ast.stmt] = [
+        _layout(
+            ast.Assign(
+                targets=[ast.Attribute(value=ast.Name(id="self", ctx=ast.Load()), attr=param, ctx=ast.Store())],
+                value=ast.Name(id=param, ctx=ast.Load()),
+            ),
+            blank_before=int(idx == 0),
+        )
+        for idx, param in enumerate([*required, *optional])
+    ]
+    return _function(
+        "__init__",
+        args=["self", *required],
+        kwonly=optional,
+        defaults={param: ast.Constant(value=...) for param in optional},
+        body=body,
+        exploded=True,
+    )
+
+
+def _fit(  # noqa: C901
+    name: str,
+    estimator_type: EstimatorType,
+    parameters: list[str],
+    linear: bool,
+    sample_weight: bool,
+) -> ast.FunctionDef:
+    is_classifier = estimator_type is EstimatorType.ClassifierMixin
+    ignores_y = estimator_type in {EstimatorType.TransformerMixin, EstimatorType.SelectorMixin}
+
+    docstring = (
+        f"\nFit {name} estimator.\n\n"
+        "Parameters\n"
+        "----------\n"
+        "X : {array-like, sparse matrix} of shape (n_samples, n_features)\n"
+        "    Training data.\n"
+        "y : array-like of shape (n_samples,) or (n_samples, n_targets)\n"
+        "    Target values.\n"
+    )
+    if sample_weight:
+        docstring += (
+            "sample_weight : array-like of shape (n_samples,), default=None\n    Individual weights for each sample.\n"
+        )
+    docstring += f"\nReturns\n-------\nself : {name}\n    Fitted {name} estimator.\n"
+
+    body: list[ast.stmt] = [_docstring(docstring, indent=2)]
+    if ignores_y:
+        body.append(_stmt("X = check_array(X, ...)", comment="TODO: Fill in `check_array` arguments"))
+    else:
+        body.append(_stmt("X, y = check_X_y(X, y, ...)", comment="TODO: Fill in `check_X_y` arguments"))
+
+    body.append(_stmt("self.n_features_in_ = X.shape[1]", blank_before=1))
+    if is_classifier:
+        body.append(_stmt("self.classes_ = np.unique(y)"))
+    if sample_weight:
+        body.append(_stmt("sample_weight = _check_sample_weight(sample_weight)", blank_before=int(is_classifier)))
+
+    body.append(_stmt("...", blank_before=1, comment="TODO: Implement fit logic"))
+
+    if linear:
+        body.extend(
+            [
+                _stmt(
+                    "self.coef_ = ...",
+                    blank_before=1,
+                    leading_comment="For linear models, coef_ and intercept_ is all you need. "
+                    "`predict` is taken care of by the mixin",
+                ),
+                _stmt("self.intercept_ = ..."),
+            ]
+        )
+    has_max_iter = "max_iter" in parameters
+    if has_max_iter:
+        body.append(_stmt("self.n_iter_ = ...", blank_before=int(not linear)))
+    if estimator_type is EstimatorType.OutlierMixin:
+        body.append(_stmt("self.offset_ = ...", blank_before=int(not has_max_iter)))
+    if estimator_type is EstimatorType.ClusterMixin:
+        body.append(_stmt("self.labels_ = ...", blank_before=1))
+    if estimator_type is EstimatorType.SelectorMixin:
+        support = cast(
+            "ast.Assign", _stmt("self.support_ = np.isin(np.arange(0, self.n_features_in_), self.selected_features_)")
+        )
+        _layout(support.value, exploded=True)
+        _layout(cast("ast.Call", support.value).args[0], comment="all_features")
+        body.extend(
+            [
+                _stmt("self.selected_features_ = ...", blank_before=1, comment="TODO: Indexes of selected features"),
+                support,
+            ]
+        )
+
+    body.append(_stmt("return self", blank_before=1))
+
+    args = ["self", "X", "y", *(["sample_weight"] if sample_weight else [])]
+    defaults = {"sample_weight": ast.Constant(value=None)}
+    if ignores_y:
+        defaults["y"] = ast.Constant(value=None)
+    return _function("fit", args=args, defaults=defaults, body=body)
+
+
+def _method_docstring(summary: str, x_description: str, returns: str) -> ast.Expr:
+    return _docstring(
+        f"{summary}\n\n"
+        "Parameters\n"
+        "----------\n"
+        "X : array-like of shape (n_samples, n_features)\n"
+        f"    {x_description}\n\n"
+        "Returns\n"
+        "-------\n"
+        f"{returns}\n",
+        indent=2,
+    )
+
+
+def _checked_method(name: str, docstring: ast.Expr | None, result: str, todo: str) -> ast.FunctionDef:
+    """Build a method which checks `X`, computes `result` (to be implemented) and returns it.
+
+    If `result` is `...`, the computation is not assigned to any variable.
+    """
+    body: list[ast.stmt] = [docstring] if docstring is not None else []
+    body.extend(
+        [
+            _stmt("check_is_fitted(self)", blank_before=1),
+            _stmt("X = check_array(X, ...)", comment="TODO: Fill in `check_array` arguments"),
+            _stmt(_CHECK_N_FEATURES, blank_before=1),
+            _stmt("..." if result == "..." else f"{result} = ...", blank_before=1, comment=todo),
+            _stmt(f"return {result}", blank_before=1),
+        ]
+    )
+    return _function(name, args=["self", "X"], body=body)
+
+
+def _methods(
+    estimator_type: EstimatorType,
+    linear: bool,
+    predict_proba: bool,
+    decision_function: bool,
+    tags: list[str] | None,
+) -> list[ast.stmt]:
+    is_classifier = estimator_type is EstimatorType.ClassifierMixin
+    methods: list[ast.stmt] = []
+
+    if is_classifier and decision_function and not linear:
+        methods.append(
+            _checked_method(
+                "decision_function",
+                _method_docstring("Confidence scores of X.", "The data to predict.", "Prediction array."),
+                result="y_scores",
+                todo="TODO: Implement decision_function logic",
+            )
+        )
+        predict_body = [
+            _method_docstring("Predict X.", "The data to predict.", "Prediction array."),
+            _stmt("check_is_fitted(self)", blank_before=1),
+            _stmt("X = check_array(X, ...)", comment="TODO: Fill in `check_array` arguments"),
+            _stmt("decision = self.decision_function(X)", blank_before=1),
+            _stmt(
+                "y_pred = (decision.ravel() > 0).astype(int) if self.n_classes == 2 else np.argmax(decision, axis=1)"
+            ),
+            _stmt("return y_pred"),
+        ]
+        methods.append(_function("predict", args=["self", "X"], body=predict_body))
+
+    if estimator_type in {EstimatorType.ClassifierMixin, EstimatorType.OutlierMixin} and predict_proba:
+        methods.append(
+            _checked_method(
+                "predict_proba",
+                _method_docstring("Probability estimates of X.", "The data to predict.", "Prediction array."),
+                result="y_proba",
+                todo="TODO: Implement predict_proba logic",
+            )
+        )
+
+    if estimator_type is EstimatorType.OutlierMixin:
+        score_samples = _checked_method(
+            "score_samples",
+            None,
+            result="...",
+            todo="TODO: Implement scoring function, `decision_function` and `predict` will follow",
+        )
+        methods.extend(
+            [
+                score_samples,
+                _function(
+                    "decision_function",
+                    args=["self", "X"],
+                    body=[_stmt("return self.score_samples(X) - self.offset_")],
+                ),
+                _function(
+                    "predict",
+                    args=["self", "X"],
+                    body=[
+                        _stmt("preds = (self.decision_function(X) >= 0).astype(int)"),
+                        _stmt("preds[preds == 0] = -1"),
+                        _stmt("return preds"),
+                    ],
+                ),
+            ]
+        )
+
+    if (
+        not decision_function
+        and not linear
+        and estimator_type
+        in {
+            EstimatorType.ClassifierMixin,
+            EstimatorType.RegressorMixin,
+            EstimatorType.ClusterMixin,
+        }
+    ):
+        methods.append(
+            _checked_method(
+                "predict",
+                _method_docstring("Predict X.", "The data to predict.", "Prediction array."),
+                result="y_pred",
+                todo="TODO: Implement predict logic",
+            )
+        )
+
+    if estimator_type is EstimatorType.TransformerMixin:
+        methods.append(
+            _checked_method(
+                "transform",
+                _method_docstring("Transform X.", "The data to transform.", "Transformed array."),
+                result="X_ts",
+                todo="TODO: Implement transform logic",
+            )
+        )
+
+    if estimator_type is EstimatorType.SelectorMixin:
+        docstring = _docstring(
+            "Get the boolean mask indicating which features are selected.\n\n"
+            "Returns\n"
+            "-------\n"
+            "support : boolean array of shape [# input features]\n"
+            "    An element is True iff its corresponding feature is selected for retention.\n",
+            indent=2,
+        )
+        body = [docstring, _stmt("check_is_fitted(self)", blank_before=1), _stmt("return self.support_")]
+        methods.append(_function("_get_support_mask", args=["self", "X"], body=body))
+
+    if tags:
+        more_tags = ast.Dict(
+            keys=[ast.Constant(value=tag) for tag in tags], values=[ast.Constant(value=...) for _ in tags]
+        )
+        body = [_layout(ast.Return(value=_layout(more_tags, exploded=True)))]
+        methods.append(_function("_more_tags", args=["self"], body=body))
+
+    if is_classifier:
+        body = [_docstring("Number of classes.", indent=2), _stmt("return len(self.classes_)")]
+        methods.append(_function("n_classes_", args=["self"], decorators=["property"], body=body))
+
+    return methods
+
+
+def build_module(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+) -> ast.Module:
+    """Build the estimator module as an `ast` tree, from the same arguments of `render_template`.
+
+    Layout information which is not part of the python grammar is stored as extra attributes of the nodes, hence the
+    tree can still be compiled and compared with `ast.dump`:
+
+    - `blank_before`: number of empty lines before a statement.
+    - `comment`: trailing comment of a statement, or of an argument of an exploded call.
+    - `leading_comment`: comment on its own line before a statement.
+    - `exploded`: whether a call, a dict or a signature is split one item per line (with magic trailing comma).
+
+    Returns
+    -------
+    ast.Module : The module tree, with layout attributes used by `emit`.
+    """
+    estimator_type = EstimatorType(estimator_type)
+    parameters = [*required, *optional]
+
+    if estimator_type is EstimatorType.ClassifierMixin and linear:
+        bases = ["LinearClassifierMixin", "BaseEstimator"]
+    elif estimator_type is EstimatorType.RegressorMixin and linear:
+        bases = ["RegressorMixin", "LinearModel"]
+    else:
+        bases = [estimator_type.name, "BaseEstimator"]
+
+    docstring = f"{name} estimator.\n\n...\n"
+    if parameters:
+        docstring += "\nParameters\n----------\n" + "".join(f"{param} : ...\n" for param in parameters)
+
+    class_body: list[ast.stmt] = [_docstring(docstring, indent=1)]
+    if required:
+        required_list = ast.List(elts=[ast.Constant(value=param) for param in required], ctx=ast.Load())
+        required_parameters = cast("ast.Assign", _stmt("_required_parameters = []", blank_before=1))
+        required_parameters.value = required_list
+        class_body.append(required_parameters)
+    if parameters:
+        class_body.append(_init(required, optional))
+
+    class_body.append(_fit(name, estimator_type, parameters, linear=linear, sample_weight=sample_weight))
+    class_body.extend(_methods(estimator_type, linear, predict_proba, decision_function, tags))
+
+    body = [*_imports(estimator_type, linear=linear, sample_weight=sample_weight), _class(name, bases, class_body)]
+    return ast.fix_missing_locations(ast.Module(body=body, type_ignores=[]))
+
+
+class _Emitter:
+    """Emit source code from the trees of `build_module`, in the same style of `ruff format`.
+
+    Only the node types used by `build_module` are supported.
+    """
+
+    def __init__(self: Self) -> None:
+        self.lines: list[str] = []
+
+    def module(self: Self, node: ast.Module) -> str:
+        self.block(node.body, indent=0)
+        return "\n".join(self.lines) + "\n"
+
+    def block(self: Self, body: list[ast.stmt], indent: int) -> None:
+        for stmt in body:
+            self.lines.extend([""] * getattr(stmt, "blank_before", 0))
+            if (leading_comment := getattr(stmt, "leading_comment", None)) is not None:
+                self.lines.append(f"{INDENT * indent}# {leading_comment}")
+            self.stmt(stmt, indent)
+
+    def stmt(self: Self, node: ast.stmt, indent: int) -> None:  # noqa: C901
+        prefix = INDENT * indent
+        match node:
+            case ast.Import(names=names):
+                line = f"import {', '.join(self.alias(alias) for alias in names)}"
+            case ast.ImportFrom(module=module, names=names):
+                line = f"from {module} import {', '.join(self.alias(alias) for alias in names)}"
+            case ast.ClassDef(name=name, bases=bases, body=body):
+                self.lines.append(f"{prefix}class {name}({', '.join(self.expr(base, indent) for base in bases)}):")
+                self.block(body, indent + 1)
+                return
+            case ast.FunctionDef(name=name, args=args, body=body, decorator_list=decorators):
+                self.lines.extend(f"{prefix}@{self.expr(decorator, indent)}" for decorator in decorators)
+                self.lines.append(
+                    f"{prefix}def {name}({self.arguments(args, indent, getattr(node, 'exploded', False))}):"
+                )
+                self.block(body, indent + 1)
+                return
+            case ast.Expr(value=ast.Constant(value=str(value))):
+                line = f'"""{value}"""'
+            case ast.Expr(value=value):
+                line = self.expr(value, indent)
+            case ast.Assign(targets=[target], value=value):
+                line = f"{self.expr(target, indent, _TERNARY)} = {self.expr(value, indent)}"
+            case ast.Return(value=value):
+                line = "return" if value is None else f"return {self.expr(value, indent)}"
+            case ast.Raise(exc=exc):
+                line = f"raise {self.expr(exc, indent)}"  # type: ignore[arg-type]
+            case ast.If(test=test, body=body, orelse=[]):
+                self.lines.append(f"{prefix}if {self.expr(test, indent)}:")
+                self.block(body, indent + 1)
+                return
+            case _:  # pragma: no cover
+                msg = f"Unsupported statement {type(node).__name__}"
+                raise TypeError(msg)
+
+        comment = getattr(node, "comment", None)
+        self.lines.append(f"{prefix}{line}" + (f"  # {comment}" if comment else ""))
+
+    @staticmethod
+    def alias(node: ast.alias) -> str:
+        return node.name if node.asname is None else f"{node.name} as {node.asname}"
+
+    def arguments(self: Self, node: ast.arguments, indent: int, exploded: bool) -> str:
+        n_without_default = len(node.args) - len(node.defaults)
+        items = [
+            arg.arg
+            if idx < n_without_default
+            else f"{arg.arg}={self.expr(node.defaults[idx - n_without_default], indent)}"
+            for idx, arg in enumerate(node.args)
+        ]
+        if node.kwonlyargs:
+            items.append("*")
+            items.extend(
+                f"{arg.arg}={self.expr(default, indent)}" if default is not None else arg.arg
+                for arg, default in zip(node.kwonlyargs, node.kw_defaults, strict=True)
+            )
+
+        return self.sequence(items, indent, exploded)
+
+    def sequence(
+        self: Self, items: list[str], indent: int, exploded: bool, comments: list[str | None] | None = None
+    ) -> str:
+        """Join items on a single line, or one per line with magic trailing comma if `exploded`."""
+        if not exploded:
+            return ", ".join(items)
+
+        comments = comments or [None] * len(items)
+        inner = INDENT * (indent + 1)
+        lines = [
+            f"{inner}{item}," + (f"  # {comment}" if comment else "")
+            for item, comment in zip(items, comments, strict=True)
+        ]
+        return "\n" + "\n".join(lines) + "\n" + INDENT * indent
+
+    def expr(self: Self, node: ast.expr, indent: int, precedence: int = 0) -> str:  # noqa: C901, PLR0911, PLR0912
+        """Emit expression `node`, wrapping it in parentheses if it binds less tightly than `precedence`."""
+        match node:
+            case ast.Name(id=name):
+                return name
+            case ast.Constant(value=value):
+                return self.constant(value)
+            case ast.Attribute(value=value, attr=attr):
+                return f"{self.expr(value, indent, _ATOM)}.{attr}"
+            case ast.Subscript(value=value, slice=index):
+                return f"{self.expr(value, indent, _ATOM)}[{self.expr(index, indent)}]"
+            case ast.Call(func=func, args=args, keywords=keywords):
+                items = [self.expr(arg, indent + 1) for arg in args]
+                items.extend(f"{keyword.arg}={self.expr(keyword.value, indent + 1)}" for keyword in keywords)
+                comments = [getattr(arg, "comment", None) for arg in args] + [None] * len(keywords)
+                exploded = getattr(node, "exploded", False)
+                return f"{self.expr(func, indent, _ATOM)}({self.sequence(items, indent, exploded, comments)})"
+            case ast.List(elts=elts):
+                return f"[{', '.join(self.expr(elt, indent) for elt in elts)}]"
+            case ast.Tuple(elts=elts):
+                source = ", ".join(self.expr(elt, indent) for elt in elts)
+                return source if precedence <= _TERNARY else f"({source})"
+            case ast.Dict(keys=keys, values=values):
+                items = [
+                    f"{self.expr(key, indent + 1)}: {self.expr(value, indent + 1)}"
+                    for key, value in zip(cast("list[ast.expr]", keys), values, strict=True)
+                ]
+                return f"{{{self.sequence(items, indent, getattr(node, 'exploded', False))}}}"
+            case ast.JoinedStr(values=values):
+                return 'f"' + "".join(self.fstring_part(value, indent) for value in values) + '"'
+            case ast.UnaryOp(op=ast.USub(), operand=operand):
+                source, own_precedence = f"-{self.expr(operand, indent, _UNARY)}", _UNARY
+            case ast.BinOp(left=left, op=op, right=right):
+                source = f"{self.expr(left, indent, _ARITH)} {_BINOPS[type(op)]} {self.expr(right, indent, _ARITH + 1)}"
+                own_precedence = _ARITH
+            case ast.Compare(left=left, ops=[op], comparators=[right]):
+                source = f"{self.expr(left, indent, _ARITH)} {_CMPOPS[type(op)]} {self.expr(right, indent, _ARITH)}"
+                own_precedence = _COMPARE
+            case ast.IfExp(test=test, body=body, orelse=orelse):
+                source = (
+                    f"{self.expr(body, indent, _TERNARY + 1)} if {self.expr(test, indent, _TERNARY + 1)} "
+                    f"else {self.expr(orelse, indent, _TERNARY)}"
+                )
+                own_precedence = _TERNARY
+            case _:  # pragma: no cover
+                msg = f"Unsupported expression {type(node).__name__}"
+                raise TypeError(msg)
+
+        return source if own_precedence >= precedence else f"({source})"
+
+    def fstring_part(self: Self, node: ast.expr, indent: int) -> str:
+        match node:
+            case ast.Constant(value=str(value)):
+                return value.replace("\\", "\\\\").replace('"', '\\"').replace("{", "{{").replace("}", "}}")
+            case ast.FormattedValue(value=value):
+                return f"{{{self.expr(value, indent)}}}"
+            case _:  # pragma: no cover
+                msg = f"Unsupported f-string part {type(node).__name__}"
+                raise TypeError(msg)
+
+    @staticmethod
+    def constant(value: object) -> str:
+        if value is Ellipsis:
+            return "..."
+        if isinstance(value, str):
+            return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        return repr(value)
+
+
+def emit(tree: ast.Module) -> str:
+    """Emit the source code of a tree built by `build_module`, formatted as `ruff format` would."""
+    return _Emitter().module(tree)
+
+
+def ast_render_template(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+) -> str:
+    """Render the estimator as `render_template` does, but via `build_module` and `emit` instead of jinja and ruff.
+
+    The emitter follows the default ruff style and does not wrap long lines: if ruff formats code in the working
+    directory with other options (e.g. single quotes or tab indentation, see `ruff_default_style`), or if any line is
+    longer than the line length in effect (see `ruff_line_length`), the source is passed through the formatter.
+    """
+    source = emit(
+        build_module(
+            name=name,
+            estimator_type=estimator_type,
+            required=required,
+            optional=optional,
+            linear=linear,
+            sample_weight=sample_weight,
+            predict_proba=predict_proba,
+            decision_function=decision_function,
+            tags=tags,
+        )
+    )
+    line_length = ruff_line_length()
+    if not ruff_default_style() or any(len(line) > line_length for line in source.splitlines()):
+        return format_source(source)
+    return source
@@ -0,0 +1,427 @@
+import json
+import os
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, TextIO
+
+from result import Err, Ok, Result
+
+from sksmithy._cache import cached_render_template
+from sksmithy._capabilities import compatibility_errors
+from sksmithy._formatter import ruff_config_hash, ruff_version
+from sksmithy._manifest import Manifest, ManifestEntry, content_hash, spec_hash
+from sksmithy._models import EstimatorType
+from sksmithy._parsers import (
+    SPEC_FLAGS,
+    SPEC_KEYS,
+    check_duplicates,
+    name_parser,
+    params_parser,
+    spec_type_errors,
+    tags_parser,
+    template_parser,
+    validate_specs,
+)
+from sksmithy._skeletons import skeleton_render_template
+from sksmithy._templates import template_hash
+from sksmithy._utils import render_many, render_module, render_template
+from sksmithy._writer import write_if_changed, write_many
+
+
+class BatchOutcome(NamedTuple):
+    """Outcome of forging a single estimator of a batch.
+
+    `unchanged` is `True` if the output file was left untouched, since its content was already up to date.
+    """
+
+    position: int
+    name: str
+    output_file: str
+    error: str | None = None
+    unchanged: bool = False
+
+
+def load_specs(path: str | Path) -> list[dict[str, Any]]:
+    """Load the list of estimator specs from a TOML, JSON or YAML file.
+
+    The file can either contain a top level list of specs, or a mapping with an `estimators` key holding the list.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported, or the content cannot be parsed.
+    TypeError
+        If the content is not a list of mappings.
+    """
+    path = Path(path)
+    content = path.read_text(encoding="utf-8")
+
+    match path.suffix.lower():
+        case ".toml":
+            if sys.version_info >= (3, 11):  # pragma: no cover
+                import tomllib
+            else:  # pragma: no cover
+                try:
+                    import tomli as tomllib
+                except ImportError as exc:
+                    msg = "tomli is required to read TOML spec files. Install it with `python -m pip install tomli`"
+                    raise ImportError(msg) from exc
+
+            data: Any = tomllib.loads(content)
+        case ".json":
+            data = json.loads(content)
+        case ".yaml" | ".yml":
+            try:
+                import yaml
+            except ImportError as exc:  # pragma: no cover
+                msg = "pyyaml is required to read YAML spec files. Install it with `python -m pip install pyyaml`"
+                raise ImportError(msg) from exc
+
+            try:
+                data = yaml.safe_load(content)
+            except yaml.YAMLError as exc:
+                msg = f"Invalid YAML: {exc}"
+                raise ValueError(msg) from exc
+        case suffix:
+            msg = f"Unsupported spec file extension `{suffix}`. Available extensions are: .toml, .json, .yaml, .yml"
+            raise ValueError(msg)
+
+    specs = data.get("estimators") if isinstance(data, Mapping) else data
+    if not isinstance(specs, list) or not all(isinstance(spec, Mapping) for spec in specs):
+        msg = f"{path} should contain a list of estimator specs (optionally under the `estimators` key)"
+        raise TypeError(msg)
+
+    return [dict(spec) for spec in specs]
+
+
+def _as_csv(value: str | Sequence[str] | None) -> str:
+    """Specs can list parameters and tags either as comma-separated string or as sequence."""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else ",".join(value)
+
+
+def parse_spec(spec: Mapping[str, Any]) -> Result[dict[str, Any], str]:  # noqa: C901,PLR0912
+    """Validate a single estimator spec using the same parsers of the CLI prompts.
+
+    Values of the wrong type are rejected first, see `spec_type_errors`. Features and tags not supported by the
+    estimator type are rejected as well, see `compatibility_errors`.
+
+    Returns `Ok(...)` with the keyword arguments for `render_template` plus `output_file`, or `Err(...)` with all the
+    error messages, one per line.
+    """
+    errors: list[str] = []
+
+    if unknown_keys := sorted(set(spec) - SPEC_KEYS):
+        errors.append(f"Unknown keys: {unknown_keys}")
+
+    # Values of the wrong type (e.g. from JSON) cannot be parsed at all
+    if type_errors := spec_type_errors(spec):
+        return Err("\n".join([*errors, *(error.message for error in type_errors)]))
+
+    match name_parser(spec.get("name")):
+        case Ok(name):
+            pass
+        case Err(name_err_msg):
+            name = ""
+            errors.append(name_err_msg)
+
+    try:
+        estimator_type = EstimatorType(spec.get("estimator_type"))
+    except ValueError:
+        errors.append(
+            f"`{spec.get('estimator_type')}` is not a valid estimator type. "
+            f"Available types are: {tuple(e.value for e in EstimatorType)}"
+        )
+
+    match params_parser(_as_csv(spec.get("required"))):
+        case Ok(required):
+            required_is_valid = True
+        case Err(required_err_msg):
+            required_is_valid = False
+            errors.append(required_err_msg)
+
+    match params_parser(_as_csv(spec.get("optional"))):
+        case Ok(optional):
+            optional_is_valid = True
+        case Err(optional_err_msg):
+            optional_is_valid = False
+            errors.append(optional_err_msg)
+
+    if required_is_valid and optional_is_valid and (msg_duplicated_params := check_duplicates(required, optional)):
+        errors.append(msg_duplicated_params)
+
+    match tags_parser(_as_csv(spec.get("tags"))):
+        case Ok(tags):
+            pass
+        case Err(tags_err_msg):
+            errors.append(tags_err_msg)
+
+    match template_parser(spec.get("template")):
+        case Ok(template):
+            pass
+        case Err(template_err_msg):
+            errors.append(template_err_msg)
+
+    if errors:
+        return Err("\n".join(errors))
+
+    features = {feature: spec.get(feature, False) for feature in SPEC_FLAGS}
+    if incompatible := [msg for _, msg in compatibility_errors(estimator_type, **features, tags=tags)]:
+        return Err("\n".join(incompatible))
+
+    return Ok(
+        {
+            "name": name,
+            "estimator_type": estimator_type,
+            "required": required,
+            "optional": optional,
+            **features,
+            "tags": tags,
+            "template": template,
+            "output_file": str(spec.get("output_file") or f"{name.lower()}.py"),
+        }
+    )
+
+
+def _render_chunk(chunk: list[dict[str, Any]]) -> list[str | Exception]:
+    """Render a chunk of specs with a single ruff invocation.
+
+    If the chunk fails as a whole, specs are rendered one by one to isolate the failing ones.
+    """
+    try:
+        return list(render_many(chunk))
+    except Exception:  # noqa: BLE001
+        results: list[str | Exception] = []
+        for kwargs in chunk:
+            try:
+                results.append(render_template(**kwargs))
+            except Exception as exc:  # noqa: BLE001,PERF203
+                results.append(exc)
+        return results
+
+
+def _render_warm(specs: list[dict[str, Any]]) -> list[str | Exception]:
+    """Render specs one by one in the current process, using the skeleton table and the configured formatter."""
+    results: list[str | Exception] = []
+    for kwargs in specs:
+        try:
+            results.append(skeleton_render_template(**kwargs))
+        except Exception as exc:  # noqa: BLE001,PERF203
+            results.append(exc)
+    return results
+
+
+def _render_parallel(specs: list[dict[str, Any]], jobs: int | None) -> list[str | Exception]:
+    """Split specs into (at most) `jobs` chunks, each rendered in a separate process by `_render_chunk`."""
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(specs)))
+    chunk_size = -(-len(specs) // jobs)  # ceil division
+    chunks = [specs[i : i + chunk_size] for i in range(0, len(specs), chunk_size or 1)]
+
+    if jobs == 1:
+        rendered_chunks = [_render_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            rendered_chunks = list(executor.map(_render_chunk, chunks))
+
+    return [forged for chunk_result in rendered_chunks for forged in chunk_result]
+
+
+def forge_batch(
+    specs: Sequence[Mapping[str, Any]],
+    jobs: int | None = None,
+    manifest: str | Path | None = None,
+    force: bool = False,
+    warm: bool = False,
+) -> list[BatchOutcome]:
+    """Validate, render and write many estimators.
+
+    All specs are validated up front with `validate_specs`, hence errors spanning many specs (such as duplicated output
+    files) are reported as well. Valid specs are split into (at most) `jobs` chunks, each rendered in a separate
+    process with a single ruff invocation, and the outputs are written concurrently. Failures are reported per item and
+    do not abort the rest of the batch.
+
+    Output files whose content would not change are never rewritten, so that their modification time is preserved.
+
+    Parameters
+    ----------
+    specs
+        Estimator specs, see `parse_spec`.
+    jobs
+        Number of worker processes. Defaults to the number of CPUs.
+    manifest
+        Path of the manifest recording the inputs of each output file. If provided, specs whose spec, template and ruff
+        version did not change since the previous run (and whose output file was not modified) are not even rendered.
+    force
+        Re-render all the specs, regardless of the manifest.
+    warm
+        Render in the current process with the warm renderer (see `configure_formatter` and `configure_skeletons`)
+        instead of spawning worker processes, which is faster for a handful of specs. `jobs` is ignored.
+
+    Returns
+    -------
+    list[BatchOutcome] : One outcome per spec, in the same order as `specs`.
+    """
+    outcomes: dict[int, BatchOutcome] = {}
+    valid: list[tuple[int, dict[str, Any]]] = []
+    previous = Manifest.load(manifest) if manifest is not None else None
+    ruff = f"{ruff_version()}+{ruff_config_hash()}" if manifest is not None else ""
+    inputs: dict[int, ManifestEntry] = {}
+    entries: dict[str, ManifestEntry] = {}
+
+    validation_errors: dict[int, list[str]] = {}
+    for position, _, message in validate_specs(specs):
+        validation_errors.setdefault(position, []).append(message)
+
+    for idx, spec in enumerate(specs):
+        parsed = Err("\n".join(validation_errors[idx])) if idx in validation_errors else parse_spec(spec)
+        match parsed:
+            case Ok(kwargs):
+                output_file = kwargs["output_file"]
+                template = template_hash(kwargs["template"]) if manifest is not None else ""
+                entry = inputs[idx] = ManifestEntry(spec_hash(kwargs), template, ruff)
+                if previous is not None and not force and previous.is_fresh(output_file, entry):
+                    entries[output_file] = previous.entries[output_file]
+                    outcomes[idx] = BatchOutcome(idx, kwargs["name"], output_file, unchanged=True)
+                else:
+                    valid.append((idx, kwargs))
+            case Err(msg):
+                outcomes[idx] = BatchOutcome(idx, str(spec.get("name", "")), str(spec.get("output_file", "")), msg)
+
+    render_kwargs = [{k: v for k, v in kwargs.items() if k != "output_file"} for _, kwargs in valid]
+    rendered = _render_warm(render_kwargs) if warm else _render_parallel(render_kwargs, jobs)
+
+    # Output files are unique (see `validate_specs`), hence they can key the writes
+    written = write_many(
+        {
+            kwargs["output_file"]: forged
+            for (_, kwargs), forged in zip(valid, rendered, strict=True)
+            if isinstance(forged, str)
+        }
+    )
+
+    for (idx, kwargs), forged in zip(valid, rendered, strict=True):
+        if isinstance(forged, Exception):
+            outcomes[idx] = BatchOutcome(idx, kwargs["name"], kwargs["output_file"], f"Rendering failed: {forged}")
+        elif isinstance(is_written := written[kwargs["output_file"]], Exception):
+            outcomes[idx] = BatchOutcome(idx, kwargs["name"], kwargs["output_file"], f"Writing failed: {is_written}")
+        else:
+            outcomes[idx] = BatchOutcome(idx, kwargs["name"], kwargs["output_file"], unchanged=not is_written)
+            entries[kwargs["output_file"]] = inputs[idx]._replace(output=content_hash(forged))
+
+    if manifest is not None:
+        Manifest(manifest, entries).save()
+
+    return [outcomes[idx] for idx in range(len(specs))]
+
+
+def forge_module(specs: Sequence[Mapping[str, Any]], output_file: str | Path) -> list[BatchOutcome]:
+    """Validate many estimators and forge all the valid ones into a single module at `output_file`.
+
+    Imports are merged and deduplicated across estimators, and the module is formatted with a single ruff pass, see
+    `render_module`. The `output_file` of each spec is ignored. As for `forge_batch`, invalid specs are reported per
+    item without aborting the rest, and the module is not rewritten if its content would not change.
+
+    Returns
+    -------
+    list[BatchOutcome] : One outcome per spec, in the same order as `specs`.
+    """
+    output_file = str(output_file)
+    specs = [{k: v for k, v in spec.items() if k != "output_file"} for spec in specs]
+
+    validation_errors: dict[int, list[str]] = {}
+    for position, _, message in validate_specs(specs):
+        validation_errors.setdefault(position, []).append(message)
+
+    outcomes: dict[int, BatchOutcome] = {}
+    valid: list[tuple[int, dict[str, Any]]] = []
+    for idx, spec in enumerate(specs):
+        match Err("\n".join(validation_errors[idx])) if idx in validation_errors else parse_spec(spec):
+            case Ok(kwargs):
+                kwargs.pop("output_file")
+                valid.append((idx, kwargs))
+            case Err(msg):
+                outcomes[idx] = BatchOutcome(idx, str(spec.get("name", "")), output_file, msg)
+
+    error: str | None = None
+    unchanged = False
+    if valid:
+        try:
+            unchanged = not write_if_changed(output_file, render_module([kwargs for _, kwargs in valid]))
+        except Exception as exc:  # noqa: BLE001
+            error = f"Forging the module failed: {exc}"
+
+    for idx, kwargs in valid:
+        outcomes[idx] = BatchOutcome(idx, kwargs["name"], output_file, error, unchanged=unchanged)
+
+    return [outcomes[idx] for idx in range(len(specs))]
+
+
+def forge_record(payload: str | bytes) -> dict[str, Any]:
+    """Forge a single estimator from its JSON spec, returning a record with `name`, `source` and `errors`.
+
+    The spec should be a JSON object with the same keys of a spec file entry (`output_file` is ignored). If the spec
+    is invalid or rendering fails, `source` is `None` and `errors` lists all the error messages. It never raises, so
+    that a malformed spec does not abort a stream of them.
+    """
+    name: str | None = None
+    source: str | None = None
+    errors: list[str] = []
+
+    try:
+        spec = json.loads(payload)
+    except json.JSONDecodeError as exc:
+        errors.append(f"Invalid JSON: {exc}")
+    else:
+        if isinstance(spec, Mapping):
+            name = spec.get("name")
+            try:
+                parsed = parse_spec(spec)
+            except Exception as exc:  # noqa: BLE001
+                parsed = Err(f"Invalid spec: {exc}")
+
+            match parsed:
+                case Ok(kwargs):
+                    kwargs.pop("output_file")
+                    try:
+                        source = cached_render_template(**kwargs)
+                    except Exception as exc:  # noqa: BLE001
+                        errors.append(f"Rendering failed: {exc}")
+                case Err(msg):
+                    errors.extend(msg.split("\n"))
+        else:
+            errors.append("Each spec should be a JSON object")
+
+    return {"name": name, "source": source, "errors": errors}
+
+
+def forge_jsonl(lines: Iterable[str], output: TextIO) -> int:
+    """Forge one estimator per JSON line, writing one JSON record per line to `output`.
+
+    Each output record is the one returned by `forge_record`. Records are flushed as soon as each item is forged,
+    hence memory usage does not depend on the input size.
+
+    Parameters
+    ----------
+    lines
+        Input lines, e.g. `sys.stdin`. Blank lines are skipped.
+    output
+        Text stream where to write the records, e.g. `sys.stdout`.
+
+    Returns
+    -------
+    int : Number of records with errors.
+    """
+    n_errors = 0
+    for line in lines:
+        if not line.strip():
+            continue
+
+        record = forge_record(line)
+        n_errors += bool(record["errors"])
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    return n_errors
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from sksmithy._formatter import ruff_config_hash, ruff_version
+from sksmithy._models import EstimatorType
+from sksmithy._skeletons import skeleton_render_template
+from sksmithy._templates import TEMPLATE_NAME, template_hash
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+CACHE_DIR_ENV: Final[str] = "SKSMITHY_CACHE_DIR"
+
+
+class RenderCacheInfo(NamedTuple):
+    """Statistics of a `RenderCache`."""
+
+    hits: int
+    misses: int
+    disk_hits: int
+    currsize: int
+    maxsize: int
+    disk_size: int
+
+
+class RenderCache:
+    """Content-addressed cache of rendered templates.
+
+    Entries are kept in an in-memory LRU and, optionally, in an on-disk store shared across processes. Whenever the
+    on-disk store grows above `max_disk_size` bytes, the least recently used files are evicted.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of entries in memory.
+    directory
+        Folder of the on-disk store. If `None`, only the in-memory LRU is used.
+    max_disk_size
+        Maximum size (in bytes) of the on-disk store.
+    """
+
+    def __init__(
+        self: Self,
+        maxsize: int = 256,
+        directory: str | Path | None = None,
+        max_disk_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_size = max_disk_size
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._hits = self._misses = self._disk_hits = 0
+        self._disk_size: int | None = None
+
+    def get(self: Self, key: str) -> str | None:
+        """Return the cached value for `key` (or `None` if missing)."""
+        with self._lock:
+            if (value := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+
+        if (value := self._disk_get(key)) is not None:
+            with self._lock:
+                self._disk_hits += 1
+                self._memory_put(key, value)
+            return value
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self: Self, key: str, value: str) -> None:
+        """Store `value` for `key`."""
+        with self._lock:
+            self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    def clear(self: Self) -> None:
+        """Drop all the entries (both in memory and on disk) and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._disk_hits = 0
+
+            if self.directory is not None and self.directory.exists():
+                for path in self.directory.glob("*/*.py"):
+                    path.unlink(missing_ok=True)
+            self._disk_size = None
+
+    def info(self: Self) -> RenderCacheInfo:
+        """Report cache statistics."""
+        with self._lock:
+            return RenderCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                disk_hits=self._disk_hits,
+                currsize=len(self._entries),
+                maxsize=self.maxsize,
+                disk_size=self._disk_size or 0,
+            )
+
+    def _memory_put(self: Self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self: Self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.py"  # type: ignore[operator]
+
+    def _disk_get(self: Self, key: str) -> str | None:
+        if self.directory is None:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            value = path.read_text(encoding="utf-8")
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return value
+
+    def _disk_put(self: Self, key: str, value: str) -> None:
+        if self.directory is None:
+            return
+
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = value.encode("utf-8")
+
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp_file:
+            tmp_file.write(content)
+        Path(tmp_file.name).replace(path)
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(p.stat().st_size for p in self.directory.glob("*/*.py"))
+            else:
+                self._disk_size += len(content)
+
+            if self._disk_size > self.max_disk_size:
+                self._evict()
+
+    def _evict(self: Self) -> None:
+        """Remove the least recently used files until the on-disk store fits in `max_disk_size`."""
+        files = sorted(
+            ((p, p.stat()) for p in self.directory.glob("*/*.py")),  # type: ignore[union-attr]
+            key=lambda item: item[1].st_mtime_ns,
+        )
+        size = sum(stat.st_size for _, stat in files)
+
+        for path, stat in files:
+            if size <= self.max_disk_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= stat.st_size
+
+        self._disk_size = size
+
+
+def render_key(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+    template: str = TEMPLATE_NAME,
+) -> str:
+    """Stable hash of `render_template` arguments, template source, ruff version and configuration.
+
+    The working directory is part of the key as well, since ruff resolves its configuration from it.
+    """
+    payload = {
+        "name": name,
+        "estimator_type": EstimatorType(estimator_type).value,
+        "required": list(required),
+        "optional": list(optional),
+        "linear": linear,
+        "sample_weight": sample_weight,
+        "predict_proba": predict_proba,
+        "decision_function": decision_function,
+        "tags": list(tags) if tags is not None else None,
+        "template": template,
+        "template_hash": template_hash(template),
+        "ruff": ruff_version(),
+        "ruff_config": ruff_config_hash(),
+        "cwd": str(Path.cwd()),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+_render_cache = RenderCache(directory=os.environ.get(CACHE_DIR_ENV))
+
+
+def get_render_cache() -> RenderCache:
+    """Return the render cache used by `cached_render_template`."""
+    return _render_cache
+
+
+def configure_render_cache(
+    maxsize: int = 256,
+    directory: str | Path | None = None,
+    max_disk_size: int = 64 * 1024 * 1024,
+) -> RenderCache:
+    """Replace the render cache used by `cached_render_template`.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of entries in memory.
+    directory
+        Folder of the on-disk store. If `None`, only the in-memory LRU is used.
+    max_disk_size
+        Maximum size (in bytes) of the on-disk store.
+
+    Returns
+    -------
+    RenderCache : The new render cache.
+    """
+    global _render_cache  # noqa: PLW0603
+    _render_cache = RenderCache(maxsize=maxsize, directory=directory, max_disk_size=max_disk_size)
+    return _render_cache
+
+
+def cached_render_template(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+    template: str = TEMPLATE_NAME,
+) -> str:
+    """Memoized version of `render_template`.
+
+    If an equivalent spec has already been rendered (with the same template and ruff version), both jinja rendering
+    and ruff formatting are skipped. The on-disk store is enabled by setting the `SKSMITHY_CACHE_DIR` environment
+    variable or via `configure_render_cache`. On a cache miss, pre-rendered skeletons are used if enabled, see
+    `sksmithy._skeletons.configure_skeletons`.
+    """
+    cache = _render_cache
+    key = render_key(
+        name=name,
+        estimator_type=estimator_type,
+        required=required,
+        optional=optional,
+        linear=linear,
+        sample_weight=sample_weight,
+        predict_proba=predict_proba,
+        decision_function=decision_function,
+        tags=tags,
+        template=template,
+    )
+
+    if (forged_template := cache.get(key)) is None:
+        forged_template = skeleton_render_template(
+            name=name,
+            estimator_type=estimator_type,
+            required=required,
+            optional=optional,
+            linear=linear,
+            sample_weight=sample_weight,
+            predict_proba=predict_proba,
+            decision_function=decision_function,
+            tags=tags,
+            template=template,
+        )
+        cache.put(key, forged_template)
+
+    return forged_template
@@ -1,11 +1,13 @@
+import sys
 from collections.abc import Callable
 from typing import Concatenate, ParamSpec, TypeVar
 
 from result import Err, Ok, Result
-from typer import BadParameter, CallbackParam, Context
+from typer import BadParameter, CallbackParam, Context, Exit
 
+from sksmithy._capabilities import Capability, incompatible_tags, supports
 from sksmithy._models import EstimatorType
-from sksmithy._parsers import check_duplicates, name_parser, params_parser, tags_parser
+from sksmithy._parsers import check_duplicates, name_parser, params_parser, tags_parser, template_parser
 
 T = TypeVar("T")
 R = TypeVar("R")
@@ -100,19 +102,32 @@ def params_callback(ctx: Context, param: CallbackParam, value: str) -> list[str]
 
 
 def tags_callback(ctx: Context, param: CallbackParam, value: str) -> list[str]:
-    """`tags` argument callback."""
-    *_, parsed_value = _parse_wrapper(ctx, param, value, tags_parser)
+    """`tags` argument callback.
+
+    Besides parsing `tags`, it checks that all of them are available for the estimator type.
+    """
+    ctx, param, parsed_value = _parse_wrapper(ctx, param, value, tags_parser)
+
+    if (estimator := ctx.params.get("estimator_type")) and (incompatible := incompatible_tags(estimator, parsed_value)):
+        del ctx.obj[param.name]
+        msg = f"The following tags are not available for {EstimatorType(estimator).value} estimators: {incompatible}"
+        raise BadParameter(msg)
+
     return parsed_value
 
 
+def template_callback(ctx: Context, param: CallbackParam, value: str) -> str:
+    """`template` argument callback."""
+    *_, template = _parse_wrapper(ctx, param, value, template_parser)
+    return template
+
+
 def estimator_callback(ctx: Context, param: CallbackParam, estimator: EstimatorType) -> str:
     """`estimator_type` argument callback.
 
-    It dynamically modifies the behaviour of the rest of the prompts based on its value:
-
-    - If not classifier or regressor, turns off linear prompt.
-    - If not classifier or outlier, turns off predict_proba prompt.
-    - If not classifier, turns off decision_function prompt.
+    It dynamically modifies the behaviour of the rest of the prompts based on its value: the prompts of linear,
+    predict_proba and decision_function are turned off if the estimator type does not support them (see
+    `sksmithy._capabilities.CAPABILITIES`).
     """
     if not ctx.obj:  # pragma: no cover
         ctx.obj = {}
@@ -120,32 +135,11 @@ def estimator_callback(ctx: Context, param: CallbackParam, estimator: EstimatorT
     if param.name in ctx.obj:
         return ctx.obj[param.name]
 
-    # !Warning: This unpacking relies on the order of the arguments in the forge command to be in the same order.
-    # Is there a better/more robust way of dealing with it?
-    linear, predict_proba, decision_function = (
-        opt for opt in ctx.command.params if opt.name in {"linear", "predict_proba", "decision_function"}
-    )
-
-    match estimator:
-        case EstimatorType.ClassifierMixin | EstimatorType.RegressorMixin:
-            pass
-        case _:
-            linear.prompt = False  # type: ignore[attr-defined]
-            linear.prompt_required = False  # type: ignore[attr-defined]
-
-    match estimator:
-        case EstimatorType.ClassifierMixin | EstimatorType.OutlierMixin:
-            pass
-        case _:
-            predict_proba.prompt = False  # type: ignore[attr-defined]
-            predict_proba.prompt_required = False  # type: ignore[attr-defined]
-
-    match estimator:
-        case EstimatorType.ClassifierMixin:
-            pass
-        case _:
-            decision_function.prompt = False  # type: ignore[attr-defined]
-            decision_function.prompt_required = False  # type: ignore[attr-defined]
+    for option in ctx.command.params:
+        capability = Capability.__members__.get(option.name or "")
+        if capability is not None and not supports(estimator, capability):
+            option.prompt = False  # type: ignore[attr-defined]
+            option.prompt_required = False  # type: ignore[attr-defined]
 
     ctx.obj[param.name] = estimator.value
 
@@ -166,13 +160,28 @@ def linear_callback(ctx: Context, param: CallbackParam, linear: bool) -> bool:
 
     decision_function = next(opt for opt in ctx.command.params if opt.name == "decision_function")
 
-    match linear:
-        case True:
-            decision_function.prompt = False  # type: ignore[attr-defined]
-            decision_function.prompt_required = False  # type: ignore[attr-defined]
-        case False:
-            pass
+    # Options given on the command line are processed in their order, hence the estimator type might not be known yet:
+    # incompatible combinations are then reported by `forge`, once all the options are parsed
+    estimator = ctx.params.get("estimator_type")
+    if estimator is not None and not supports(estimator, Capability.decision_function, linear=linear):
+        decision_function.prompt = False  # type: ignore[attr-defined]
+        decision_function.prompt_required = False  # type: ignore[attr-defined]
 
     ctx.obj[param.name] = linear
 
     return linear
+
+
+def stdin_jsonl_callback(ctx: Context, param: CallbackParam, value: bool) -> bool:  # noqa: ARG001
+    """`stdin_jsonl` argument callback.
+
+    Being an eager option, it is processed before any prompt: if the flag is set, it streams the estimator specs from
+    stdin to stdout, one JSON object per line, and exits without prompting.
+    """
+    if not value:
+        return value
+
+    from sksmithy._batch import forge_jsonl
+
+    n_errors = forge_jsonl(sys.stdin, sys.stdout)
+    raise Exit(code=int(n_errors > 0))
@@ -0,0 +1,111 @@
+from collections.abc import Iterable, Iterator, Mapping
+from enum import IntFlag
+from types import MappingProxyType
+from typing import Final
+
+from sksmithy._models import EstimatorType, TagType
+
+
+class Capability(IntFlag):
+    """Optional features of an estimator, as bit flags.
+
+    Each member is named after the argument of `render_template` enabling it.
+    """
+
+    linear = 1
+    sample_weight = 2
+    predict_proba = 4
+    decision_function = 8
+
+
+# Features each estimator type supports, `decision_function` is further excluded for linear classifiers (see
+# `capabilities`).
+CAPABILITIES: Final[Mapping[EstimatorType, Capability]] = MappingProxyType(
+    {
+        EstimatorType.ClassifierMixin: (
+            Capability.linear | Capability.sample_weight | Capability.predict_proba | Capability.decision_function
+        ),
+        EstimatorType.RegressorMixin: Capability.linear | Capability.sample_weight,
+        EstimatorType.OutlierMixin: Capability.sample_weight | Capability.predict_proba,
+        EstimatorType.ClusterMixin: Capability.sample_weight,
+        EstimatorType.TransformerMixin: Capability.sample_weight,
+        EstimatorType.SelectorMixin: Capability.sample_weight,
+    }
+)
+
+# Tags which are meaningful only for some estimator types, all the other tags are available for any estimator type.
+_RESTRICTED_TAGS: Final[Mapping[TagType, frozenset[EstimatorType]]] = {
+    TagType.binary_only: frozenset({EstimatorType.ClassifierMixin}),
+    TagType.multilabel: frozenset({EstimatorType.ClassifierMixin}),
+    TagType.multioutput: frozenset({EstimatorType.ClassifierMixin, EstimatorType.RegressorMixin}),
+    TagType.multioutput_only: frozenset({EstimatorType.ClassifierMixin, EstimatorType.RegressorMixin}),
+    TagType.poor_score: frozenset({EstimatorType.ClassifierMixin, EstimatorType.RegressorMixin}),
+    TagType.requires_positive_y: frozenset({EstimatorType.ClassifierMixin, EstimatorType.RegressorMixin}),
+    TagType.preserves_dtype: frozenset({EstimatorType.TransformerMixin, EstimatorType.SelectorMixin}),
+}
+
+# Bit of each tag, and bitmask of the tags each estimator type supports
+TAG_BITS: Final[Mapping[str, int]] = MappingProxyType({tag.value: 1 << idx for idx, tag in enumerate(TagType)})
+TAG_MASKS: Final[Mapping[EstimatorType, int]] = MappingProxyType(
+    {
+        estimator_type: sum(
+            TAG_BITS[tag.value]
+            for tag in TagType
+            if tag not in _RESTRICTED_TAGS or estimator_type in _RESTRICTED_TAGS[tag]
+        )
+        for estimator_type in EstimatorType
+    }
+)
+
+
+def capabilities(estimator_type: EstimatorType | str, linear: bool = False) -> Capability:
+    """Return the features supported by `estimator_type`.
+
+    A linear classifier already implements `decision_function` (via `LinearClassifierMixin`), hence it is excluded.
+    """
+    supported = CAPABILITIES[EstimatorType(estimator_type)]
+    return supported & ~Capability.decision_function if linear else supported
+
+
+def supports(estimator_type: EstimatorType | str, capability: Capability, linear: bool = False) -> bool:
+    """Check whether `estimator_type` supports (all) the given `capability`."""
+    return capability in capabilities(estimator_type, linear=linear)
+
+
+def supported_tags(estimator_type: EstimatorType | str) -> tuple[str, ...]:
+    """Return the tags available for `estimator_type`, in the `TagType` order."""
+    mask = TAG_MASKS[EstimatorType(estimator_type)]
+    return tuple(tag for tag, bit in TAG_BITS.items() if mask & bit)
+
+
+def incompatible_tags(estimator_type: EstimatorType | str, tags: Iterable[str]) -> tuple[str, ...]:
+    """Return the tags which are not available for `estimator_type`. Unknown tags are ignored."""
+    mask = TAG_MASKS[EstimatorType(estimator_type)]
+    return tuple(tag for tag in tags if tag in TAG_BITS and not mask & TAG_BITS[tag])
+
+
+def compatibility_errors(
+    estimator_type: EstimatorType | str,
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: Iterable[str] = (),
+) -> Iterator[tuple[str, str]]:
+    """Yield `(field, message)` for each requested feature or tag that `estimator_type` does not support."""
+    estimator_type = EstimatorType(estimator_type)
+    requested = {
+        Capability.linear: linear,
+        Capability.sample_weight: sample_weight,
+        Capability.predict_proba: predict_proba,
+        Capability.decision_function: decision_function,
+    }
+    supported = capabilities(estimator_type, linear=linear)
+    kind = f"linear {estimator_type.value}" if linear and Capability.linear in supported else estimator_type.value
+
+    for capability, is_requested in requested.items():
+        if is_requested and capability not in supported:
+            yield str(capability.name), f"`{capability.name}` is not available for {kind} estimators"
+
+    for tag in incompatible_tags(estimator_type, tags):
+        yield "tags", f"`{tag}` tag is not available for {estimator_type.value} estimators"
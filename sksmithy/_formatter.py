@@ -0,0 +1,575 @@
+import ast
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import cache, lru_cache
+from importlib import metadata
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, Final, Literal
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+Formatter = Callable[[str], str]
+
+RUFF_FORMAT_COMMAND: Final[tuple[str, ...]] = ("ruff", "format")
+RUFF_SERVER_COMMAND: Final[tuple[str, ...]] = ("ruff", "server")
+# Maximum line length ruff accepts
+RUFF_MAX_LINE_LENGTH: Final[int] = 320
+# Files ruff reads its configuration from, in each folder
+RUFF_CONFIG_FILES: Final[tuple[str, ...]] = (".ruff.toml", "ruff.toml", "pyproject.toml")
+
+
+class FormatterError(RuntimeError):
+    """Raised when a formatter worker fails to format the source code."""
+
+
+class FormatterBusyError(FormatterError):
+    """Raised when all the workers of a pool are busy for longer than the acquire timeout."""
+
+
+def subprocess_format(source: str) -> str:
+    """Format `source` by spawning a single-shot `ruff format -` subprocess."""
+    return subprocess.check_output([*RUFF_FORMAT_COMMAND, "-"], input=source, encoding="utf-8")
+
+
+@cache
+def ruff_version() -> str:
+    """Return the version of the ruff formatter in use."""
+    try:
+        return metadata.version("ruff")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        return subprocess.check_output([RUFF_FORMAT_COMMAND[0], "--version"], encoding="utf-8").strip()
+
+
+def _config_stamps(directory: str | Path | None) -> tuple[tuple[str, int, int], ...]:
+    """Path, modification time and size of the ruff configuration files which might apply to `directory`."""
+    folder = os.path.abspath(directory if directory is not None else os.getcwd())  # noqa: PTH100, PTH109
+    folders = [folder]
+    while (parent := os.path.dirname(folder)) != folder:  # noqa: PTH120
+        folders.append(folder := parent)
+    folders.append(os.path.join(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config", "ruff"))  # noqa: PTH118
+
+    stamps = []
+    for folder in folders:
+        for name in RUFF_CONFIG_FILES:
+            path = os.path.join(folder, name)  # noqa: PTH118
+            try:
+                stat = os.stat(path)  # noqa: PTH116
+            except OSError:
+                continue
+            if S_ISREG(stat.st_mode):
+                stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+def ruff_config_files(directory: str | Path | None = None) -> tuple[Path, ...]:
+    """Return the configuration files ruff might read when formatting from `directory` (default: working directory).
+
+    These are the configuration files in `directory`, in all its parents and in the user configuration folder. Rather
+    than resolving the one ruff picks (e.g. a `pyproject.toml` without a `[tool.ruff]` section is skipped), all of them
+    are returned.
+    """
+    return tuple(Path(path) for path, *_ in _config_stamps(directory))
+
+
+def ruff_config_hash(directory: str | Path | None = None) -> str:
+    """Hash of the ruff configuration in effect in `directory` (default: working directory), see `ruff_config_files`.
+
+    Files are hashed by path and content, and re-read only if their modification time or size change.
+    """
+    return _hash_config_files(_config_stamps(directory))
+
+
+@lru_cache(maxsize=64)
+def _hash_config_files(stamps: tuple[tuple[str, int, int], ...]) -> str:
+    digest = hashlib.sha256()
+    for path, *_ in stamps:
+        digest.update(path.encode("utf-8") + b"\0")
+        try:
+            digest.update(Path(path).read_bytes())
+        except OSError:  # pragma: no cover
+            digest.update(b"<unreadable>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def ruff_line_length() -> int:
+    """Return the line length ruff formats code with in the working directory.
+
+    The line length is measured rather than read from the configuration, which ruff resolves from many files (possibly
+    extending each other): a probe made of lines of growing length is formatted, and the longest line left on a single
+    line is the line length. The result is cached by ruff version and configuration, see `ruff_config_hash`.
+    """
+    return _probe_line_length(ruff_version(), ruff_config_hash())
+
+
+@lru_cache(maxsize=16)
+def _probe_line_length(version: str, config_hash: str) -> int:  # noqa: ARG001  # Cache keys only
+    probe = "".join(f"x = [{'a' * length}, b]\n" for length in range(1, RUFF_MAX_LINE_LENGTH))
+    lines = subprocess_format(probe).splitlines()
+    return max((len(line) for line in lines if line.startswith("x = [") and line.endswith("]")), default=0)
+
+
+# Source exercising the format options which rendered templates depend on, besides the line length: quote style,
+# indentation (style and width) and magic trailing commas
+STYLE_PROBE: Final[str] = """class A:
+    def f(self, a,):
+        '''Docstring.'''
+        return {'a': [a, 'b']}
+"""
+
+
+def ruff_default_style() -> bool:
+    """Return whether ruff formats code in the working directory with its default options, the line length aside.
+
+    As for `ruff_line_length`, the options are measured rather than read from the configuration: a probe is formatted
+    both with the configuration in effect and in isolation (i.e. with the defaults), and the two outputs are compared.
+    Only the options exercised by `STYLE_PROBE` are covered. The result is cached by ruff version and configuration,
+    see `ruff_config_hash`.
+    """
+    return _probe_default_style(ruff_version(), ruff_config_hash())
+
+
+@lru_cache(maxsize=16)
+def _probe_default_style(version: str, config_hash: str) -> bool:  # noqa: ARG001  # Cache keys only
+    isolated = subprocess.check_output([*RUFF_FORMAT_COMMAND, "--isolated", "-"], input=STYLE_PROBE, encoding="utf-8")
+    return subprocess_format(STYLE_PROBE) == isolated
+
+
+def format_many(sources: Sequence[str]) -> list[str]:
+    """Format many `sources` with a single `ruff format <dir>` invocation.
+
+    Sources are written to a temporary folder, formatted in one go, and read back in the same order.
+    """
+    if not sources:
+        return []
+
+    with _source_tree(sources) as (tmp_dir, paths):
+        subprocess.run([*RUFF_FORMAT_COMMAND, tmp_dir], check=True, capture_output=True)
+        return [path.read_text(encoding="utf-8") for path in paths]
+
+
+@contextmanager
+def _source_tree(sources: Sequence[str]) -> Iterator[tuple[str, list[Path]]]:
+    """Write `sources` into a temporary folder, yielding the folder and the file paths (in the same order)."""
+    with tempfile.TemporaryDirectory(prefix="sksmithy-") as tmp_dir:
+        paths = [Path(tmp_dir) / f"estimator_{idx:06d}.py" for idx in range(len(sources))]
+        for path, source in zip(paths, sources, strict=True):
+            path.write_text(source, encoding="utf-8")
+
+        yield tmp_dir, paths
+
+
+async def _arun(args: Sequence[str], stdin: str | None, timeout: float | None) -> str:
+    """Run `args` in a subprocess without blocking the event loop.
+
+    If the coroutine is cancelled or times out, the subprocess is killed before re-raising.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(stdin.encode("utf-8") if stdin is not None else None),
+            timeout=timeout,
+        )
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+        raise
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, list(args), stdout, stderr)
+    return stdout.decode("utf-8").replace("\r\n", "\n")
+
+
+async def aformat_source(source: str, timeout: float | None = None) -> str:
+    """Asynchronous version of `subprocess_format`.
+
+    Parameters
+    ----------
+    source
+        Code to format.
+    timeout
+        Maximum number of seconds to wait for ruff. If exceeded, ruff is killed and `asyncio.TimeoutError` is raised.
+    """
+    return await _arun([*RUFF_FORMAT_COMMAND, "-"], stdin=source, timeout=timeout)
+
+
+async def aformat_many(sources: Sequence[str], timeout: float | None = None) -> list[str]:
+    """Asynchronous version of `format_many`."""
+    if not sources:
+        return []
+
+    with _source_tree(sources) as (tmp_dir, paths):
+        await _arun([*RUFF_FORMAT_COMMAND, tmp_dir], stdin=None, timeout=timeout)
+        return [path.read_text(encoding="utf-8") for path in paths]
+
+
+class _RuffServer:
+    """Long-lived `ruff server` process, driven via the language server protocol over stdin/stdout pipes.
+
+    A worker serves one request at a time: concurrency is handled by `RuffServerPool`.
+    """
+
+    def __init__(self: Self, timeout: float) -> None:
+        self.timeout = timeout
+        self._request_id = 0
+        self._document_id = 0
+        self._messages: queue.Queue[dict[str, Any] | None] = queue.Queue()
+
+        self._process = subprocess.Popen(
+            RUFF_SERVER_COMMAND,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+        try:
+            result = self._request(
+                "initialize",
+                {
+                    "processId": os.getpid(),
+                    "rootUri": None,
+                    "capabilities": {"general": {"positionEncodings": ["utf-32", "utf-16"]}},
+                },
+            )
+            self._position_encoding = result["capabilities"].get("positionEncoding", "utf-16")
+            self._notify("initialized", {})
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def is_alive(self: Self) -> bool:
+        return self._process.poll() is None
+
+    def format(self: Self, source: str) -> str:
+        self._document_id += 1
+        text_document = {"uri": f"untitled:sksmithy-{self._document_id}"}
+
+        self._notify(
+            "textDocument/didOpen",
+            {"textDocument": {**text_document, "languageId": "python", "version": 1, "text": source}},
+        )
+        try:
+            edits = self._request(
+                "textDocument/formatting",
+                {"textDocument": text_document, "options": {"tabSize": 4, "insertSpaces": True}},
+            )
+        finally:
+            self._notify("textDocument/didClose", {"textDocument": text_document})
+
+        if edits is None:
+            # ruff server returns no edits both for already formatted code and for code it cannot parse.
+            try:
+                ast.parse(source)
+            except SyntaxError as exc:
+                msg = f"Unable to format source code: {exc}"
+                raise FormatterError(msg) from exc
+            return source
+
+        return _apply_edits(source, edits, self._position_encoding)
+
+    def close(self: Self) -> None:
+        if self.is_alive:
+            self._process.kill()
+        self._process.wait()
+        for stream in (self._process.stdin, self._process.stdout):
+            if stream is not None:
+                stream.close()
+
+    def _read(self: Self) -> None:
+        """Read LSP messages from the server stdout until EOF. `None` signals that the server is gone."""
+        stdout = self._process.stdout
+        try:
+            while stdout is not None:
+                content_length = None
+                while (line := stdout.readline()) not in {b"\r\n", b"\n", b""}:
+                    header, _, value = line.decode("ascii").partition(":")
+                    if header.strip().lower() == "content-length":
+                        content_length = int(value)
+
+                if not line or content_length is None:
+                    break
+                self._messages.put(json.loads(stdout.read(content_length)))
+        except (OSError, ValueError):  # pragma: no cover
+            pass
+        finally:
+            self._messages.put(None)
+
+    def _send(self: Self, message: dict[str, Any]) -> None:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+        try:
+            self._process.stdin.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)  # type: ignore[union-attr]
+            self._process.stdin.flush()  # type: ignore[union-attr]
+        except OSError as exc:
+            msg = "ruff server is not running"
+            raise FormatterError(msg) from exc
+
+    def _notify(self: Self, method: str, params: dict[str, Any]) -> None:
+        self._send({"method": method, "params": params})
+
+    def _request(self: Self, method: str, params: dict[str, Any]) -> Any:  # noqa: ANN401
+        self._request_id += 1
+        request_id = self._request_id
+        self._send({"id": request_id, "method": method, "params": params})
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                message = self._messages.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                msg = f"ruff server did not answer `{method}` within {self.timeout} seconds"
+                raise FormatterError(msg) from None
+
+            match message:
+                case None:
+                    msg = "ruff server exited unexpectedly"
+                    raise FormatterError(msg)
+                case {"id": id_, "method": _}:
+                    # Request from the server to the client, e.g. `client/registerCapability`.
+                    self._send({"id": id_, "result": None})
+                case {"id": id_, "error": error} if id_ == request_id:
+                    msg = f"ruff server failed on `{method}`: {error.get('message')}"
+                    raise FormatterError(msg)
+                case {"id": id_} if id_ == request_id:
+                    return message.get("result")
+                case _:
+                    # Notifications (e.g. diagnostics) are not relevant.
+                    pass
+
+
+def _apply_edits(source: str, edits: list[dict[str, Any]], position_encoding: str) -> str:
+    """Apply LSP text edits to `source`."""
+    line_starts = [0]
+    line_starts.extend(idx + 1 for idx, char in enumerate(source) if char == "\n")
+
+    def to_offset(position: dict[str, int]) -> int:
+        line = position["line"]
+        if line >= len(line_starts):
+            return len(source)
+
+        start = line_starts[line]
+        character = position["character"]
+        if position_encoding == "utf-16":
+            end = line_starts[line + 1] if line + 1 < len(line_starts) else len(source)
+            encoded = source[start:end].encode("utf-16-le")[: 2 * character]
+            character = len(encoded.decode("utf-16-le", errors="ignore"))
+        return min(start + character, len(source))
+
+    result = source
+    for edit in sorted(
+        edits, key=lambda e: (e["range"]["start"]["line"], e["range"]["start"]["character"]), reverse=True
+    ):
+        start, end = to_offset(edit["range"]["start"]), to_offset(edit["range"]["end"])
+        result = result[:start] + edit["newText"] + result[end:]
+    return result
+
+
+class RuffServerPool:
+    """Bounded pool of long-lived `ruff server` workers.
+
+    Workers are started lazily, reused across calls, and replaced if they die. If all workers are busy, callers wait
+    up to `acquire_timeout` seconds for one to be released before a `FormatterBusyError` is raised.
+
+    If a worker cannot be started (e.g. the installed ruff version does not ship a language server), the pool falls
+    back to `subprocess_format`.
+
+    Parameters
+    ----------
+    size
+        Maximum number of workers.
+    timeout
+        Maximum number of seconds to wait for a worker answer.
+    acquire_timeout
+        Maximum number of seconds to wait for a free worker. `None` waits forever.
+    """
+
+    def __init__(
+        self: Self,
+        size: int = 2,
+        timeout: float = 10.0,
+        acquire_timeout: float | None = 30.0,
+    ) -> None:
+        if size < 1:
+            msg = f"Pool size should be at least 1, found {size}"
+            raise ValueError(msg)
+
+        self.size = size
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+        self.restarts = 0
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: list[_RuffServer] = []
+        self._workers: set[_RuffServer] = set()
+        self._closed = False
+
+    def __call__(self: Self, source: str) -> str:
+        """Format `source` with one of the pool workers."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            msg = f"All {self.size} formatter workers are busy"
+            raise FormatterBusyError(msg)
+
+        try:
+            return self._format(source, retry=True)
+        finally:
+            self._slots.release()
+
+    @property
+    def workers(self: Self) -> int:
+        """Number of running workers."""
+        return len(self._workers)
+
+    def close(self: Self) -> None:
+        """Terminate all the workers."""
+        with self._lock:
+            self._closed = True
+            workers, self._workers, self._idle = self._workers, set(), []
+
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(self: Self, *_: object) -> None:
+        self.close()
+
+    def _format(self: Self, source: str, retry: bool) -> str:
+        """Format `source` on a worker, falling back to `subprocess_format` if no worker can be started.
+
+        If the worker dies while serving the request and `retry` is `True`, the request is retried once on a fresh one.
+        """
+        try:
+            worker = self._checkout()
+        except (OSError, FormatterError):
+            return subprocess_format(source)
+
+        try:
+            result = worker.format(source)
+        except FormatterError:
+            if worker.is_alive:
+                self._checkin(worker)
+                raise
+            self._discard(worker)
+            self.restarts += 1
+            if not retry:
+                raise
+            return self._format(source, retry=False)
+
+        self._checkin(worker)
+        return result
+
+    def _checkout(self: Self) -> _RuffServer:
+        with self._lock:
+            if self._closed:
+                msg = "Formatter pool is closed"
+                raise FormatterError(msg)
+            worker = self._idle.pop() if self._idle else None
+
+        if worker is not None and not worker.is_alive:
+            self._discard(worker)
+            self.restarts += 1
+            worker = None
+
+        if worker is None:
+            worker = _RuffServer(timeout=self.timeout)
+            with self._lock:
+                self._workers.add(worker)
+        return worker
+
+    def _checkin(self: Self, worker: _RuffServer) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def _discard(self: Self, worker: _RuffServer) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        worker.close()
+
+
+_formatter: Formatter = subprocess_format
+
+
+def format_source(source: str) -> str:
+    """Format `source` with the configured formatter backend."""
+    return _formatter(source)
+
+
+def get_formatter() -> Formatter:
+    """Return the formatter backend in use."""
+    return _formatter
+
+
+def set_formatter(formatter: Formatter | None) -> None:
+    """Set the formatter backend. `None` restores the single-shot `subprocess_format`."""
+    global _formatter  # noqa: PLW0603
+    _formatter = formatter or subprocess_format
+
+
+def configure_formatter(
+    backend: Literal["subprocess", "pool"],
+    size: int = 2,
+    timeout: float = 10.0,
+    acquire_timeout: float | None = 30.0,
+) -> Formatter:
+    """Configure the formatter backend used by `render_template`.
+
+    Parameters
+    ----------
+    backend
+        Either "subprocess" (spawn `ruff format -` at each call) or "pool" (keep a `RuffServerPool` of long-lived
+        workers). The pool is terminated at interpreter exit.
+    size
+        Maximum number of workers, used only if `backend="pool"`.
+    timeout
+        Maximum number of seconds to wait for a worker answer, used only if `backend="pool"`.
+    acquire_timeout
+        Maximum number of seconds to wait for a free worker, used only if `backend="pool"`.
+
+    Returns
+    -------
+    Formatter : The configured formatter.
+    """
+    previous = _formatter
+    match backend:
+        case "subprocess":
+            formatter: Formatter = subprocess_format
+        case "pool":
+            pool = RuffServerPool(size=size, timeout=timeout, acquire_timeout=acquire_timeout)
+            atexit.register(pool.close)
+            formatter = pool
+        case _:
+            msg = f"Unknown formatter backend `{backend}`, expected one of 'subprocess' or 'pool'"
+            raise ValueError(msg)
+
+    set_formatter(formatter)
+    if isinstance(previous, RuffServerPool):
+        previous.close()
+    return formatter
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+from sksmithy._models import EstimatorType
+from sksmithy._writer import atomic_write
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+MANIFEST_VERSION: Final[int] = 1
+
+
+class ManifestEntry(NamedTuple):
+    """Inputs (spec, template, ruff version and configuration) and output hash of a forged file."""
+
+    spec: str
+    template: str
+    ruff: str
+    output: str = ""
+
+    def inputs(self: Self) -> tuple[str, str, str]:
+        """Return the hashes of the inputs, i.e. everything but the output hash."""
+        return self.spec, self.template, self.ruff
+
+
+def default_manifest_path(spec_file: str | Path) -> Path:
+    """Return the default manifest location for `spec_file`, i.e. a hidden json file next to it."""
+    spec_file = Path(spec_file)
+    return spec_file.with_name(f".{spec_file.name}.manifest.json")
+
+
+def spec_hash(kwargs: Mapping[str, Any]) -> str:
+    """Stable hash of the `render_template` arguments of a spec."""
+    payload = {
+        key: EstimatorType(value).value if key == "estimator_type" else value
+        for key, value in kwargs.items()
+        if key != "output_file"
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def content_hash(content: str) -> str:
+    """Sha256 hex digest of `content`."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str | Path) -> str | None:
+    """Sha256 hex digest of the file content, or `None` if it cannot be read."""
+    try:
+        return content_hash(Path(path).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+class Manifest:
+    """Record of the inputs each output file was forged from, used to re-render only what changed.
+
+    Entries are keyed by output file. An output file is up to date if it was forged from the very same spec, template
+    and ruff version and configuration, and its content was not modified (or removed) ever since.
+
+    Parameters
+    ----------
+    path
+        Location of the json manifest file.
+    entries
+        Initial entries.
+    """
+
+    def __init__(self: Self, path: str | Path, entries: Mapping[str, ManifestEntry] | None = None) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, ManifestEntry] = dict(entries or {})
+
+    @classmethod
+    def load(cls: type[Self], path: str | Path) -> Self:
+        """Load the manifest from `path`.
+
+        A missing, corrupted or outdated manifest results in an empty one, hence in a full re-render.
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data["version"] != MANIFEST_VERSION:
+                return cls(path)
+            entries = {output_file: ManifestEntry(**entry) for output_file, entry in data["entries"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return cls(path)
+
+        return cls(path, entries)
+
+    def is_fresh(self: Self, output_file: str, entry: ManifestEntry) -> bool:
+        """Whether `output_file` was forged from the same inputs of `entry` and left untouched afterwards."""
+        recorded = self.entries.get(output_file)
+        return (
+            recorded is not None and recorded.inputs() == entry.inputs() and file_hash(output_file) == recorded.output
+        )
+
+    def save(self: Self) -> None:
+        """Atomically write the manifest to its path."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "entries": {output_file: entry._asdict() for output_file, entry in sorted(self.entries.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(data, indent=2))
@@ -42,3 +42,10 @@ class TagType(str, Enum):
     _xfail_checks = "_xfail_checks"
     stateless = "stateless"
     X_types = "X_types"
+
+
+class ProfileFormat(str, Enum):
+    """Output formats of the forge profile."""
+
+    table = "table"
+    json = "json"
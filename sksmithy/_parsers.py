@@ -1,8 +1,32 @@
+import os
+from collections.abc import Iterator, Mapping, Sequence
 from keyword import iskeyword
+from typing import Any, NamedTuple
 
 from result import Err, Ok, Result
 
-from sksmithy._models import TagType
+from sksmithy._capabilities import compatibility_errors
+from sksmithy._models import EstimatorType, TagType
+
+SPEC_KEYS: frozenset[str] = frozenset(
+    {
+        "name",
+        "estimator_type",
+        "required",
+        "optional",
+        "sample_weight",
+        "linear",
+        "predict_proba",
+        "decision_function",
+        "tags",
+        "template",
+        "output_file",
+    }
+)
+
+
+# Spec keys of the optional features of the estimator, each either `true` or `false`
+SPEC_FLAGS: tuple[str, ...] = ("linear", "sample_weight", "predict_proba", "decision_function")
 
 
 def name_parser(name: str | None) -> Result[str, str]:
@@ -84,3 +108,167 @@ def tags_parser(tags: str) -> Result[list[str], str]:
         return Err(msg)
 
     return Ok(list_tag)
+
+
+def template_parser(template: str | None) -> Result[str, str]:
+    """Validate that `template` is the name of a registered template.
+
+    The parser returns `Ok("default")` if `template` is empty, `Err(...)` if no template is registered as `template`,
+    otherwise it returns `Ok(template)`.
+    """
+    if not template or template == "default":
+        return Ok("default")
+
+    from sksmithy._templates import get_registry
+
+    registry = get_registry()
+    if template not in registry:
+        msg = f"`{template}` is not an available template. Available templates are: {tuple(registry.names())}"
+        return Err(msg)
+    return Ok(template)
+
+
+class SpecError(NamedTuple):
+    """Validation error of the `field` of the spec at `position` in a batch of specs."""
+
+    position: int
+    field: str
+    message: str
+
+
+def _as_list(value: str | Sequence[str] | None) -> list[str]:
+    """Specs can list parameters and tags either as comma-separated string or as sequence."""
+    if not value:
+        return []
+    return value.split(",") if isinstance(value, str) else list(value)
+
+
+def spec_type_errors(spec: Mapping[str, Any], position: int = 0) -> list[SpecError]:
+    """Return the errors of the fields of a single spec whose value has the wrong type.
+
+    Specs loaded from JSON, TOML or YAML files can hold any value: names, templates and output files should be strings,
+    parameters and tags either a comma-separated string or a list of strings, and features booleans. Missing fields
+    are always valid.
+    """
+    errors = [
+        SpecError(position, field, f"`{field}` should be a string, found `{value!r}`")
+        for field in ("name", "template", "output_file")
+        if (value := spec.get(field)) is not None and not isinstance(value, str)
+    ]
+    errors.extend(
+        SpecError(position, field, f"`{field}` should be a string or a list of strings, found `{value!r}`")
+        for field in ("required", "optional", "tags")
+        if not (
+            (value := spec.get(field)) is None
+            or isinstance(value, str)
+            or (isinstance(value, list | tuple) and all(isinstance(v, str) for v in value))
+        )
+    )
+    errors.extend(
+        SpecError(position, field, f"`{field}` should be a boolean, found `{spec[field]!r}`")
+        for field in SPEC_FLAGS
+        if not isinstance(spec.get(field, False), bool)
+    )
+    return errors
+
+
+def _validate_params(position: int, spec: Mapping[str, Any]) -> Iterator[SpecError]:
+    """Yield the errors of required and optional parameters of a single spec."""
+    seen: dict[str, str] = {}
+    for field in ("required", "optional"):
+        for param in _as_list(spec.get(field)):
+            if not param.isidentifier():
+                yield SpecError(position, field, f"`{param}` is not a valid python identifier")
+            elif iskeyword(param):
+                yield SpecError(position, field, f"`{param}` is a python reserved keyword")
+            elif param not in seen:
+                seen[param] = field
+            elif seen[param] == field:
+                yield SpecError(position, field, f"`{param}` is repeated")
+            else:
+                yield SpecError(position, field, f"`{param}` is both required and optional")
+
+
+def validate_specs(specs: Sequence[Mapping[str, Any]]) -> list[SpecError]:  # noqa: C901
+    """Validate a batch of estimator specs in a single pass, collecting every error instead of stopping at the first.
+
+    For each spec it checks:
+
+    - unknown keys
+    - type of each field, see `spec_type_errors`
+    - class name: not empty, valid python identifier and not a reserved keyword
+    - estimator type
+    - each required and optional parameter: valid python identifier, not a reserved keyword, not repeated within
+        the same list nor across the two lists
+    - each tag: available in scikit-learn
+    - template: registered, see `template_parser`
+    - features (`linear`, `predict_proba`, ...) and tags: supported by the estimator type, see `compatibility_errors`
+
+    Across specs, it checks that class names and output files (by default `f'{name.lower()}.py'`) are unique.
+
+    Returns
+    -------
+    list[SpecError] : All the errors, sorted by position. The batch is valid if the list is empty.
+    """
+    errors: list[SpecError] = []
+    seen_names: dict[str, int] = {}
+    seen_outputs: dict[str, int] = {}
+    estimator_types = tuple(e.value for e in EstimatorType)
+    available_tags = TagType.__members__
+
+    for position, raw_spec in enumerate(specs):
+        if unknown_keys := sorted(set(raw_spec) - SPEC_KEYS):
+            errors.append(SpecError(position, "keys", f"Unknown keys: {unknown_keys}"))
+
+        # Fields with the wrong type are not validated any further
+        type_errors = spec_type_errors(raw_spec, position)
+        errors.extend(type_errors)
+        invalid_fields = {error.field for error in type_errors}
+        spec = {k: v for k, v in raw_spec.items() if k not in invalid_fields} if invalid_fields else raw_spec
+
+        match name_parser(spec.get("name")):
+            case Ok(name):
+                if (first := seen_names.setdefault(name, position)) != position:
+                    errors.append(SpecError(position, "name", f"`{name}` is already the name of spec #{first}"))
+            case Err(name_err_msg):
+                name = ""
+                if "name" not in invalid_fields:
+                    errors.append(SpecError(position, "name", name_err_msg))
+
+        estimator_type = spec.get("estimator_type")
+        if not isinstance(estimator_type, EstimatorType) and estimator_type not in estimator_types:
+            errors.append(
+                SpecError(
+                    position,
+                    "estimator_type",
+                    f"`{estimator_type}` is not a valid estimator type. Available types are: {estimator_types}",
+                )
+            )
+
+        errors.extend(_validate_params(position, spec))
+        tags = _as_list(spec.get("tags"))
+        errors.extend(
+            SpecError(position, "tags", f"`{tag}` is not an available tag") for tag in tags if tag not in available_tags
+        )
+
+        if isinstance(estimator_type, EstimatorType) or estimator_type in estimator_types:
+            errors.extend(
+                SpecError(position, field, message)
+                for field, message in compatibility_errors(
+                    estimator_type,
+                    **{feature: spec.get(feature, False) for feature in SPEC_FLAGS},
+                    tags=tags,
+                )
+            )
+
+        if isinstance(template_err := template_parser(spec.get("template")), Err):
+            errors.append(SpecError(position, "template", template_err.err_value))
+
+        if output_file := str(spec.get("output_file") or (f"{name.lower()}.py" if name else "")):
+            output_key = os.path.normcase(os.path.normpath(output_file))
+            if (first := seen_outputs.setdefault(output_key, position)) != position:
+                errors.append(
+                    SpecError(position, "output_file", f"`{output_file}` is already the output file of spec #{first}")
+                )
+
+    return errors
@@ -0,0 +1,87 @@
+import sys
+import time
+import tracemalloc
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import TYPE_CHECKING, NamedTuple
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+
+class PhaseStats(NamedTuple):
+    """Wall time (in seconds) and peak memory (in bytes) of a single phase."""
+
+    phase: str
+    wall_time: float
+    peak_memory: int
+
+
+class Profiler:
+    """Collect wall time and peak memory of each phase of the forge pipeline.
+
+    Memory is measured with `tracemalloc`, hence it accounts for python allocations only (e.g. memory used by the ruff
+    subprocess is not included), and it is reported as the peak above the memory in use when the phase started.
+
+    Examples
+    --------
+    >>> profiler = Profiler()
+    >>> with profiler.phase("jinja render"):
+    ...     ...
+    >>> [stats.phase for stats in profiler.phases]
+    ['jinja render']
+    """
+
+    def __init__(self: Self) -> None:
+        self.phases: list[PhaseStats] = []
+
+    @contextmanager
+    def phase(self: Self, name: str) -> Generator[None, None, None]:
+        """Measure the wrapped block as phase `name`. Phases should not be nested."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        tracemalloc.reset_peak()
+        memory_start, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+            self.phases.append(PhaseStats(name, wall_time, max(0, peak_memory - memory_start)))
+
+    def to_dict(self: Self) -> dict[str, dict[str, float | int]]:
+        """Return phases as `{phase: {"wall_time_ms": ..., "peak_memory_kib": ...}}`, plus the `total` row."""
+        report: dict[str, dict[str, float | int]] = {
+            stats.phase: {"wall_time_ms": 1000 * stats.wall_time, "peak_memory_kib": stats.peak_memory / 1024}
+            for stats in self.phases
+        }
+        report["total"] = {
+            "wall_time_ms": 1000 * sum(stats.wall_time for stats in self.phases),
+            "peak_memory_kib": max((stats.peak_memory for stats in self.phases), default=0) / 1024,
+        }
+        return report
+
+    def to_table(self: Self) -> "Table":
+        """Return phases as a rich table, plus the `total` row."""
+        from rich.table import Table
+
+        table = Table("Phase", "Wall time (ms)", "Peak memory (KiB)", title="Forge profile")
+        for phase, stats in self.to_dict().items():
+            table.add_row(phase, f"{stats['wall_time_ms']:.2f}", f"{stats['peak_memory_kib']:.1f}")
+        return table
+
+
+def profile_phase(profiler: Profiler | None, name: str) -> AbstractContextManager[None]:
+    """Measure phase `name` if a `profiler` is provided, otherwise do nothing."""
+    return profiler.phase(name) if profiler is not None else nullcontext()
@@ -0,0 +1,161 @@
+import json
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ClassVar
+
+from sksmithy._batch import forge_record
+from sksmithy._formatter import configure_formatter
+from sksmithy._models import EstimatorType
+from sksmithy._skeletons import configure_skeletons
+from sksmithy._templates import get_template
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+MAX_BODY_SIZE: int = 1024 * 1024
+
+
+class LatencyStats:
+    """Thread-safe request latency statistics, computed over the last `window` requests."""
+
+    def __init__(self: Self, window: int = 10_000) -> None:
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+
+    def record(self: Self, latency: float, error: bool = False) -> None:
+        """Record the `latency` (in seconds) of a request."""
+        with self._lock:
+            self._latencies.append(latency)
+            self.count += 1
+            self.errors += error
+
+    def summary(self: Self) -> dict[str, float | int]:
+        """Return count, errors, mean and percentiles (in milliseconds) of the recorded latencies."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            count, errors = self.count, self.errors
+
+        def percentile(q: float) -> float:
+            return 1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+
+        return {
+            "count": count,
+            "errors": errors,
+            "mean_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": 1000 * latencies[-1] if latencies else 0.0,
+        }
+
+
+class ForgeRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler of the forge server.
+
+    - `POST /forge` with a JSON estimator spec as body, returns the record of `forge_record`.
+    - `GET /stats` returns the request latency statistics.
+    - `GET /health` returns `{"status": "ok"}`.
+    """
+
+    server_version: ClassVar[str] = "sksmithy"  # type: ignore[misc]
+    stats: ClassVar[LatencyStats] = LatencyStats()
+    quiet: ClassVar[bool] = True
+
+    def do_GET(self: Self) -> None:
+        match self.path:
+            case "/stats":
+                self._send_json(HTTPStatus.OK, self.stats.summary())
+            case "/health":
+                self._send_json(HTTPStatus.OK, {"status": "ok"})
+            case _:
+                self._send_json(HTTPStatus.NOT_FOUND, {"errors": [f"Unknown endpoint {self.path}"]})
+
+    def do_POST(self: Self) -> None:
+        if self.path != "/forge":
+            self._send_json(HTTPStatus.NOT_FOUND, {"errors": [f"Unknown endpoint {self.path}"]})
+            return
+
+        start = time.perf_counter()
+        try:
+            content_length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"errors": ["Invalid Content-Length header"]})
+            return
+        if content_length > MAX_BODY_SIZE:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"errors": ["Request body is too large"]})
+            return
+
+        record = forge_record(self.rfile.read(content_length))
+        self.stats.record(time.perf_counter() - start, error=bool(record["errors"]))
+
+        self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY if record["errors"] else HTTPStatus.OK, record)
+
+    def address_string(self: Self) -> str:
+        # Unix sockets have no (host, port) client address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix-socket"
+
+    def log_message(self: Self, format: str, *args: Any) -> None:  # noqa: A002,ANN401
+        if not self.quiet:  # pragma: no cover
+            super().log_message(format, *args)
+
+    def _send_json(self: Self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+if sys.platform != "win32":  # pragma: no cover
+
+    class ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+        """HTTP server listening on a Unix socket, handling each request in a separate thread."""
+
+        daemon_threads = True
+
+
+def warm_up(workers: int) -> None:
+    """Compile the template, start the formatter pool, build all the skeletons and forge a first estimator.
+
+    Hence requests are served warm, and in most cases by only splicing values in a pre-rendered skeleton.
+    """
+    get_template()
+    configure_formatter("pool", size=workers)
+    configure_skeletons(warm_up=True)
+    forge_record(json.dumps({"name": "Warmup", "estimator_type": EstimatorType.ClassifierMixin.value}))
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: str | Path | None = None,
+    stats: LatencyStats | None = None,
+) -> socketserver.BaseServer:
+    """Create the forge server, listening either on `host:port` or, if provided, on the Unix socket `socket_path`.
+
+    Each request is handled in a separate thread, hence concurrent clients are supported.
+    """
+    handler = type("Handler", (ForgeRequestHandler,), {"stats": stats or LatencyStats()})
+
+    if socket_path is None:
+        return ThreadingHTTPServer((host, port), handler)
+
+    if sys.platform == "win32":  # pragma: no cover
+        msg = "Unix sockets are not supported on Windows, please use host and port instead"
+        raise ValueError(msg)
+
+    Path(socket_path).unlink(missing_ok=True)
+    return ThreadingUnixHTTPServer(str(socket_path), handler)
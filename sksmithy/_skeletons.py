@@ -0,0 +1,474 @@
+import re
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from itertools import product
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+from sksmithy._formatter import format_many, ruff_config_hash, ruff_line_length, ruff_version
+from sksmithy._models import EstimatorType
+from sksmithy._templates import TEMPLATE_NAME, get_template, template_hash
+from sksmithy._utils import _template_values, render_many, render_template
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+NAME_SENTINEL: Final[str] = "SksmithyName__"
+REQUIRED_SENTINEL: Final[str] = "sksmithy_required__"
+OPTIONAL_SENTINEL: Final[str] = "sksmithy_optional__"
+TAG_SENTINEL: Final[str] = "sksmithy_tag__"
+
+_PARAM_LINE = r"^\s*(?:{s} : \.\.\.|{s},|{s}=\.\.\.,|self\.{s} = {s})$"
+_REQUIRED_LINE = re.compile(_PARAM_LINE.format(s=REQUIRED_SENTINEL))
+_OPTIONAL_LINE = re.compile(_PARAM_LINE.format(s=OPTIONAL_SENTINEL))
+_REQUIRED_LIST_LINE = re.compile(rf"^\s*_required_parameters = \[(?P<quote>[\"']){REQUIRED_SENTINEL}(?P=quote)\]$")
+_TAG_LINE = re.compile(rf"^\s*(?P<quote>[\"']){TAG_SENTINEL}(?P=quote): \.\.\.,$")
+
+
+class SkeletonKey(NamedTuple):
+    """Structural switches of the template, i.e. everything but the name, the parameters and the tags values."""
+
+    estimator_type: EstimatorType
+    linear: bool
+    sample_weight: bool
+    predict_proba: bool
+    decision_function: bool
+    has_required: bool
+    has_optional: bool
+    has_max_iter: bool
+    has_tags: bool
+
+
+class _Line(NamedTuple):
+    """Line of a skeleton, `kind` specifies how it is expanded."""
+
+    kind: str  # one of "literal", "required", "optional", "required_list", "tag"
+    text: str
+    quote: str = ""
+
+
+class _Parameters(list[str]):
+    """Parameters sentinels, which contain `max_iter` (as far as the template knows) only if requested."""
+
+    def __init__(self: Self, iterable: Iterable[str], max_iter: bool) -> None:
+        super().__init__(iterable)
+        self.max_iter = max_iter
+
+    def __contains__(self: Self, item: object) -> bool:
+        return (item == "max_iter" and self.max_iter) or super().__contains__(item)
+
+
+def skeleton_key(
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+) -> SkeletonKey:
+    """Return the skeleton key of a set of `render_template` arguments."""
+    return SkeletonKey(
+        estimator_type=EstimatorType(estimator_type),
+        linear=bool(linear),
+        sample_weight=bool(sample_weight),
+        predict_proba=bool(predict_proba),
+        decision_function=bool(decision_function),
+        has_required=bool(required),
+        has_optional=bool(optional),
+        has_max_iter="max_iter" in required or "max_iter" in optional,
+        has_tags=bool(tags),
+    )
+
+
+def valid_keys() -> Iterator[SkeletonKey]:
+    """Iterate over the skeleton keys of all the combinations that the CLI, TUI and web UI can produce.
+
+    `linear` applies to classifiers and regressors only, `predict_proba` to classifiers and outlier detectors only,
+    and `decision_function` to non linear classifiers only.
+    """
+    # `max_iter` can be among parameters only if there is any parameter
+    params = [
+        combination for combination in product((False, True), repeat=3) if any(combination[:2]) or not combination[2]
+    ]
+
+    for estimator_type in EstimatorType:
+        is_classifier = estimator_type is EstimatorType.ClassifierMixin
+        linear_options = (False, True) if is_classifier or estimator_type is EstimatorType.RegressorMixin else (False,)
+        proba_options = (False, True) if is_classifier or estimator_type is EstimatorType.OutlierMixin else (False,)
+
+        for linear, predict_proba in product(linear_options, proba_options):
+            decision_options = (False, True) if is_classifier and not linear else (False,)
+
+            for decision_function, sample_weight, (req, opt, max_iter), has_tags in product(
+                decision_options, (False, True), params, (False, True)
+            ):
+                yield SkeletonKey(
+                    estimator_type=estimator_type,
+                    linear=linear,
+                    sample_weight=sample_weight,
+                    predict_proba=predict_proba,
+                    decision_function=decision_function,
+                    has_required=req,
+                    has_optional=opt,
+                    has_max_iter=max_iter,
+                    has_tags=has_tags,
+                )
+
+
+def _render_skeleton(key: SkeletonKey) -> str:
+    """Render the jinja template with sentinel values in place of name, parameters and tags."""
+    values = _template_values(
+        name=NAME_SENTINEL,
+        estimator_type=key.estimator_type,
+        required=[REQUIRED_SENTINEL] if key.has_required else [],
+        optional=[OPTIONAL_SENTINEL] if key.has_optional else [],
+        linear=key.linear,
+        sample_weight=key.sample_weight,
+        predict_proba=key.predict_proba,
+        decision_function=key.decision_function,
+        tags=[TAG_SENTINEL] if key.has_tags else None,
+    )
+    values["parameters"] = _Parameters(values["parameters"], max_iter=key.has_max_iter)
+    return get_template().render(values)
+
+
+def _compile(formatted: str) -> tuple[_Line, ...] | None:
+    """Split a formatted skeleton into lines to expand.
+
+    Returns `None` if sentinels end up in lines that cannot be expanded one value at a time (e.g. if ruff is configured
+    to collapse the `__init__` signature on a single line).
+    """
+    lines: list[_Line] = []
+    for text in formatted.splitlines(keepends=True):
+        line = text.rstrip("\n")
+        if _REQUIRED_LINE.match(line):
+            lines.append(_Line("required", text))
+        elif _OPTIONAL_LINE.match(line):
+            lines.append(_Line("optional", text))
+        elif match := _REQUIRED_LIST_LINE.match(line):
+            lines.append(_Line("required_list", text, match["quote"]))
+        elif match := _TAG_LINE.match(line):
+            lines.append(_Line("tag", text, match["quote"]))
+        elif any(sentinel in line for sentinel in (REQUIRED_SENTINEL, OPTIONAL_SENTINEL, TAG_SENTINEL)):
+            return None
+        else:
+            lines.append(_Line("literal", text))
+    return tuple(lines)
+
+
+def _splice(
+    skeleton: tuple[_Line, ...],
+    name: str,
+    required: list[str],
+    optional: list[str],
+    tags: list[str] | None,
+    line_length: int,
+) -> str | None:
+    """Splice the actual values in a compiled skeleton.
+
+    Returns `None` if any spliced line is longer than `line_length`, since ruff would wrap it.
+    """
+    chunks: list[str] = []
+    for kind, text, quote in skeleton:
+        match kind:
+            case "literal":
+                if NAME_SENTINEL not in text:
+                    chunks.append(text)
+                    continue
+                values = [text.replace(NAME_SENTINEL, name)]
+            case "required_list":
+                items = ", ".join(f"{quote}{param}{quote}" for param in required)
+                values = [text.replace(f"{quote}{REQUIRED_SENTINEL}{quote}", items)]
+            case "required":
+                values = [text.replace(REQUIRED_SENTINEL, param) for param in required]
+            case "optional":
+                values = [text.replace(OPTIONAL_SENTINEL, param) for param in optional]
+            case _:  # "tag"
+                values = [text.replace(TAG_SENTINEL, tag) for tag in tags or ()]
+
+        if any(len(value.rstrip("\n")) > line_length for value in values):
+            return None
+        chunks.extend(values)
+
+    return "".join(chunks)
+
+
+def _probe_spec(key: SkeletonKey, name: int = 1, required: int = 1, optional: int = 1, tags: int = 1) -> dict[str, Any]:
+    """Build `render_template` arguments for `key`, with values of the given lengths."""
+    required_params = ["r" * required] if key.has_required else []
+    optional_params = ["o" * optional] if key.has_optional else []
+    if key.has_max_iter:
+        (required_params if key.has_required else optional_params).append("max_iter")
+
+    return {
+        "name": "N" * name,
+        "estimator_type": key.estimator_type,
+        "required": required_params,
+        "optional": optional_params,
+        "linear": key.linear,
+        "sample_weight": key.sample_weight,
+        "predict_proba": key.predict_proba,
+        "decision_function": key.decision_function,
+        "tags": ["t" * tags] if key.has_tags else None,
+    }
+
+
+def _spliced(skeleton: tuple[_Line, ...], spec: dict[str, Any], line_length: int) -> str | None:
+    return _splice(
+        skeleton,
+        name=spec["name"],
+        required=spec["required"],
+        optional=spec["optional"],
+        tags=spec["tags"],
+        line_length=line_length,
+    )
+
+
+def _probe_specs(key: SkeletonKey, skeleton: tuple[_Line, ...], line_length: int) -> list[dict[str, Any]]:
+    """Build the arguments to check `skeleton` against the full pipeline with, at the limits of splicing.
+
+    The first spec has the shortest values. Each of the others has the longest value of one field (name, required or
+    optional parameters, tags) whose lines still fit in `line_length`. If the sentinels made ruff lay out the skeleton
+    differently than the actual values would (e.g. wrapping a line which fits), one of the specs shows it. Returns an
+    empty list if not even the shortest values can be spliced.
+    """
+    if _spliced(skeleton, shortest := _probe_spec(key), line_length) is None:
+        return []
+
+    specs = [shortest]
+    for field, present in (
+        ("name", True),
+        ("required", key.has_required),
+        ("optional", key.has_optional),
+        ("tags", key.has_tags),
+    ):
+        if not present:
+            continue
+        # Splicing is monotone in the length of the values: bisect the longest one which splices
+        low, high = 1, line_length
+        while low < high:
+            mid = (low + high + 1) // 2
+            if _spliced(skeleton, _probe_spec(key, **{field: mid}), line_length) is not None:
+                low = mid
+            else:
+                high = mid - 1
+        specs.append(_probe_spec(key, **{field: low}))
+    return specs
+
+
+class SkeletonTable:
+    """Table of pre-rendered and pre-formatted skeletons, one per `SkeletonKey`.
+
+    A skeleton is the output of the full pipeline (jinja + ruff) with sentinel values in place of the estimator name,
+    parameters and tags. Forging an estimator then only requires to splice the actual values into the skeleton of its
+    key, with no jinja nor ruff work. Skeletons are built on first use (or all at once with `warm_up`), and the table is
+    cleared whenever the template, the ruff version, the ruff configuration or the working directory change.
+    """
+
+    def __init__(self: Self) -> None:
+        self._lock = threading.Lock()
+        self._skeletons: dict[SkeletonKey, tuple[_Line, ...] | None] = {}
+        self._stamp: tuple[str, str, str, str] | None = None
+        self._line_length = 0
+
+    def __len__(self: Self) -> int:
+        return len(self._skeletons)
+
+    def build(self: Self, keys: Iterable[SkeletonKey]) -> None:
+        """Build the skeletons of `keys` which are missing, formatting all of them with a single ruff invocation.
+
+        Each skeleton is then checked against the full pipeline at the limits of splicing (see `_probe_specs`), with a
+        second ruff invocation: skeletons which do not match are discarded, and their keys use the full pipeline.
+        """
+        self._check_stamp()
+        missing = list(dict.fromkeys(key for key in keys if key not in self._skeletons))
+        if not missing:
+            return
+
+        line_length = self._line_length
+        formatted = format_many([_render_skeleton(key) for key in missing])
+        skeletons = dict(zip(missing, map(_compile, formatted), strict=True))
+
+        probes: list[tuple[SkeletonKey, dict[str, Any]]] = []
+        for key, skeleton in skeletons.items():
+            if skeleton is not None and not (specs := _probe_specs(key, skeleton, line_length)):
+                skeletons[key] = None
+            elif skeleton is not None:
+                probes.extend((key, spec) for spec in specs)
+
+        for (key, spec), expected in zip(probes, render_many(spec for _, spec in probes), strict=True):
+            if (skeleton := skeletons[key]) is not None and _spliced(skeleton, spec, line_length) != expected:
+                skeletons[key] = None
+
+        with self._lock:
+            self._skeletons.update(skeletons)
+
+    def warm_up(self: Self) -> int:
+        """Build the skeletons of all the `valid_keys`, returning the number of skeletons in the table."""
+        self.build(valid_keys())
+        return len(self)
+
+    def render(
+        self: Self,
+        name: str,
+        estimator_type: EstimatorType,
+        required: list[str],
+        optional: list[str],
+        linear: bool = False,
+        sample_weight: bool = False,
+        predict_proba: bool = False,
+        decision_function: bool = False,
+        tags: list[str] | None = None,
+    ) -> str | None:
+        """Render the template by splicing values in the skeleton, or return `None` if the skeleton cannot be used."""
+        key = skeleton_key(
+            estimator_type=estimator_type,
+            required=required,
+            optional=optional,
+            linear=linear,
+            sample_weight=sample_weight,
+            predict_proba=predict_proba,
+            decision_function=decision_function,
+            tags=tags,
+        )
+        self.build([key])
+
+        if (skeleton := self._skeletons.get(key)) is None:
+            return None
+        return _splice(
+            skeleton, name=name, required=required, optional=optional, tags=tags, line_length=self._line_length
+        )
+
+    def verify(self: Self, keys: Iterable[SkeletonKey] | None = None) -> list[SkeletonKey]:
+        """Check that splicing is byte-for-byte equal to the full pipeline, for `keys` (default: all `valid_keys`).
+
+        Each key is checked with short and long names, parameters and tags, see `_verify_specs`.
+
+        Returns
+        -------
+        list[SkeletonKey] : The keys for which the output differs.
+        """
+        keys = list(keys if keys is not None else valid_keys())
+        cases = [(key, spec) for key in keys for spec in _verify_specs(key)]
+        expected = render_many(spec for _, spec in cases)
+
+        return list(
+            dict.fromkeys(
+                key
+                for (key, spec), full_pipeline in zip(cases, expected, strict=True)
+                if (spliced := self.render(**spec)) is not None and spliced != full_pipeline
+            )
+        )
+
+    def _check_stamp(self: Self) -> None:
+        stamp = (template_hash(), ruff_version(), ruff_config_hash(), str(Path.cwd()))
+        with self._lock:
+            if stamp != self._stamp:
+                self._skeletons.clear()
+                self._stamp = stamp
+                self._line_length = ruff_line_length()
+
+
+def _verify_specs(key: SkeletonKey) -> list[dict[str, Any]]:
+    """Build representative `render_template` arguments for `key`, with more than one parameter and tag.
+
+    Values come in two flavours: short ones, and long ones which make some lines wrap under common line lengths.
+    """
+    specs = []
+    for name, required, optional in (
+        ("VerifyEstimator", ["alpha", "beta"], ["gamma", "delta"]),
+        ("VerifyEstimatorWithAVeryLongAndDescriptiveName", ["alpha_regularization", "beta"], ["gamma_tolerance"]),
+    ):
+        required_params = list(required) if key.has_required else []
+        optional_params = list(optional) if key.has_optional else []
+        if key.has_max_iter:
+            (required_params if key.has_required else optional_params).append("max_iter")
+
+        specs.append(
+            {
+                "name": name,
+                "estimator_type": key.estimator_type,
+                "required": required_params,
+                "optional": optional_params,
+                "linear": key.linear,
+                "sample_weight": key.sample_weight,
+                "predict_proba": key.predict_proba,
+                "decision_function": key.decision_function,
+                "tags": ["allow_nan", "binary_only"] if key.has_tags else None,
+            }
+        )
+    return specs
+
+
+_skeleton_table: SkeletonTable | None = None
+
+
+def get_skeleton_table() -> SkeletonTable | None:
+    """Return the skeleton table used by `skeleton_render_template`, or `None` if skeletons are disabled."""
+    return _skeleton_table
+
+
+def configure_skeletons(enabled: bool = True, warm_up: bool = False) -> SkeletonTable | None:
+    """Enable (or disable) the skeleton table used by `skeleton_render_template`.
+
+    Parameters
+    ----------
+    enabled
+        Whether to use pre-rendered skeletons.
+    warm_up
+        Whether to build the skeletons of all the valid combinations right away, instead of on first use.
+
+    Returns
+    -------
+    SkeletonTable | None : The new skeleton table, or `None` if disabled.
+    """
+    global _skeleton_table  # noqa: PLW0603
+    _skeleton_table = SkeletonTable() if enabled else None
+
+    if _skeleton_table is not None and warm_up:
+        _skeleton_table.warm_up()
+    return _skeleton_table
+
+
+def skeleton_render_template(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+    template: str = TEMPLATE_NAME,
+) -> str:
+    """Render the template as `render_template` does, but using pre-rendered skeletons if enabled.
+
+    Skeletons are enabled via `configure_skeletons`, and are available for the bundled template only.
+
+    If skeletons are disabled, or the skeleton cannot be used (e.g. a spliced line would be too long), the full pipeline
+    is used instead.
+    """
+    kwargs: dict[str, Any] = {
+        "name": name,
+        "estimator_type": estimator_type,
+        "required": required,
+        "optional": optional,
+        "linear": linear,
+        "sample_weight": sample_weight,
+        "predict_proba": predict_proba,
+        "decision_function": decision_function,
+        "tags": tags,
+    }
+    if (
+        template == TEMPLATE_NAME
+        and (table := _skeleton_table) is not None
+        and (forged_template := table.render(**kwargs)) is not None
+    ):
+        return forged_template
+    return render_template(**kwargs, template=template)
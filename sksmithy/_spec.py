@@ -0,0 +1,131 @@
+import ast
+import hashlib
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+from sksmithy._models import EstimatorType
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+
+@dataclass(frozen=True, slots=True)
+class ForgeSpec:
+    """Immutable and hashable specification of an estimator to forge.
+
+    It holds the same arguments of `render_template`, with sequences stored as tuples, hence it can be used directly as
+    dictionary or cache key.
+
+    Parameters
+    ----------
+    name
+        The name of the estimator.
+    estimator_type
+        The type of the estimator.
+    required
+        The required parameters, as a sequence of names (a comma-separated string is rejected).
+    optional
+        The optional parameters, as a sequence of names (a comma-separated string is rejected).
+    linear
+        Whether or not the estimator is linear.
+    sample_weight
+        Whether or not the estimator supports sample weights in `.fit()`.
+    predict_proba
+        Whether or not the estimator should implement `.predict_proba()` method.
+    decision_function
+        Whether or not the estimator should implement `.decision_function()` method.
+    tags
+        The scikit-learn extra tags.
+    template
+        The name of the template to render, see `sksmithy._templates.TemplateRegistry`.
+    """
+
+    name: str
+    estimator_type: EstimatorType
+    required: tuple[str, ...] = ()
+    optional: tuple[str, ...] = ()
+    linear: bool = False
+    sample_weight: bool = False
+    predict_proba: bool = False
+    decision_function: bool = False
+    tags: tuple[str, ...] = ()
+    template: str = "default"
+
+    def __post_init__(self: Self) -> None:
+        # Accept any sequence (e.g. lists returned by the parsers), but store tuples to keep the spec hashable
+        for field in ("required", "optional", "tags"):
+            value = getattr(self, field)
+            if isinstance(value, str):
+                # A string is a sequence as well, yet of characters rather than of names
+                msg = f"`{field}` should be a sequence of strings, not a string: use e.g. `{tuple(value.split(','))}`"
+                raise TypeError(msg)
+            if not isinstance(value, tuple):
+                object.__setattr__(self, field, tuple(value or ()))
+
+        if not isinstance(self.estimator_type, EstimatorType):
+            object.__setattr__(self, "estimator_type", EstimatorType(self.estimator_type))
+
+    def to_kwargs(self: Self) -> dict[str, Any]:
+        """Return the keyword arguments of `render_template`."""
+        return {
+            "name": self.name,
+            "estimator_type": self.estimator_type,
+            "required": list(self.required),
+            "optional": list(self.optional),
+            "linear": self.linear,
+            "sample_weight": self.sample_weight,
+            "predict_proba": self.predict_proba,
+            "decision_function": self.decision_function,
+            "tags": list(self.tags) or None,
+            "template": self.template,
+        }
+
+    def forge(self: Self) -> "ForgeResult":
+        """Return the (lazily computed) forge result of the spec."""
+        return ForgeResult(self)
+
+
+class ForgeResult:
+    """Outputs of forging a `ForgeSpec`, each computed on first access and memoized.
+
+    - `raw`: the rendered jinja template, not formatted.
+    - `digest`: sha256 hex digest of `raw`.
+    - `source`: the formatted source code, as returned by `render_template`.
+    - `tree`: the parsed `ast.Module` of `source`.
+
+    Callers which only need `raw` or `digest` never pay for formatting.
+    """
+
+    def __init__(self: Self, spec: ForgeSpec) -> None:
+        self.spec = spec
+
+    def __repr__(self: Self) -> str:
+        return f"ForgeResult({self.spec!r})"
+
+    @cached_property
+    def raw(self: Self) -> str:
+        """Rendered jinja template, not formatted."""
+        from sksmithy._utils import _render_jinja
+
+        return _render_jinja(**self.spec.to_kwargs())
+
+    @cached_property
+    def digest(self: Self) -> str:
+        """Sha256 hex digest of the raw render."""
+        return hashlib.sha256(self.raw.encode("utf-8")).hexdigest()
+
+    @cached_property
+    def source(self: Self) -> str:
+        """Formatted source code."""
+        from sksmithy._formatter import format_source
+
+        return format_source(self.raw)
+
+    @cached_property
+    def tree(self: Self) -> ast.Module:
+        """Parsed module of the formatted source code."""
+        return ast.parse(self.source)
@@ -0,0 +1,308 @@
+import hashlib
+import os
+import sys
+import threading
+from collections.abc import Callable
+from importlib import resources
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound
+from jinja2.bccache import Bucket
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from importlib.metadata import EntryPoint
+
+TEMPLATE_PATH: Final[Path] = Path(str(resources.files("sksmithy") / "_static" / "template.py.jinja"))
+TEMPLATE_NAME: Final[str] = "default"
+TEMPLATE_DIR_ENV: Final[str] = "SKSMITHY_TEMPLATE_DIR"
+ENTRY_POINT_GROUP: Final[str] = "sksmithy.templates"
+TEMPLATE_SUFFIXES: Final[tuple[str, ...]] = (".py.jinja", ".jinja")
+
+
+class TemplateRegistry:
+    """Registry of the available templates, each resolved to its file lazily, on first use.
+
+    Templates are looked up, in order of precedence, in:
+
+    - the user directory: any `<name>.py.jinja` (or `<name>.jinja`) file in it is available as `<name>`. It defaults to
+        the `SKSMITHY_TEMPLATE_DIR` environment variable, if set.
+    - the `sksmithy.templates` entry points group: the entry point name is the template name, and the object it
+        references should be the path to the template file (or a callable returning it). Entry points are discovered
+        at the first lookup of a template which is not in the user directory, and loaded only when requested.
+    - the bundled template, available as `default`.
+
+    Parameters
+    ----------
+    user_dir
+        Folder with the user templates.
+    """
+
+    def __init__(self: Self, user_dir: str | Path | None = None) -> None:
+        self.user_dir = Path(user_dir) if user_dir is not None else None
+        self._entry_points: dict[str, EntryPoint] | None = None
+        self._resolved: dict[str, Path] = {}
+        self._lock = threading.Lock()
+
+    def path(self: Self, name: str) -> Path:
+        """Return the path of the template file of `name`.
+
+        Raises
+        ------
+        TemplateNotFound
+            If no template is registered as `name`.
+        """
+        if (user_file := self._user_file(name)) is not None:
+            return user_file
+
+        with self._lock:
+            if (resolved := self._resolved.get(name)) is not None:
+                return resolved
+
+            if (entry_point := self._discover().get(name)) is not None:
+                loaded = entry_point.load()
+                resolved = Path(str(loaded() if callable(loaded) else loaded))
+            elif name == TEMPLATE_NAME:
+                resolved = TEMPLATE_PATH
+            else:
+                raise TemplateNotFound(name)
+
+            self._resolved[name] = resolved
+            return resolved
+
+    def names(self: Self) -> list[str]:
+        """Return the names of all the registered templates, sorted."""
+        user_names = (
+            {self._strip_suffix(path.name) for path in self.user_dir.iterdir() if path.name.endswith(TEMPLATE_SUFFIXES)}
+            if self.user_dir is not None and self.user_dir.is_dir()
+            else set()
+        )
+        with self._lock:
+            entry_point_names = set(self._discover())
+        return sorted({TEMPLATE_NAME, *entry_point_names, *user_names})
+
+    def __contains__(self: Self, name: object) -> bool:
+        try:
+            self.path(str(name))
+        except TemplateNotFound:
+            return False
+        return True
+
+    def _user_file(self: Self, name: str) -> Path | None:
+        if self.user_dir is None:
+            return None
+        return next(
+            (path for suffix in TEMPLATE_SUFFIXES if (path := self.user_dir / f"{name}{suffix}").is_file()),
+            None,
+        )
+
+    def _discover(self: Self) -> "dict[str, EntryPoint]":
+        if self._entry_points is None:
+            from importlib.metadata import entry_points
+
+            self._entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        return self._entry_points
+
+    @staticmethod
+    def _strip_suffix(filename: str) -> str:
+        return next(filename.removesuffix(suffix) for suffix in TEMPLATE_SUFFIXES if filename.endswith(suffix))
+
+
+class RegistryLoader(BaseLoader):
+    """Jinja loader reading templates from a `TemplateRegistry`.
+
+    Compiled templates are kept by the environment until the source file changes: its modification time and size are
+    checked at each lookup (the environment has `auto_reload=True`), and the on-disk bytecode cache is validated
+    against the source checksum.
+    """
+
+    def __init__(self: Self, registry: TemplateRegistry) -> None:
+        self.registry = registry
+
+    def get_source(self: Self, environment: Environment, template: str) -> tuple[str, str, Callable[[], bool]]:  # noqa: ARG002
+        path = self.registry.path(template)
+        stamp = _stamp(path)
+        source = path.read_text(encoding="utf-8")
+
+        def uptodate() -> bool:
+            try:
+                return _stamp(path) == stamp
+            except OSError:
+                return False
+
+        return source, str(path), uptodate
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TemplateCacheInfo(NamedTuple):
+    """Hits and misses of the compiled template caches.
+
+    `hits` and `misses` refer to the in-process cache of compiled templates, while `bytecode_hits` and
+    `bytecode_misses` refer to the on-disk bytecode cache (if configured via `configure_template_cache`).
+    """
+
+    hits: int
+    misses: int
+    bytecode_hits: int
+    bytecode_misses: int
+
+
+class _CountingBytecodeCache(FileSystemBytecodeCache):
+    """On-disk bytecode cache keeping track of hits and misses.
+
+    Jinja stores the checksum of the template source alongside the bytecode, and discards the bytecode if the checksum
+    does not match. Therefore a change in the template content results in a miss and a fresh compilation.
+    """
+
+    def __init__(self, directory: str) -> None:
+        super().__init__(directory=directory, pattern="__sksmithy_%s.cache")
+        self.hits = 0
+        self.misses = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+
+_registry = TemplateRegistry(user_dir=os.environ.get(TEMPLATE_DIR_ENV))
+
+_ENVIRONMENT: Final[Environment] = Environment(  # noqa: S701  # Generating python code, not html
+    loader=RegistryLoader(_registry),
+    auto_reload=True,
+)
+
+
+def get_registry() -> TemplateRegistry:
+    """Return the template registry in use."""
+    return _registry
+
+
+def configure_registry(user_dir: str | Path | None = None) -> TemplateRegistry:
+    """Replace the template registry, e.g. to change the user templates directory, and drop compiled templates.
+
+    Parameters
+    ----------
+    user_dir
+        Folder with the user templates.
+
+    Returns
+    -------
+    TemplateRegistry : The new template registry.
+    """
+    global _registry  # noqa: PLW0603
+    _registry = TemplateRegistry(user_dir=user_dir)
+    _ENVIRONMENT.loader = RegistryLoader(_registry)
+    clear_template_cache()
+    return _registry
+
+
+_compiled: dict[str, Template] = {}
+_stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def get_template(name: str = TEMPLATE_NAME) -> Template:
+    """Get the compiled template `name`, see `TemplateRegistry` for the available templates.
+
+    The template is compiled only once per process (and re-compiled only if the file changes on disk), subsequent
+    calls return the same compiled object.
+    """
+    template = _ENVIRONMENT.get_template(name)
+
+    if _compiled.get(name) is template:
+        _stats["hits"] += 1
+    else:
+        _stats["misses"] += 1
+        _compiled[name] = template
+
+    return template
+
+
+def configure_template_cache(directory: str | Path | None) -> None:
+    """Enable (or disable, if `directory` is `None`) the on-disk bytecode cache for compiled templates.
+
+    Parameters
+    ----------
+    directory
+        Folder where to store the bytecode. It is created if it does not exist.
+    """
+    if directory is None:
+        _ENVIRONMENT.bytecode_cache = None
+    else:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        _ENVIRONMENT.bytecode_cache = _CountingBytecodeCache(directory=str(directory))
+
+    clear_template_cache()
+
+
+def clear_template_cache() -> None:
+    """Drop compiled templates and reset the cache statistics."""
+    if _ENVIRONMENT.cache is not None:
+        _ENVIRONMENT.cache.clear()
+
+    _compiled.clear()
+    _stats.update(hits=0, misses=0)
+
+    if isinstance(bytecode_cache := _ENVIRONMENT.bytecode_cache, _CountingBytecodeCache):
+        bytecode_cache.hits = bytecode_cache.misses = 0
+
+
+def template_cache_info() -> TemplateCacheInfo:
+    """Report compiled template cache statistics."""
+    bytecode_cache = _ENVIRONMENT.bytecode_cache
+    bytecode_hits, bytecode_misses = (
+        (bytecode_cache.hits, bytecode_cache.misses) if isinstance(bytecode_cache, _CountingBytecodeCache) else (0, 0)
+    )
+    return TemplateCacheInfo(
+        hits=_stats["hits"],
+        misses=_stats["misses"],
+        bytecode_hits=bytecode_hits,
+        bytecode_misses=bytecode_misses,
+    )
+
+
+_hashes: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def template_hash(name: str = TEMPLATE_NAME) -> str:
+    """Return the sha256 hex digest of the source of template `name`.
+
+    The digest is recomputed only if the file modification time or size changes.
+    """
+    path = _template_file(name)
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    match _hashes.get(name):
+        case (cached_stamp, digest) if cached_stamp == stamp:
+            return digest
+        case _:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            _hashes[name] = (stamp, digest)
+            return digest
+
+
+def _template_file(name: str) -> Path:
+    """Locate template `name` with the environment loader."""
+    loader = _ENVIRONMENT.loader
+    if isinstance(loader, RegistryLoader):
+        return loader.registry.path(name)
+
+    search_path = loader.searchpath if isinstance(loader, FileSystemLoader) else []
+
+    for directory in search_path:
+        if (candidate := Path(directory) / name).is_file():
+            return candidate
+
+    raise TemplateNotFound(name)
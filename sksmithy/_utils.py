@@ -1,13 +1,14 @@
-import subprocess
-from importlib import resources
-from pathlib import Path
-from typing import Final
-
-from jinja2 import Template
+import ast
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any
 
+from sksmithy._formatter import aformat_many, aformat_source, format_many, format_source
 from sksmithy._models import EstimatorType
+from sksmithy._profiling import Profiler, profile_phase
+from sksmithy._templates import TEMPLATE_NAME, TEMPLATE_PATH, get_template
 
-TEMPLATE_PATH: Final[Path] = Path(str(resources.files("sksmithy") / "_static" / "template.py.jinja"))
+__all__ = ("TEMPLATE_PATH", "arender_many", "arender_template", "render_many", "render_module", "render_template")
 
 
 def render_template(
@@ -20,14 +21,18 @@ def render_template(
     predict_proba: bool = False,
     decision_function: bool = False,
     tags: list[str] | None = None,
+    template: str = TEMPLATE_NAME,
+    profiler: Profiler | None = None,
 ) -> str:
     """
     Render a template using the provided parameters.
 
     This is achieved in a two steps process:
 
-    - Render the jinja template using the input values.
-    - Format the string using ruff formatter.
+    - Render the jinja template using the input values. The template is compiled once per process, see
+        `sksmithy._templates.get_template`.
+    - Format the string using ruff formatter. By default a `ruff format -` subprocess is spawned at each call, see
+        `sksmithy._formatter.configure_formatter` to keep a pool of long-lived ruff workers instead.
 
     !!! warning
 
@@ -55,12 +60,233 @@ def render_template(
         Whether or not the estimator should implement `.decision_function()` method.
     tags
         The list of scikit-learn extra tags.
+    template
+        Name of the template to render, see `sksmithy._templates.TemplateRegistry`.
+    profiler
+        If provided, wall time and peak memory of the "template load", "jinja render" and "ruff format" phases are
+        recorded in it.
 
     Returns
     -------
     str : The rendered and formatted template as a string.
     """
-    values = {
+    source = _render_jinja(
+        name=name,
+        estimator_type=estimator_type,
+        required=required,
+        optional=optional,
+        linear=linear,
+        sample_weight=sample_weight,
+        predict_proba=predict_proba,
+        decision_function=decision_function,
+        tags=tags,
+        template=template,
+        profiler=profiler,
+    )
+    with profile_phase(profiler, "ruff format"):
+        return format_source(source)
+
+
+def render_many(specs: Iterable[Mapping[str, Any]]) -> list[str]:
+    """Render many templates at once, formatting all of them with a single ruff invocation.
+
+    The result is the same as `[render_template(**spec) for spec in specs]`, but instead of paying the ruff startup
+    cost for each spec, all the rendered templates are written to a temporary folder and formatted in one go.
+
+    Parameters
+    ----------
+    specs
+        Iterable of mappings, each of which contains the keyword arguments of `render_template`.
+
+    Returns
+    -------
+    list[str] : The rendered and formatted templates, in the same order as `specs`.
+    """
+    return format_many([_render_jinja(**spec) for spec in specs])
+
+
+def render_module(specs: Iterable[Mapping[str, Any]]) -> str:
+    """Render many estimators into a single module, with merged and deduplicated imports.
+
+    Each template is rendered with jinja, then the leading imports of all of them are merged: modules are listed once,
+    in order of first appearance, each importing the union of the names the estimators need. The whole module is
+    formatted with a single ruff pass.
+
+    Parameters
+    ----------
+    specs
+        Iterable of mappings, each of which contains the keyword arguments of `render_template`.
+
+    Returns
+    -------
+    str : The rendered and formatted module, with the estimator classes in the same order as `specs`.
+
+    Raises
+    ------
+    ValueError
+        If two specs have the same name.
+    """
+    specs = list(specs)
+    if duplicated := sorted(name for name, count in Counter(spec["name"] for spec in specs).items() if count > 1):
+        msg = f"Estimator names should be unique within a module, found duplicates: {duplicated}"
+        raise ValueError(msg)
+
+    imports: dict[tuple[str, str | None, int], dict[tuple[str, str | None], None]] = {}
+    bodies: list[str] = []
+
+    for spec in specs:
+        source = _render_jinja(**spec)
+        tree = ast.parse(source)
+        leading: list[ast.Import | ast.ImportFrom] = []
+        for node in tree.body:
+            if not isinstance(node, ast.Import | ast.ImportFrom):
+                break
+            leading.append(node)
+
+        for node in leading:
+            key = ("from", node.module, node.level) if isinstance(node, ast.ImportFrom) else ("import", None, 0)
+            aliases = imports.setdefault(key, {})
+            aliases.update(dict.fromkeys((alias.name, alias.asname) for alias in node.names))
+
+        lines = source.splitlines()
+        bodies.append("\n".join(lines[leading[-1].end_lineno if leading else 0 :]).strip())
+
+    import_lines = []
+    for (kind, module, level), aliases in imports.items():
+        names = [ast.alias(name=name, asname=asname) for name, asname in aliases]
+        if kind == "from":
+            import_lines.append(ast.unparse(ast.ImportFrom(module=module, names=names, level=level)))
+        else:
+            import_lines.extend(ast.unparse(ast.Import(names=[name])) for name in names)
+
+    return format_source("\n".join(import_lines) + "\n\n\n" + "\n\n\n".join(bodies) + "\n")
+
+
+async def arender_template(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+    template: str = TEMPLATE_NAME,
+    timeout: float | None = None,
+) -> str:
+    """Asynchronous version of `render_template`, which does not block the event loop while ruff formats the code.
+
+    If the coroutine is cancelled, or ruff takes longer than `timeout` seconds (raising `asyncio.TimeoutError`), the
+    ruff subprocess is killed.
+
+    Parameters
+    ----------
+    name
+        The name of the template.
+    estimator_type
+        The type of the estimator.
+    required
+        The list of required parameters.
+    optional
+        The list of optional parameters.
+    linear
+        Whether or not the estimator is linear.
+    sample_weight
+        Whether or not the estimator supports sample weights in `.fit()`.
+    predict_proba
+        Whether or not the estimator should implement `.predict_proba()` method.
+    decision_function
+        Whether or not the estimator should implement `.decision_function()` method.
+    tags
+        The list of scikit-learn extra tags.
+    template
+        Name of the template to render, see `sksmithy._templates.TemplateRegistry`.
+    timeout
+        Maximum number of seconds to wait for ruff to format the code.
+
+    Returns
+    -------
+    str : The rendered and formatted template as a string.
+    """
+    source = _render_jinja(
+        name=name,
+        estimator_type=estimator_type,
+        required=required,
+        optional=optional,
+        linear=linear,
+        sample_weight=sample_weight,
+        predict_proba=predict_proba,
+        decision_function=decision_function,
+        tags=tags,
+        template=template,
+    )
+    return await aformat_source(source, timeout=timeout)
+
+
+async def arender_many(specs: Iterable[Mapping[str, Any]], timeout: float | None = None) -> list[str]:
+    """Asynchronous version of `render_many`.
+
+    Parameters
+    ----------
+    specs
+        Iterable of mappings, each of which contains the keyword arguments of `render_template`.
+    timeout
+        Maximum number of seconds to wait for ruff to format the code.
+
+    Returns
+    -------
+    list[str] : The rendered and formatted templates, in the same order as `specs`.
+    """
+    return await aformat_many([_render_jinja(**spec) for spec in specs], timeout=timeout)
+
+
+def _render_jinja(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+    template: str = TEMPLATE_NAME,
+    profiler: Profiler | None = None,
+) -> str:
+    """Render the jinja template only, without formatting the output."""
+    values = _template_values(
+        name=name,
+        estimator_type=estimator_type,
+        required=required,
+        optional=optional,
+        linear=linear,
+        sample_weight=sample_weight,
+        predict_proba=predict_proba,
+        decision_function=decision_function,
+        tags=tags,
+    )
+
+    with profile_phase(profiler, "template load"):
+        compiled = get_template(template)
+
+    with profile_phase(profiler, "jinja render"):
+        return compiled.render(values)
+
+
+def _template_values(
+    name: str,
+    estimator_type: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    linear: bool = False,
+    sample_weight: bool = False,
+    predict_proba: bool = False,
+    decision_function: bool = False,
+    tags: list[str] | None = None,
+) -> dict[str, Any]:
+    """Values passed to the jinja template."""
+    return {
         "name": name,
         "estimator_type": estimator_type.value,
         "mixin": estimator_type.name,
@@ -73,8 +299,3 @@ def render_template(
         "decision_function": decision_function,
         "tags": tags,
     }
-
-    with TEMPLATE_PATH.open(mode="r") as stream:
-        template = Template(stream.read()).render(values)
-
-    return subprocess.check_output(["ruff", "format", "-"], input=template, encoding="utf-8")
@@ -0,0 +1,156 @@
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from pathlib import Path
+from typing import NamedTuple
+
+from sksmithy._batch import BatchOutcome, forge_batch, load_specs
+from sksmithy._templates import TEMPLATE_NAME, get_registry
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+_Stamp = tuple[int, int] | None
+
+
+def _stamp(path: Path) -> _Stamp:
+    """Modification time and size of `path`, or `None` if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PollingWatcher:
+    """Watch files for changes by polling their modification time and size.
+
+    Polling only relies on `os.stat`, hence it behaves the same on every platform and file system (including network
+    and container mounts, where native notifications are often unavailable). Since only a handful of files are watched,
+    its cost is negligible.
+
+    Parameters
+    ----------
+    paths
+        Files to watch. A missing file is not an error: its creation is reported as a change.
+    interval
+        Number of seconds between two polls.
+    debounce
+        Number of seconds without further changes after which a burst of edits is reported, as a whole.
+    """
+
+    def __init__(self: Self, paths: Iterable[str | Path], interval: float = 0.1, debounce: float = 0.2) -> None:
+        self.paths = tuple(Path(path) for path in paths)
+        self.interval = interval
+        self.debounce = debounce
+        self._stamps = self._snapshot()
+
+    def _snapshot(self: Self) -> dict[Path, _Stamp]:
+        return {path: _stamp(path) for path in self.paths}
+
+    def poll(self: Self) -> set[Path]:
+        """Return the files changed since the previous poll."""
+        stamps = self._snapshot()
+        changed = {path for path, stamp in stamps.items() if stamp != self._stamps[path]}
+        self._stamps = stamps
+        return changed
+
+    def wait(self: Self, stop: threading.Event | None = None) -> set[Path]:
+        """Block until some files change and no further change happens for `debounce` seconds.
+
+        Returns the changed files, or an empty set if `stop` is set while waiting.
+        """
+        stop = stop or threading.Event()
+        changed: set[Path] = set()
+        last_change = 0.0
+
+        while not stop.wait(self.interval):
+            if new_changes := self.poll():
+                changed |= new_changes
+                last_change = time.monotonic()
+            elif changed and time.monotonic() - last_change >= self.debounce:
+                return changed
+
+        return set()
+
+
+class WatchUpdate(NamedTuple):
+    """Result of re-forging a spec file after a change.
+
+    `latency` is the number of seconds from the end of the debounce window to all files being written. If the spec file
+    cannot be loaded, `outcomes` is empty and `error` holds the reason.
+    """
+
+    changed: frozenset[Path]
+    outcomes: list[BatchOutcome]
+    latency: float
+    error: str | None = None
+
+
+def forge_update(spec_file: str | Path, manifest: str | Path, changed: Iterable[Path] = ()) -> WatchUpdate:
+    """Re-forge `spec_file` in process with the warm renderer, rendering only the specs whose inputs changed."""
+    start = time.perf_counter()
+    try:
+        specs = load_specs(spec_file)
+    except Exception as exc:  # noqa: BLE001  # Any parsing error of a half-edited file
+        return WatchUpdate(frozenset(changed), [], time.perf_counter() - start, f"Unable to load {spec_file}: {exc}")
+
+    outcomes = forge_batch(specs, manifest=manifest, warm=True)
+    return WatchUpdate(frozenset(changed), outcomes, time.perf_counter() - start)
+
+
+def template_paths(spec_file: str | Path) -> set[Path]:
+    """Return the files of the templates used by the specs of `spec_file`, including the default one.
+
+    Unknown templates and specs that cannot be loaded are ignored: they are reported when forging.
+    """
+    registry = get_registry()
+    names = {TEMPLATE_NAME}
+    with suppress(Exception):  # Any parsing error of a half-edited file
+        names |= {str(spec["template"]) for spec in load_specs(spec_file) if spec.get("template")}
+    return {registry.path(name) for name in names if name in registry}
+
+
+def watch(
+    spec_file: str | Path,
+    manifest: str | Path,
+    on_update: Callable[[WatchUpdate], None],
+    stop: threading.Event | None = None,
+    interval: float = 0.1,
+    debounce: float = 0.2,
+) -> None:
+    """Forge `spec_file`, then re-forge it at each change of the spec file or of the templates, until `stop` is set.
+
+    The watched templates are the ones the specs use (see `template_paths`), updated whenever the spec file changes.
+    Each run goes through the manifest, hence only the estimators whose spec or template changed are rendered, and only
+    files whose content changes are written. For low latency, the warm renderer should be configured beforehand (see
+    `configure_formatter` and `configure_skeletons`).
+
+    Parameters
+    ----------
+    spec_file
+        Spec file to watch, see `load_specs`.
+    manifest
+        Path of the manifest, see `forge_batch`.
+    on_update
+        Callback invoked with the `WatchUpdate` of each run, including the first one.
+    stop
+        Event to stop watching. If not provided, watch forever.
+    interval
+        Number of seconds between two polls of the watched files.
+    debounce
+        Number of seconds to wait for a burst of edits to settle before re-forging.
+    """
+    watched = template_paths(spec_file)
+    watcher = PollingWatcher([spec_file, *watched], interval=interval, debounce=debounce)
+    on_update(forge_update(spec_file, manifest, changed=[Path(spec_file)]))
+
+    while changed := watcher.wait(stop):
+        if Path(spec_file) in changed and (new_watched := template_paths(spec_file)) != watched:
+            watched = new_watched
+            watcher = PollingWatcher([spec_file, *watched], interval=interval, debounce=debounce)
+        on_update(forge_update(spec_file, manifest, changed=changed))
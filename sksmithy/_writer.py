@@ -0,0 +1,105 @@
+import tempfile
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _is_unchanged(path: Path, data: bytes) -> bool:
+    """Whether `path` already holds `data`. The size is compared first, to avoid reading files which surely differ."""
+    try:
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _replace(path: Path, data: bytes) -> None:
+    """Write `data` to a temporary file next to `path`, then rename it over `path`."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as tmp_file:
+        tmp_path = Path(tmp_file.name)
+
+    try:
+        tmp_path.write_bytes(data)
+        if path.exists():
+            # Keep the permissions of the file being replaced, rather than the restrictive ones of temporary files
+            tmp_path.chmod(path.stat().st_mode)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path: str | Path, content: str) -> None:
+    """Write `content` to `path` through a temporary file in the same folder, renamed over `path` once complete.
+
+    Readers (and a crash half-way) never observe a partially written file. The parent folder should already exist.
+    """
+    _replace(Path(path), content.encode("utf-8"))
+
+
+def write_if_changed(path: str | Path, content: str) -> bool:
+    """Atomically write `content` to `path`, unless the file already holds the very same content.
+
+    Leaving unchanged files untouched preserves their modification time, hence downstream build and test caches.
+    Missing parent folders are created.
+
+    Returns
+    -------
+    bool : Whether the file was written.
+    """
+    path, data = Path(path), content.encode("utf-8")
+    if _is_unchanged(path, data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _replace(path, data)
+    return True
+
+
+def write_many(files: Mapping[str, str], max_workers: int = 32) -> dict[str, bool | Exception]:
+    """Write many files at once, each one as `write_if_changed` does.
+
+    Parent folders are created up front, once per distinct folder, then files are compared and written concurrently:
+    on network file systems, where each operation is a round trip, this is much faster than writing files one by one.
+
+    Parameters
+    ----------
+    files
+        Mapping from destination path to content.
+    max_workers
+        Maximum number of concurrent writes.
+
+    Returns
+    -------
+    dict[str, bool | Exception] : For each path, whether the file was written, or the exception raised writing it.
+    """
+    results: dict[str, bool | Exception] = {}
+
+    folders: dict[Path, Exception | None] = {}
+    for folder in {Path(path).parent for path in files}:
+        try:
+            folder.mkdir(parents=True, exist_ok=True)
+            folders[folder] = None
+        except OSError as exc:  # noqa: PERF203
+            folders[folder] = exc
+
+    to_write = []
+    for path in files:
+        if (folder_error := folders[Path(path).parent]) is not None:
+            results[path] = folder_error
+        else:
+            to_write.append(path)
+
+    def write(path: str) -> bool | Exception:
+        destination, data = Path(path), files[path].encode("utf-8")
+        try:
+            if _is_unchanged(destination, data):
+                return False
+            _replace(destination, data)
+        except Exception as exc:  # noqa: BLE001
+            return exc
+        return True
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_write)))) as executor:
+        results.update(zip(to_write, executor.map(write, to_write), strict=True))
+
+    return {path: results[path] for path in files}
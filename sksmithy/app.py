@@ -5,7 +5,9 @@ from importlib.metadata import version
 
 from result import Err, Ok
 
-from sksmithy._models import EstimatorType, TagType
+from sksmithy._cache import cached_render_template
+from sksmithy._capabilities import Capability, capabilities, supported_tags
+from sksmithy._models import EstimatorType
 from sksmithy._parsers import check_duplicates, name_parser, params_parser
 from sksmithy._prompts import (
     PROMPT_DECISION_FUNCTION,
@@ -17,7 +19,6 @@ from sksmithy._prompts import (
     PROMPT_REQUIRED,
     PROMPT_SAMPLE_WEIGHT,
 )
-from sksmithy._utils import render_template
 
 if (st_version := version("streamlit")) and tuple(int(re.sub(r"\D", "", str(v))) for v in st_version.split(".")) < (
     1,
@@ -151,6 +152,8 @@ def app() -> None:  # noqa: C901,PLR0912,PLR0915
         if required_is_valid and optional_is_valid and (msg_duplicated_params := check_duplicates(required, optional)):
             st.error(msg_duplicated_params)
 
+    supported = capabilities(estimator_type) if estimator_type else Capability(0)
+
     with st.container():  # sample_weight and linear
         c31, c32 = st.columns(2)
 
@@ -163,18 +166,21 @@ def app() -> None:  # noqa: C901,PLR0912,PLR0915
         with c32:  # linear
             linear = st.toggle(
                 label=PROMPT_LINEAR,
-                disabled=(estimator_type not in {EstimatorType.ClassifierMixin, EstimatorType.RegressorMixin}),
+                disabled=Capability.linear not in supported,
                 help="Available only if estimator is `Classifier` or `Regressor`",
                 key="linear",
             )
 
+    # A linear classifier already implements decision_function
+    supported = capabilities(estimator_type, linear=linear) if estimator_type else Capability(0)
+
     with st.container():  # predict_proba and decision_function
         c41, c42 = st.columns(2)
 
         with c41:  # predict_proba
             predict_proba = st.toggle(
                 label=PROMPT_PREDICT_PROBA,
-                disabled=(estimator_type not in {EstimatorType.ClassifierMixin, EstimatorType.OutlierMixin}),
+                disabled=Capability.predict_proba not in supported,
                 help=(
                     "[predict_proba](https://scikit-learn.org/dev/glossary.html#term-predict_proba): "
                     "Available only if estimator is `Classifier` or `Outlier`. "
@@ -185,7 +191,7 @@ def app() -> None:  # noqa: C901,PLR0912,PLR0915
         with c42:  # decision_function
             decision_function = st.toggle(
                 label=PROMPT_DECISION_FUNCTION,
-                disabled=(estimator_type != EstimatorType.ClassifierMixin) or linear,
+                disabled=Capability.decision_function not in supported,
                 help=(
                     "[decision_function](https://scikit-learn.org/dev/glossary.html#term-decision_function): "
                     "Available only if estimator is `Classifier`"
@@ -210,8 +216,8 @@ def app() -> None:  # noqa: C901,PLR0912,PLR0915
         ):
             tags = st.multiselect(
                 label="Select tags",
-                options=tuple(e.value for e in TagType),
-                help="These tags are not validated against the selected estimator type!",
+                options=supported_tags(estimator_type) if estimator_type else (),
+                help="Only the tags available for the selected estimator type are listed",
                 key="tags",
             )
 
@@ -232,7 +238,7 @@ def app() -> None:  # noqa: C901,PLR0912,PLR0915
             )
             if forge_btn:
                 st.session_state["forge_counter"] += 1
-                st.session_state["forged_template"] = render_template(
+                st.session_state["forged_template"] = cached_render_template(
                     name=name,
                     estimator_type=estimator_type,  # type: ignore[arg-type]  # At this point estimator_type is never None.
                     required=required,
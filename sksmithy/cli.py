@@ -3,19 +3,32 @@ from pathlib import Path
 import typer
 
 from sksmithy._arguments import (
+    debounce_arg,
     decision_function_arg,
     estimator_type_arg,
+    force_arg,
+    host_arg,
+    jobs_arg,
     linear_arg,
+    manifest_arg,
+    module_arg,
     name_arg,
     optional_params_arg,
     output_file_arg,
+    port_arg,
     predict_proba_arg,
+    profile_arg,
+    profile_format_arg,
     required_params_arg,
     sample_weight_arg,
+    socket_arg,
+    spec_file_arg,
+    stdin_jsonl_arg,
     tags_arg,
+    template_arg,
+    workers_arg,
 )
-from sksmithy._logger import console
-from sksmithy._utils import render_template
+from sksmithy._models import ProfileFormat
 
 cli = typer.Typer(
     name="smith",
@@ -28,9 +41,9 @@ cli = typer.Typer(
 @cli.command()
 def version() -> None:
     """Display library version."""
-    from importlib import metadata
+    from sksmithy import __version__
+    from sksmithy._logger import console
 
-    __version__ = metadata.version("sklearn-smithy")
     console.print(f"sklearn-smithy={__version__}", style="good")
 
 
@@ -45,7 +58,11 @@ def forge(
     predict_proba: predict_proba_arg = False,
     decision_function: decision_function_arg = False,
     tags: tags_arg = "",
+    template: template_arg = "default",
     output_file: output_file_arg = "",
+    profile: profile_arg = False,
+    profile_format: profile_format_arg = ProfileFormat.table,
+    stdin_jsonl: stdin_jsonl_arg = False,  # noqa: ARG001  # Handled by its eager callback
 ) -> None:
     """Generate a new shiny scikit-learn compatible estimator ✨
 
@@ -60,8 +77,24 @@ def forge(
     * if the estimator should have tags (To know more about tags, check the dedicated scikit-learn documentation
         at https://scikit-learn.org/dev/developers/develop.html#estimator-tags)
     * in which file the class should be saved (default is `f'{name.lower()}.py'`)
+
+    With `--template`, a custom template is rendered instead of the bundled one, see `smith templates`.
+
+    With `--stdin-jsonl`, no question is prompted: estimator specs are read from stdin, one JSON object per line, and
+    the rendered code is written to stdout, one JSON record per line.
+
+    With `--profile`, wall time and peak memory of each phase are reported. The render cache is bypassed, so that the
+    full pipeline is measured.
     """
-    forged_template = render_template(
+    from sksmithy import ForgeSpec
+    from sksmithy._cache import cached_render_template
+    from sksmithy._capabilities import compatibility_errors
+    from sksmithy._logger import console
+    from sksmithy._profiling import Profiler, profile_phase
+    from sksmithy._utils import render_template
+    from sksmithy._writer import write_if_changed
+
+    spec = ForgeSpec(
         name=name,
         estimator_type=estimator_type,
         required=required_params,  # type: ignore[arg-type]  # Callback transforms it into `list[str]`
@@ -71,15 +104,232 @@ def forge(
         predict_proba=predict_proba,
         decision_function=decision_function,
         tags=tags,  # type: ignore[arg-type]  # Callback transforms it into `list[str]`
+        template=template,
     )
 
+    # Callbacks check the options one at a time, in the order they are given: the whole spec is checked here instead
+    if errors := [
+        message
+        for _, message in compatibility_errors(
+            spec.estimator_type,
+            linear=spec.linear,
+            sample_weight=spec.sample_weight,
+            predict_proba=spec.predict_proba,
+            decision_function=spec.decision_function,
+            tags=spec.tags,
+        )
+    ]:
+        raise typer.BadParameter("; ".join(errors))
+
+    profiler = Profiler() if profile else None
+
+    if profiler is None:
+        forged_template = cached_render_template(**spec.to_kwargs())
+    else:
+        forged_template = render_template(**spec.to_kwargs(), profiler=profiler)
+
     destination_file = Path(output_file)
-    destination_file.parent.mkdir(parents=True, exist_ok=True)
+    with profile_phase(profiler, "file write"):
+        written = write_if_changed(destination_file, forged_template)
+
+    if written:
+        console.print(f"Template forged at {destination_file}", style="good")
+    else:
+        console.print(f"Template at {destination_file} is already up to date", style="good")
+
+    if profiler is not None:
+        if profile_format is ProfileFormat.json:
+            console.print_json(data=profiler.to_dict())
+        else:
+            console.print(profiler.to_table())
+
+
+@cli.command(name="forge-batch")
+def forge_batch(
+    spec_file: spec_file_arg,
+    jobs: jobs_arg = None,
+    manifest: manifest_arg = None,
+    force: force_arg = False,
+    module: module_arg = None,
+) -> None:
+    """Generate many estimators at once from a spec file, without any prompt 🏭
+
+    The spec file (TOML, JSON or YAML) should contain a list of estimators, optionally under the `estimators` key.
+    Each estimator accepts the same options as `smith forge`: `name`, `estimator_type`, `required`, `optional`,
+    `sample_weight`, `linear`, `predict_proba`, `decision_function`, `tags`, `template` and `output_file`.
+
+    All the estimators are validated up front, then rendered in parallel. Invalid or failing estimators are reported
+    without aborting the rest of the batch.
+
+    A manifest keeps track of the spec, template, ruff version and ruff configuration each output file was forged from:
+    on re-runs, only the estimators whose inputs changed are rendered again. Files whose content would not change are
+    never rewritten.
+
+    With `--module`, all the estimators are forged into a single module instead, with merged and deduplicated imports.
+    """
+    from rich.table import Table
+
+    from sksmithy._batch import forge_batch as _forge_batch
+    from sksmithy._batch import forge_module, load_specs
+    from sksmithy._logger import console
+    from sksmithy._manifest import default_manifest_path
+
+    try:
+        specs = load_specs(spec_file)
+    except (ValueError, TypeError, ImportError) as exc:
+        console.print(f"Unable to load {spec_file}: {exc}", style="bad")
+        raise typer.Exit(code=1) from exc
+
+    if module is not None:
+        outcomes = forge_module(specs, output_file=module)
+    else:
+        outcomes = _forge_batch(specs, jobs=jobs, manifest=manifest or default_manifest_path(spec_file), force=force)
+
+    table = Table("#", "Name", "Output", "Status", title=f"Forged estimators from {spec_file}")
+    for outcome in outcomes:
+        table.add_row(
+            str(outcome.position),
+            outcome.name,
+            outcome.output_file,
+            f"[bad]{outcome.error}[/bad]"
+            if outcome.error
+            else ("[warning]Unchanged[/warning]" if outcome.unchanged else "[good]Forged[/good]"),
+        )
+    console.print(table)
+
+    if n_failures := sum(outcome.error is not None for outcome in outcomes):
+        console.print(f"{n_failures} out of {len(outcomes)} estimators failed", style="bad")
+        raise typer.Exit(code=1)
+
+    n_unchanged = sum(outcome.unchanged for outcome in outcomes)
+    console.print(f"{len(outcomes) - n_unchanged} estimators forged, {n_unchanged} unchanged", style="good")
+
+
+@cli.command()
+def validate(spec_file: spec_file_arg) -> None:
+    """Validate all the estimators of a spec file at once, without forging any of them ✅
+
+    Every error is reported with the position of the estimator in the spec file, including errors spanning many
+    estimators, such as duplicated class names or output files.
+    """
+    from rich.table import Table
+
+    from sksmithy._batch import load_specs
+    from sksmithy._logger import console
+    from sksmithy._parsers import validate_specs
+
+    try:
+        specs = load_specs(spec_file)
+    except (ValueError, TypeError, ImportError) as exc:
+        console.print(f"Unable to load {spec_file}: {exc}", style="bad")
+        raise typer.Exit(code=1) from exc
+
+    if errors := validate_specs(specs):
+        table = Table("#", "Field", "Error", title=f"Invalid estimators in {spec_file}")
+        for error in errors:
+            table.add_row(str(error.position), error.field, error.message)
+        console.print(table)
+        console.print(f"Found {len(errors)} errors in {len({e.position for e in errors})} estimators", style="bad")
+        raise typer.Exit(code=1)
+
+    console.print(f"{len(specs)} estimators are valid", style="good")
+
+
+@cli.command()
+def templates() -> None:
+    """List the available templates, and the file each of them is loaded from 📜
+
+    Besides the bundled `default` template, templates are looked up in the folder set by the `SKSMITHY_TEMPLATE_DIR`
+    environment variable (any `<name>.py.jinja` file) and in the `sksmithy.templates` entry points of the installed
+    packages.
+    """
+    from rich.table import Table
+
+    from sksmithy._logger import console
+    from sksmithy._templates import get_registry
+
+    registry = get_registry()
+    table = Table("Name", "Path", title="Available templates")
+    for name in registry.names():
+        table.add_row(name, str(registry.path(name)))
+    console.print(table)
+
+
+@cli.command()
+def watch(spec_file: spec_file_arg, manifest: manifest_arg = None, debounce: debounce_arg = 0.2) -> None:
+    """Forge the estimators of a spec file, and forge them again at each change of the spec file or template 👀
+
+    Bursts of edits are debounced, and only the estimators whose spec changed are rendered again, by a renderer kept
+    warm across updates. The latency of each update is printed. Press CTRL+C to quit.
+    """
+    from contextlib import suppress
+
+    from sksmithy._logger import console
+    from sksmithy._manifest import default_manifest_path
+    from sksmithy._server import warm_up
+    from sksmithy._watch import WatchUpdate
+    from sksmithy._watch import watch as _watch
+
+    def report(update: WatchUpdate) -> None:
+        if update.error is not None:
+            console.print(update.error, style="bad")
+            return
+
+        n_unchanged = sum(outcome.unchanged for outcome in update.outcomes)
+        n_failures = sum(outcome.error is not None for outcome in update.outcomes)
+        console.print(
+            f"Updated in {1000 * update.latency:.1f} ms: {len(update.outcomes) - n_unchanged - n_failures} forged, "
+            f"{n_unchanged} unchanged, {n_failures} failed",
+            style="bad" if n_failures else "good",
+        )
+        for outcome in update.outcomes:
+            if outcome.error is not None:
+                console.print(f"#{outcome.position} {outcome.name}: {outcome.error}", style="bad")
+
+    warm_up(workers=1)
+    console.print(f"Watching {spec_file} (press CTRL+C to quit)", style="good")
+    with suppress(KeyboardInterrupt):
+        _watch(spec_file, manifest=manifest or default_manifest_path(spec_file), on_update=report, debounce=debounce)
+
+
+@cli.command()
+def serve(
+    host: host_arg = "127.0.0.1",
+    port: port_arg = 8765,
+    socket: socket_arg = None,
+    workers: workers_arg = 2,
+) -> None:
+    """Run a local forge server, with template and formatter kept warm across requests 🔥
+
+    Endpoints:
+
+    * `POST /forge` with a JSON estimator spec as body (same keys of `smith forge-batch` spec files), returns a JSON
+        record with the estimator `name`, the rendered `source` and the list of `errors`.
+    * `GET /stats` returns request latency statistics.
+    * `GET /health` returns the server status.
+    """
+    from rich.table import Table
+
+    from sksmithy._logger import console
+    from sksmithy._server import LatencyStats, make_server, warm_up
+
+    stats = LatencyStats()
+    warm_up(workers=workers)
+    server = make_server(host=host, port=port, socket_path=socket, stats=stats)
 
-    with destination_file.open(mode="w") as destination:
-        destination.write(forged_template)
+    console.print(f"Serving on {socket or f'http://{host}:{port}'} (press CTRL+C to quit)", style="good")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket is not None:
+            socket.unlink(missing_ok=True)
 
-    console.print(f"Template forged at {destination_file}", style="good")
+    table = Table(*stats.summary().keys(), title="Request latency")
+    table.add_row(*(f"{v:.2f}" if isinstance(v, float) else str(v) for v in stats.summary().values()))
+    console.print(table)
 
 
 @cli.command(name="forge-tui")
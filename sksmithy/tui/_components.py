@@ -1,16 +1,21 @@
 import sys
 import webbrowser
+from contextlib import suppress
+from functools import lru_cache
 from importlib import resources
 from pathlib import Path
+from typing import Any, Protocol, cast
 
-from result import Err, Ok
-from textual import on
+from result import Err, Ok, Result
+from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Container, Grid, Horizontal, ScrollableContainer
 from textual.widgets import Button, Collapsible, Input, Markdown, Select, Static, Switch, TextArea
+from textual.worker import WorkerCancelled, WorkerFailed, get_current_worker
 
+from sksmithy._cache import cached_render_template
+from sksmithy._capabilities import Capability
 from sksmithy._models import EstimatorType
-from sksmithy._parsers import check_duplicates, name_parser, params_parser
 from sksmithy._prompts import (
     PROMPT_DECISION_FUNCTION,
     PROMPT_ESTIMATOR,
@@ -22,7 +27,8 @@ from sksmithy._prompts import (
     PROMPT_REQUIRED,
     PROMPT_SAMPLE_WEIGHT,
 )
-from sksmithy._utils import render_template
+from sksmithy._writer import write_if_changed
+from sksmithy.tui._state import FormState, get_form, update_form
 from sksmithy.tui._validators import NameValidator, ParamsValidator
 
 if sys.version_info >= (3, 11):  # pragma: no cover
@@ -30,8 +36,14 @@ if sys.version_info >= (3, 11):  # pragma: no cover
 else:  # pragma: no cover
     from typing_extensions import Self
 
+# Worker group of the forge workers
+FORGE_GROUP: str = "forge"
 
-SIDEBAR_MSG: str = (resources.files("sksmithy") / "_static" / "description.md").read_text()
+
+@lru_cache(maxsize=1)
+def sidebar_message() -> str:
+    """Content of the description sidebar, read once on first use."""
+    return (resources.files("sksmithy") / "_static" / "description.md").read_text()
 
 
 class Prompt(Static):
@@ -47,16 +59,16 @@ class Name(Container):
 
     @on(Input.Changed, "#name")
     def on_input_change(self: Self, event: Input.Changed) -> None:
-        if not event.validation_result.is_valid:  # type: ignore[union-attr]
-            self.notify(
-                message=event.validation_result.failure_descriptions[0],  # type: ignore[union-attr]
-                title="Invalid Name",
-                severity="error",
-                timeout=5,
-            )
-        else:
-            output_file = self.app.query_one("#output-file", Input)
-            output_file.value = f"{event.value.lower()}.py"
+        match update_form(self.app, "name", event.value).name:
+            case Err(name_error_msg):
+                self.notify(
+                    message=name_error_msg,
+                    title="Invalid Name",
+                    severity="error",
+                    timeout=5,
+                )
+            case Ok(name):
+                self.app.query_one("#output-file", Input).value = f"{name.lower()}.py"
 
 
 class Estimator(Container):
@@ -69,19 +81,46 @@ class Estimator(Container):
             id="estimator",
         )
 
+    def on_mount(self: Self) -> None:
+        self._switches = {
+            capability: self.app.query_one(f"#{capability.name}", Switch)
+            for capability in (Capability.linear, Capability.predict_proba, Capability.decision_function)
+        }
+        self._supported: Capability | None = None
+        self.watch(self.app, "form", self.bind_switches, init=False)
+
     @on(Select.Changed, "#estimator")
     def on_select_change(self: Self, event: Select.Changed) -> None:
-        linear = self.app.query_one("#linear", Switch)
-        predict_proba = self.app.query_one("#predict_proba", Switch)
-        decision_function = self.app.query_one("#decision_function", Switch)
-
-        linear.disabled = event.value not in {"classifier", "regressor"}
-        predict_proba.disabled = event.value not in {"classifier", "outlier"}
-        decision_function.disabled = event.value not in {"classifier"}
+        update_form(self.app, "estimator", event.value)
+
+    def bind_switches(self: Self, form: FormState) -> None:
+        """Enable only the switches of the features the selected estimator supports, and turn off the others."""
+        if (supported := form.capabilities()) == self._supported:
+            return
+
+        self._supported = supported
+        for capability, switch in self._switches.items():
+            switch.disabled = capability not in supported
+            switch.value = switch.value and (not switch.disabled)
+
+
+def notify_params(component: Container, params: Result[tuple[str, ...], str]) -> None:
+    """Notify the errors of the submitted parameters, including parameters both required and optional."""
+    if isinstance(params, Err):
+        component.notify(
+            message=params.err_value,
+            title="Invalid Parameter",
+            severity="error",
+            timeout=5,
+        )
 
-        linear.value = linear.value and (not linear.disabled)
-        predict_proba.value = predict_proba.value and (not predict_proba.disabled)
-        decision_function.value = decision_function.value and (not decision_function.disabled)
+    if duplicates_result := get_form(component.app).duplicated_params():
+        component.notify(
+            message=duplicates_result,
+            title="Duplicate Parameter",
+            severity="error",
+            timeout=5,
+        )
 
 
 class Required(Container):
@@ -91,33 +130,13 @@ class Required(Container):
         yield Prompt(PROMPT_REQUIRED, classes="label")
         yield Input(placeholder="alpha,beta", id="required", validators=[ParamsValidator()])
 
-    @on(Input.Submitted, "#required")
-    def on_input_change(self: Self, event: Input.Submitted) -> None:
-        if not event.validation_result.is_valid:  # type: ignore[union-attr]
-            self.notify(
-                message="\n".join(event.validation_result.failure_descriptions),  # type: ignore[union-attr]
-                title="Invalid Parameter",
-                severity="error",
-                timeout=5,
-            )
+    @on(Input.Changed, "#required")
+    def on_input_change(self: Self, event: Input.Changed) -> None:
+        update_form(self.app, "required", event.value)
 
-        optional = self.app.query_one("#optional", Input).value or ""
-        if (
-            optional
-            and event.value
-            and (
-                duplicates_result := check_duplicates(
-                    event.value.split(","),
-                    optional.split(","),
-                )
-            )
-        ):
-            self.notify(
-                message=duplicates_result,
-                title="Duplicate Parameter",
-                severity="error",
-                timeout=5,
-            )
+    @on(Input.Submitted, "#required")
+    def on_input_submit(self: Self, _: Input.Submitted) -> None:
+        notify_params(self, get_form(self.app).required)
 
 
 class Optional(Container):
@@ -127,36 +146,24 @@ class Optional(Container):
         yield Prompt(PROMPT_OPTIONAL, classes="label")
         yield Input(placeholder="mu,sigma", id="optional", validators=[ParamsValidator()])
 
+    @on(Input.Changed, "#optional")
+    def on_input_change(self: Self, event: Input.Changed) -> None:
+        update_form(self.app, "optional", event.value)
+
     @on(Input.Submitted, "#optional")
-    def on_optional_change(self: Self, event: Input.Submitted) -> None:
-        if not event.validation_result.is_valid:  # type: ignore[union-attr]
-            self.notify(
-                message="\n".join(event.validation_result.failure_descriptions),  # type: ignore[union-attr]
-                title="Invalid Parameter",
-                severity="error",
-                timeout=5,
-            )
+    def on_optional_change(self: Self, _: Input.Submitted) -> None:
+        notify_params(self, get_form(self.app).optional)
 
-        required = self.app.query_one("#required", Input).value or ""
-        if (
-            required
-            and event.value
-            and (
-                duplicates_result := check_duplicates(
-                    required.split(","),
-                    event.value.split(","),
-                )
-            )
-        ):
-            self.notify(
-                message=duplicates_result,
-                title="Duplicate Parameter",
-                severity="error",
-                timeout=5,
-            )
 
+class FormSwitch(Container):
+    """Base switch component, keeping the form state in sync with its switch."""
+
+    @on(Switch.Changed)
+    def on_switch_changed(self: Self, event: Switch.Changed) -> None:
+        update_form(self.app, str(event.switch.id), event.value)
 
-class SampleWeight(Container):
+
+class SampleWeight(FormSwitch):
     """sample_weight switch component."""
 
     def compose(self: Self) -> ComposeResult:
@@ -167,7 +174,7 @@ class SampleWeight(Container):
         )
 
 
-class Linear(Container):
+class Linear(FormSwitch):
     """linear switch component."""
 
     def compose(self: Self) -> ComposeResult:
@@ -177,14 +184,8 @@ class Linear(Container):
             classes="container",
         )
 
-    @on(Switch.Changed, "#linear")
-    def on_switch_changed(self: Self, event: Switch.Changed) -> None:
-        decision_function = self.app.query_one("#decision_function", Switch)
-        decision_function.disabled = event.value
-        decision_function.value = decision_function.value and (not decision_function.disabled)
-
 
-class PredictProba(Container):
+class PredictProba(FormSwitch):
     """predict_proba switch component."""
 
     def compose(self: Self) -> ComposeResult:
@@ -195,7 +196,7 @@ class PredictProba(Container):
         )
 
 
-class DecisionFunction(Container):
+class DecisionFunction(FormSwitch):
     """decision_function switch component."""
 
     def compose(self: Self) -> ComposeResult:
@@ -209,80 +210,59 @@ class DecisionFunction(Container):
 class ForgeButton(Container):
     """forge button component."""
 
+    _generation: int = 0
+
     def compose(self: Self) -> ComposeResult:
         yield Button(label="Forge ⚒️", id="forge-btn", variant="success")
 
     @on(Button.Pressed, "#forge-btn")
-    def on_forge(self: Self, _: Button.Pressed) -> None:  # noqa: C901
-        errors = []
-
-        name_input = self.app.query_one("#name", Input).value
-        estimator = self.app.query_one("#estimator", Select).value
-        required_params = self.app.query_one("#required", Input).value
-        optional_params = self.app.query_one("#optional", Input).value
-
-        sample_weight = self.app.query_one("#linear", Switch).value
-        linear = self.app.query_one("#linear", Switch).value
-        predict_proba = self.app.query_one("#predict_proba", Switch).value
-        decision_function = self.app.query_one("#decision_function", Switch).value
-
-        code_area = self.app.query_one("#code-area", TextArea)
-        code_editor = self.app.query_one("#code-editor", Collapsible)
-
-        match name_parser(name_input):
-            case Ok(name):
-                pass
-            case Err(name_error_msg):
-                errors.append(name_error_msg)
+    def on_forge(self: Self, _: Button.Pressed) -> None:
+        match get_form(self.app).spec():
+            case Ok(spec):
+                self._generation += 1
+                code_editor = self.app.query_one(CodeEditor)
+                code_editor.code_area().loading = True
+                code_editor.collapsed = False
+                self.forge(self._generation, **spec.to_kwargs())
+            case Err(errors):
+                self.notify(
+                    message="\n".join([f"- {e}" for e in errors]),
+                    title="Invalid inputs!",
+                    severity="error",
+                    timeout=5,
+                )
 
-        match estimator:
-            case str(v):
-                estimator_type = EstimatorType(v)
-            case Select.BLANK:
-                errors.append("Estimator cannot be empty!")
+    @work(thread=True, exclusive=True, group=FORGE_GROUP, exit_on_error=False)
+    def forge(self: Self, generation: int, **kwargs: Any) -> None:  # noqa: ANN401
+        """Render the template in a thread worker, hence without freezing the interface while ruff formats the code.
 
-        match params_parser(required_params):
-            case Ok(required):
-                required_is_valid = True
-            case Err(required_err_msg):
-                required_is_valid = False
-                errors.append(required_err_msg)
+        Starting a new forge cancels the previous one (`exclusive=True`): the result of a cancelled or outdated forge
+        is discarded, so that only the latest one ends up in the code editor.
+        """
+        try:
+            forged_template: str | Exception = cached_render_template(**kwargs)
+        except Exception as exc:  # noqa: BLE001
+            forged_template = exc
 
-        match params_parser(optional_params):
-            case Ok(optional):
-                optional_is_valid = True
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._apply, generation, forged_template)
 
-            case Err(optional_err_msg):
-                optional_is_valid = False
-                errors.append(optional_err_msg)
+    def _apply(self: Self, generation: int, forged_template: str | Exception) -> None:
+        if generation != self._generation:
+            return
 
-        if required_is_valid and optional_is_valid and (msg_duplicated_params := check_duplicates(required, optional)):
-            errors.append(msg_duplicated_params)
+        code_area = self.app.query_one(CodeEditor).code_area()
+        code_area.loading = False
 
-        if errors:
+        if isinstance(forged_template, Exception):
             self.notify(
-                message="\n".join([f"- {e}" for e in errors]),
-                title="Invalid inputs!",
+                message=str(forged_template),
+                title="Forging failed!",
                 severity="error",
                 timeout=5,
             )
-
         else:
-            forged_template = render_template(
-                name=name,
-                estimator_type=estimator_type,
-                required=required,
-                optional=optional,
-                linear=linear,
-                sample_weight=sample_weight,
-                predict_proba=predict_proba,
-                decision_function=decision_function,
-                tags=None,
-            )
-
             code_area.text = forged_template
-            code_editor.collapsed = False
-
             self.notify(
                 message="Template forged!",
                 title="Success!",
@@ -291,6 +271,10 @@ class ForgeButton(Container):
             )
 
 
+class _HasPreview(Protocol):
+    async def flush_preview(self) -> None: ...
+
+
 class SaveButton(Container):
     """forge button component."""
 
@@ -298,7 +282,15 @@ class SaveButton(Container):
         yield Button(label="Save 📂", id="save-btn", variant="primary")
 
     @on(Button.Pressed, "#save-btn")
-    def on_save(self: Self, _: Button.Pressed) -> None:
+    async def on_save(self: Self, _: Button.Pressed) -> None:
+        # Save the latest forged template, rather than the one in the code editor while a forge is in flight
+        with suppress(WorkerCancelled, WorkerFailed):
+            await self.app.workers.wait_for_complete(
+                [worker for worker in self.app.workers if worker.group == FORGE_GROUP and not worker.is_cancelled]
+            )
+        # Nor the unformatted live preview shown while typing, see `ForgeTUI.flush_preview`
+        await cast("_HasPreview", self.app).flush_preview()
+
         output_file = self.app.query_one("#output-file", Input).value
 
         if not output_file:
@@ -310,15 +302,12 @@ class SaveButton(Container):
             )
         else:
             destination_file = Path(output_file)
-            destination_file.parent.mkdir(parents=True, exist_ok=True)
+            code = self.app.query_one(CodeEditor).text
 
-            code = self.app.query_one("#code-area", TextArea).text
-
-            with destination_file.open(mode="w") as destination:
-                destination.write(code)
+            written = write_if_changed(destination_file, code)
 
             self.notify(
-                message=f"Saved at {destination_file}",
+                message=f"Saved at {destination_file}" if written else f"{destination_file} is already up to date",
                 title="Success!",
                 severity="information",
                 timeout=5,
@@ -336,13 +325,58 @@ class ForgeRow(Grid):
     """Row grid for forge."""
 
 
+class CodeEditor(Collapsible):
+    """Collapsible code editor.
+
+    Syntax highlighting makes the text area one of the most expensive widgets to mount, hence it is mounted only once
+    the editor is first expanded or written to (see `code_area`), rather than at startup.
+    """
+
+    def __init__(self: Self) -> None:
+        super().__init__(title="Code Editor", collapsed=True, id="code-editor")
+        self._code_area: TextArea | None = None
+
+    def code_area(self: Self) -> TextArea:
+        """Return the text area of the editor, mounting it on first call."""
+        if self._code_area is None:
+            self._code_area = TextArea(
+                text="",
+                language="python",
+                theme="vscode_dark",
+                show_line_numbers=True,
+                tab_behavior="indent",
+                id="code-area",
+            )
+            self.query_one(Collapsible.Contents).mount(self._code_area)
+        return self._code_area
+
+    @property
+    def text(self: Self) -> str:
+        """Code in the editor, empty if the text area was never mounted."""
+        return "" if self._code_area is None else self._code_area.text
+
+    @on(Collapsible.Expanded)
+    def on_expanded(self: Self, event: Collapsible.Expanded) -> None:
+        if event.collapsible is self:
+            self.code_area()
+
+
 class OptionGroup(ScrollableContainer):
     pass
 
 
 class Sidebar(Container):
+    """Description sidebar, its markdown is parsed and mounted on first show (see `show`) rather than at startup."""
+
     def compose(self: Self) -> ComposeResult:
-        yield OptionGroup(Markdown(SIDEBAR_MSG))
+        yield OptionGroup()
+
+    def show(self: Self) -> None:
+        """Show the sidebar, mounting its content on first call."""
+        option_group = self.query_one(OptionGroup)
+        if not option_group.children:
+            option_group.mount(Markdown(sidebar_message()))
+        self.remove_class("-hidden")
 
     def on_markdown_link_clicked(self: Self, event: Markdown.LinkClicked) -> None:
         # Relevant discussion: https://github.com/Textualize/textual/discussions/3668
@@ -0,0 +1,142 @@
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Final, Protocol, cast
+
+from result import Err, Ok, Result
+from textual.app import App
+
+from sksmithy._capabilities import Capability, capabilities
+from sksmithy._models import EstimatorType
+from sksmithy._parsers import check_duplicates, name_parser, params_parser
+from sksmithy._spec import ForgeSpec
+
+if sys.version_info >= (3, 11):  # pragma: no cover
+    from typing import Self
+else:  # pragma: no cover
+    from typing_extensions import Self
+
+# Boolean form fields, named after the id of their switch
+SWITCH_FIELDS: tuple[str, ...] = ("sample_weight", "linear", "predict_proba", "decision_function")
+
+# Values of the empty form
+_EMPTY_NAME: Final[Result[str, str]] = Err("Name cannot be empty!")
+_EMPTY_ESTIMATOR: Final[Result[EstimatorType, str]] = Err("Estimator cannot be empty!")
+_EMPTY_PARAMS: Final[Result[tuple[str, ...], str]] = Ok(())
+
+
+@lru_cache(maxsize=1024)
+def parse_name(value: str) -> Result[str, str]:
+    """Memoized `name_parser`, shared by the input validator and the form state."""
+    return name_parser(value)
+
+
+@lru_cache(maxsize=1024)
+def parse_params(value: str) -> Result[tuple[str, ...], str]:
+    """Memoized `params_parser`, shared by the input validators and the form state."""
+    return params_parser(value).map(tuple)
+
+
+def parse_estimator(value: object) -> Result[EstimatorType, str]:
+    """Parse the value of the estimator select, which is `Select.BLANK` if no estimator is selected."""
+    return Ok(EstimatorType(value)) if isinstance(value, str) else _EMPTY_ESTIMATOR
+
+
+@dataclass(frozen=True, slots=True)
+class FormState:
+    """Parsed and validated values of the TUI form.
+
+    The state is immutable: `update` returns a new state, parsing and validating only the changed field, hence the
+    work per keystroke does not depend on the number of fields. Equal states compare equal, which makes it cheap to
+    detect changes (e.g. as a textual reactive attribute).
+    """
+
+    name: Result[str, str] = _EMPTY_NAME
+    estimator: Result[EstimatorType, str] = _EMPTY_ESTIMATOR
+    required: Result[tuple[str, ...], str] = _EMPTY_PARAMS
+    optional: Result[tuple[str, ...], str] = _EMPTY_PARAMS
+    sample_weight: bool = False
+    linear: bool = False
+    predict_proba: bool = False
+    decision_function: bool = False
+
+    def update(self: Self, field: str, value: Any) -> Self:  # noqa: ANN401
+        """Return a new state with `field` set to (the parsed) `value`.
+
+        Raises
+        ------
+        KeyError
+            If `field` is not a form field.
+        """
+        match field:
+            case "name":
+                parsed: Any = parse_name(value or "")
+            case "required" | "optional":
+                parsed = parse_params(value or "")
+            case "estimator":
+                parsed = parse_estimator(value)
+            case _ if field in SWITCH_FIELDS:
+                parsed = bool(value)
+            case _:
+                raise KeyError(field)
+
+        return replace(self, **{field: parsed})
+
+    def duplicated_params(self: Self) -> str | None:
+        """Return the error message if some parameters are both required and optional, `None` otherwise."""
+        match self.required, self.optional:
+            case Ok(required), Ok(optional) if required and optional:
+                return check_duplicates(list(required), list(optional))
+        return None
+
+    @property
+    def errors(self: Self) -> list[str]:
+        """All the validation errors, in the order of the form fields."""
+        errors = [
+            result.err_value
+            for result in (self.name, self.estimator, self.required, self.optional)
+            if isinstance(result, Err)
+        ]
+        if (msg_duplicated_params := self.duplicated_params()) is not None:
+            errors.append(msg_duplicated_params)
+        return errors
+
+    def capabilities(self: Self) -> Capability:
+        """Features supported by the selected estimator, none if no estimator is selected."""
+        match self.estimator:
+            case Ok(estimator_type):
+                return capabilities(estimator_type, linear=self.linear)
+        return Capability(0)
+
+    def spec(self: Self) -> Result[ForgeSpec, list[str]]:
+        """Return `Ok(spec)` if all the fields are valid, otherwise `Err(...)` with the list of error messages."""
+        match self.name, self.estimator, self.required, self.optional:
+            case Ok(name), Ok(estimator_type), Ok(required), Ok(optional) if self.duplicated_params() is None:
+                return Ok(
+                    ForgeSpec(
+                        name=name,
+                        estimator_type=estimator_type,
+                        required=required,
+                        optional=optional,
+                        linear=self.linear,
+                        sample_weight=self.sample_weight,
+                        predict_proba=self.predict_proba,
+                        decision_function=self.decision_function,
+                    )
+                )
+        return Err(self.errors)
+
+
+class _HasForm(Protocol):
+    form: FormState
+
+
+def get_form(app: App) -> FormState:
+    """Return the form state of `app`, see `ForgeTUI.form`."""
+    return cast("_HasForm", app).form
+
+
+def update_form(app: App, field: str, value: Any) -> FormState:  # noqa: ANN401
+    """Update `field` of the form state of `app` with `value`, and return the new state."""
+    form = cast("_HasForm", app).form = get_form(app).update(field, value)
+    return form
@@ -1,13 +1,23 @@
+import asyncio
 import sys
-from importlib import metadata, resources
+from functools import lru_cache
+from importlib import resources
 from typing import ClassVar
 
+from result import Ok
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, ScrollableContainer
 from textual.reactive import reactive
-from textual.widgets import Button, Collapsible, Footer, Header, Rule, Static, TextArea
+from textual.timer import Timer
+from textual.widgets import Button, Footer, Header, Rule, Static
+from textual.worker import get_current_worker
 
+from sksmithy import __version__
+from sksmithy._cache import cached_render_template
+from sksmithy._spec import ForgeSpec
 from sksmithy.tui._components import (
+    CodeEditor,
     DecisionFunction,
     DestinationFile,
     Estimator,
@@ -22,12 +32,23 @@ from sksmithy.tui._components import (
     SaveButton,
     Sidebar,
 )
+from sksmithy.tui._state import FormState
 
 if sys.version_info >= (3, 11):  # pragma: no cover
     from typing import Self
 else:  # pragma: no cover
     from typing_extensions import Self
 
+# Seconds without further input changes after which the live preview is rendered (without formatting), and formatted
+PREVIEW_DEBOUNCE: float = 0.05
+FORMAT_DEBOUNCE: float = 0.5
+
+
+@lru_cache(maxsize=256)
+def raw_preview(spec: ForgeSpec) -> str:
+    """Render `spec` without formatting, memoized by spec."""
+    return spec.forge().raw
+
 
 class ForgeTUI(App):
     """Textual app to forge scikit-learn compatible estimators."""
@@ -40,10 +61,18 @@ class ForgeTUI(App):
         ("L", "toggle_dark", "Light/Dark mode"),
         ("F", "forge", "Forge"),
         ("ctrl+s", "save", "Save"),
+        ("P", "toggle_live_preview", "Live preview"),
         ("E", "app.quit", "Exit"),
     ]
 
     show_sidebar = reactive(False)  # noqa: FBT003
+    live_preview = reactive(False)  # noqa: FBT003
+    # Parsed and validated form values, kept up to date by the form components
+    form: reactive[FormState] = reactive(FormState)
+
+    _preview_timers: tuple[Timer, ...] = ()
+    # Spec currently shown in the code editor by the live preview, and whether it is formatted
+    _previewed: tuple[ForgeSpec, bool] | None = None
 
     def on_mount(self: Self) -> None:
         """Compose on mount.
@@ -55,7 +84,7 @@ class ForgeTUI(App):
     def compose(self: Self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Container(
-            Header(icon=f"v{metadata.version('sklearn-smithy')}"),
+            Header(icon=f"v{__version__}"),
             ScrollableContainer(
                 Horizontal(Name(), Estimator()),
                 Horizontal(Required(), Optional()),
@@ -69,19 +98,7 @@ class ForgeTUI(App):
                     DestinationFile(),
                 ),
                 Rule(),
-                Collapsible(
-                    TextArea(
-                        text="",
-                        language="python",
-                        theme="vscode_dark",
-                        show_line_numbers=True,
-                        tab_behavior="indent",
-                        id="code-area",
-                    ),
-                    title="Code Editor",
-                    collapsed=True,
-                    id="code-editor",
-                ),
+                CodeEditor(),
             ),
             Sidebar(classes="-hidden"),
             Footer(),
@@ -97,7 +114,7 @@ class ForgeTUI(App):
         self.set_focus(None)
 
         if sidebar.has_class("-hidden"):
-            sidebar.remove_class("-hidden")
+            sidebar.show()
         else:
             if sidebar.query("*:focus"):
                 self.screen.set_focus(None)
@@ -113,6 +130,83 @@ class ForgeTUI(App):
         save_btn = self.query_one("#save-btn", Button)
         save_btn.press()
 
+    def action_toggle_live_preview(self: Self) -> None:
+        """Toggle live preview mode."""
+        self.live_preview = not self.live_preview
+
+    def watch_live_preview(self: Self, live_preview: bool) -> None:
+        if live_preview:
+            self.schedule_preview()
+        else:
+            for timer in self._preview_timers:
+                timer.stop()
+            self._previewed = None
+
+    def watch_form(self: Self) -> None:
+        if self.live_preview:
+            self.schedule_preview()
+
+    def schedule_preview(self: Self) -> None:
+        """Debounce the live preview: each change of the inputs restarts both the render and the format timers.
+
+        While typing, the preview is rendered without formatting, which takes a fraction of a millisecond. Once the
+        inputs settle, the preview is formatted in a background worker.
+        """
+        for timer in self._preview_timers:
+            timer.stop()
+        self._preview_timers = (
+            self.set_timer(PREVIEW_DEBOUNCE, self.render_preview),
+            self.set_timer(FORMAT_DEBOUNCE, self.format_preview),
+        )
+
+    def render_preview(self: Self) -> None:
+        """Show the unformatted render of the current spec, unless the inputs are invalid or the spec did not change."""
+        match self.form.spec():
+            case Ok(spec) if self._previewed is None or self._previewed[0] != spec:
+                self._show_preview(spec, raw_preview(spec), formatted=False)
+
+    def format_preview(self: Self) -> None:
+        """Format the preview of the current spec in a background worker, unless it is already formatted."""
+        match self.form.spec():
+            case Ok(spec) if self._previewed != (spec, True):
+                self._format_preview(spec)
+
+    @work(thread=True, exclusive=True, group="preview", exit_on_error=False)
+    def _format_preview(self: Self, spec: ForgeSpec) -> None:
+        formatted = cached_render_template(**spec.to_kwargs())
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._apply_formatted_preview, spec, formatted)
+
+    def _apply_formatted_preview(self: Self, spec: ForgeSpec, formatted: str) -> None:
+        # Inputs might have changed while formatting, the next scheduled preview takes care of them
+        if self.live_preview and self.form.spec() == Ok(spec):
+            self._show_preview(spec, formatted, formatted=True)
+
+    async def flush_preview(self: Self) -> None:
+        """Show the formatted preview of the current spec right away, rather than once the format debounce expires.
+
+        Called before saving, so that the unformatted render shown while typing never ends up on disk.
+        """
+        if not self.live_preview:
+            return
+
+        match self.form.spec():
+            case Ok(spec) if self._previewed != (spec, True):
+                for timer in self._preview_timers:
+                    timer.stop()
+                self.workers.cancel_group(self, "preview")
+                try:
+                    formatted = await asyncio.to_thread(cached_render_template, **spec.to_kwargs())
+                except Exception:  # noqa: BLE001
+                    return
+                self._apply_formatted_preview(spec, formatted)
+
+    def _show_preview(self: Self, spec: ForgeSpec, code: str, formatted: bool) -> None:
+        code_editor = self.query_one(CodeEditor)
+        code_editor.code_area().text = code
+        code_editor.collapsed = False
+        self._previewed = (spec, formatted)
+
 
 if __name__ == "__main__":  # pragma: no cover
     tui = ForgeTUI()
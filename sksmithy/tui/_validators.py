@@ -4,7 +4,7 @@ from typing import TypeVar
 from result import Err, Ok, Result
 from textual.validation import ValidationResult, Validator
 
-from sksmithy._parsers import name_parser, params_parser
+from sksmithy.tui._state import parse_name, parse_params
 
 if sys.version_info >= (3, 11):  # pragma: no cover
     from typing import Self
@@ -17,7 +17,7 @@ R = TypeVar("R")
 
 class _BaseValidator(Validator):
     @staticmethod
-    def parser(value: str) -> Result[str | list[str], str]:  # pragma: no cover
+    def parser(value: str) -> Result[str | tuple[str, ...], str]:  # pragma: no cover
         raise NotImplementedError
 
     def validate(self: Self, value: str) -> ValidationResult:
@@ -31,10 +31,10 @@ class _BaseValidator(Validator):
 class NameValidator(_BaseValidator):
     @staticmethod
     def parser(value: str) -> Result[str, str]:
-        return name_parser(value)
+        return parse_name(value)
 
 
 class ParamsValidator(_BaseValidator):
     @staticmethod
-    def parser(value: str) -> Result[list[str], str]:
-        return params_parser(value)
+    def parser(value: str) -> Result[tuple[str, ...], str]:
+        return parse_params(value)
@@ -0,0 +1,103 @@
+import ast
+from itertools import product
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from sksmithy._ast_builder import ast_render_template, build_module, emit
+from sksmithy._models import EstimatorType
+from sksmithy._utils import render_many, render_template
+
+PARAMS = [([], []), (["alpha", "max_iter"], []), ([], ["beta"]), (["alpha"], ["max_iter", "beta"])]
+TAGS = [None, ["allow_nan", "binary_only"]]
+
+
+@pytest.mark.parametrize("estimator", list(EstimatorType))
+@pytest.mark.parametrize("in_repo", [True, False])
+def test_parity(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str, estimator: EstimatorType, in_repo: bool
+) -> None:
+    """The AST engine output is the same of jinja + ruff, for every combination of flags.
+
+    It is checked both with the ruff configuration of this repository (line length 120, where the emitter output is
+    already formatted) and, from a folder without configuration, with ruff defaults (line length 88).
+    """
+    if not in_repo:
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+
+    specs: list[dict[str, Any]] = [
+        {
+            "name": name,
+            "estimator_type": estimator,
+            "required": required,
+            "optional": optional,
+            "linear": linear,
+            "sample_weight": sample_weight,
+            "predict_proba": predict_proba,
+            "decision_function": decision_function,
+            "tags": tags,
+        }
+        for linear, sample_weight, predict_proba, decision_function, (required, optional), tags in product(
+            (False, True), (False, True), (False, True), (False, True), PARAMS, TAGS
+        )
+    ]
+
+    for spec, expected in zip(specs, render_many(specs), strict=True):
+        assert ast_render_template(**spec) == expected, spec
+        if in_repo:
+            assert emit(build_module(**spec)) == expected, spec
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        '[format]\nquote-style = "single"\n',
+        '[format]\nindent-style = "tab"\n',
+        "[format]\nskip-magic-trailing-comma = true\n",
+        "line-length = 120\nindent-width = 2\n",
+    ],
+)
+def test_parity_ruff_style(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str, config: str) -> None:
+    """With non-default format options, the AST engine output is still the same of jinja + ruff."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    (tmp_path / "ruff.toml").write_text(config)
+
+    specs: list[dict[str, Any]] = [
+        {
+            "name": name,
+            "estimator_type": estimator,
+            "required": required,
+            "optional": optional,
+            "linear": linear,
+            "sample_weight": True,
+            "tags": tags,
+        }
+        for estimator, linear, (required, optional), tags in product(EstimatorType, (False, True), PARAMS, TAGS)
+    ]
+
+    for spec, expected in zip(specs, render_many(specs), strict=True):
+        assert ast_render_template(**spec) == expected, spec
+
+
+def test_tree(name: str, estimator: EstimatorType, required: list[str], tags: list[str] | None) -> None:
+    """The tree is a valid python module, equivalent to the parsed jinja + ruff output."""
+    kwargs = {"name": name, "estimator_type": estimator, "required": required, "optional": ["gamma"], "tags": tags}
+    tree = build_module(**kwargs)  # type: ignore[arg-type]
+
+    compile(tree, filename="<sksmithy>", mode="exec")
+    assert ast.dump(tree) == ast.dump(ast.parse(render_template(**kwargs)))  # type: ignore[arg-type]
+
+
+def test_long_lines_fallback(estimator: EstimatorType) -> None:
+    """Lines longer than the line length are left to the formatter."""
+    kwargs = {
+        "name": "Mighty" * 20,
+        "estimator_type": estimator,
+        "required": [f"parameter_{i}" for i in range(15)],
+        "optional": [],
+    }
+
+    assert ast_render_template(**kwargs) == render_template(**kwargs)  # type: ignore[arg-type]
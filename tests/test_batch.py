@@ -0,0 +1,184 @@
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from result import Err, Ok, is_err
+
+from sksmithy._batch import forge_batch, forge_module, load_specs, parse_spec
+from sksmithy._models import EstimatorType
+from sksmithy._utils import render_template
+
+SPECS: list[dict[str, Any]] = [
+    {"name": "MightyClassifier", "estimator_type": "classifier", "required": ["alpha"], "optional": "mu,sigma"},
+    {"name": "MightyRegressor", "estimator_type": "regressor", "linear": True, "tags": ["allow_nan"]},
+    {"name": "class", "estimator_type": "not-a-type", "required": "a,a", "optional": "b b", "tags": "nope"},
+]
+
+
+@pytest.mark.parametrize(
+    ("suffix", "content"),
+    [
+        (".json", json.dumps({"estimators": SPECS[:2]})),
+        (".json", json.dumps(SPECS[:2])),
+        (
+            ".toml",
+            "[[estimators]]\nname = 'MightyClassifier'\nestimator_type = 'classifier'\nrequired = ['alpha']\n"
+            "optional = 'mu,sigma'\n\n[[estimators]]\nname = 'MightyRegressor'\nestimator_type = 'regressor'\n"
+            "linear = true\ntags = ['allow_nan']\n",
+        ),
+        (
+            ".yaml",
+            "estimators:\n  - name: MightyClassifier\n    estimator_type: classifier\n    required: [alpha]\n"
+            "    optional: mu,sigma\n  - name: MightyRegressor\n    estimator_type: regressor\n    linear: true\n"
+            "    tags: [allow_nan]\n",
+        ),
+    ],
+)
+def test_load_specs(tmp_path: Path, suffix: str, content: str) -> None:
+    if suffix == ".yaml":
+        pytest.importorskip("yaml")
+
+    spec_file = tmp_path / f"specs{suffix}"
+    spec_file.write_text(content)
+
+    assert load_specs(spec_file) == SPECS[:2]
+
+
+@pytest.mark.parametrize(
+    ("suffix", "content", "exception"),
+    [(".txt", "", ValueError), (".json", json.dumps({"estimators": "nope"}), TypeError)],
+)
+def test_load_specs_invalid(tmp_path: Path, suffix: str, content: str, exception: type[Exception]) -> None:
+    spec_file = tmp_path / f"specs{suffix}"
+    spec_file.write_text(content)
+
+    with pytest.raises(exception):
+        load_specs(spec_file)
+
+
+def test_load_specs_invalid_yaml(tmp_path: Path) -> None:
+    pytest.importorskip("yaml")
+    spec_file = tmp_path / "specs.yaml"
+    spec_file.write_text("estimators:\n  - name: [MightyClassifier\n")
+
+    with pytest.raises(ValueError, match="Invalid YAML"):
+        load_specs(spec_file)
+
+
+def test_parse_spec() -> None:
+    match parse_spec(SPECS[0]):
+        case Ok(kwargs):
+            assert kwargs["estimator_type"] == EstimatorType.ClassifierMixin
+            assert kwargs["required"] == ["alpha"]
+            assert kwargs["optional"] == ["mu", "sigma"]
+            assert kwargs["tags"] == []
+            assert kwargs["output_file"] == "mightyclassifier.py"
+        case Err(msg):  # pragma: no cover
+            pytest.fail(msg)
+
+
+def test_parse_spec_errors() -> None:
+    result = parse_spec({**SPECS[2], "unknown": 1})
+    assert is_err(result)
+
+    errors = result.unwrap_err().split("\n")
+    assert errors[0] == "Unknown keys: ['unknown']"
+    assert errors[1] == "`class` is a python reserved keyword!"
+    assert errors[2].startswith("`not-a-type` is not a valid estimator type.")
+    assert errors[3] == "Found repeated parameters!"
+    assert errors[4] == "The following parameters are invalid python identifiers: ('b b',)"
+    assert errors[5].startswith("The following tags are not available: ('nope',).")
+
+
+def test_parse_spec_incompatible() -> None:
+    result = parse_spec({"name": "Mighty", "estimator_type": "cluster", "linear": True, "tags": ["multilabel"]})
+
+    assert result.unwrap_err().split("\n") == [
+        "`linear` is not available for cluster estimators",
+        "`multilabel` tag is not available for cluster estimators",
+    ]
+
+
+@pytest.mark.parametrize("flag", ["linear", "sample_weight", "predict_proba", "decision_function"])
+def test_parse_spec_flags(flag: str) -> None:
+    result = parse_spec({"name": "Mighty", "estimator_type": "classifier", flag: "false"})
+    assert result.unwrap_err() == f"`{flag}` should be a boolean, found `'false'`"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_forge_batch(tmp_path: Path, jobs: int) -> None:
+    specs = [{**spec, "output_file": str(tmp_path / f"{idx}.py")} for idx, spec in enumerate(SPECS)]
+    outcomes = forge_batch(specs, jobs=jobs)
+
+    assert [o.position for o in outcomes] == [0, 1, 2]
+    assert [o.error is None for o in outcomes] == [True, True, False]
+    assert not (tmp_path / "2.py").exists()
+
+    expected = render_template(
+        name="MightyRegressor",
+        estimator_type=EstimatorType.RegressorMixin,
+        required=[],
+        optional=[],
+        linear=True,
+        tags=["allow_nan"],
+    )
+    assert (tmp_path / "1.py").read_text() == expected
+
+
+def test_forge_batch_manifest(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.json"
+    specs = [{**spec, "output_file": str(tmp_path / f"{idx}.py")} for idx, spec in enumerate(SPECS[:2])]
+
+    outcomes = forge_batch(specs, jobs=1, manifest=manifest)
+    assert [o.unchanged for o in outcomes] == [False, False]
+
+    # Nothing changed: nothing is rendered nor written
+    with patch("sksmithy._batch._render_chunk", side_effect=AssertionError) as mock_render:
+        outcomes = forge_batch(specs, jobs=1, manifest=manifest)
+    mock_render.assert_not_called()
+    assert [o.unchanged for o in outcomes] == [True, True]
+
+    # Changed spec and modified output file are forged again
+    specs[0]["optional"] = "mu"
+    (tmp_path / "1.py").write_text("# edited by hand")
+    outcomes = forge_batch(specs, jobs=1, manifest=manifest)
+    assert [o.unchanged for o in outcomes] == [False, False]
+    assert "self.sigma" not in (tmp_path / "0.py").read_text()
+    assert "class MightyRegressor(" in (tmp_path / "1.py").read_text()
+
+    # Forcing a re-render does not touch files whose content is unchanged
+    mtimes = [(tmp_path / f"{idx}.py").stat().st_mtime_ns for idx in range(2)]
+    outcomes = forge_batch(specs, jobs=1, manifest=manifest, force=True)
+    assert [o.unchanged for o in outcomes] == [True, True]
+    assert [(tmp_path / f"{idx}.py").stat().st_mtime_ns for idx in range(2)] == mtimes
+
+
+def test_forge_batch_duplicated_output(tmp_path: Path) -> None:
+    output_file = str(tmp_path / "mighty.py")
+    specs = [{**spec, "output_file": output_file} for spec in SPECS[:2]]
+
+    first, second = forge_batch(specs, jobs=1)
+
+    assert first.error is None
+    assert second.error == f"`{output_file}` is already the output file of spec #0"
+    assert "class MightyClassifier(" in (tmp_path / "mighty.py").read_text()
+
+
+def test_forge_module(tmp_path: Path) -> None:
+    output_file = tmp_path / "estimators.py"
+
+    outcomes = forge_module(SPECS, output_file=output_file)
+
+    assert [o.error is None for o in outcomes] == [True, True, False]
+    assert {o.output_file for o in outcomes} == {str(output_file)}
+
+    content = output_file.read_text()
+    assert "class MightyClassifier(" in content
+    assert "class MightyRegressor(" in content
+    assert content.count("import numpy as np") == 1
+
+    mtime = output_file.stat().st_mtime_ns
+    assert [o.unchanged for o in forge_module(SPECS[:2], output_file=output_file)] == [True, True]
+    assert output_file.stat().st_mtime_ns == mtime
@@ -0,0 +1,79 @@
+import math
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.tui import (
+    InteractionStats,
+    compare,
+    forge_and_save,
+    format_results,
+    load_results,
+    percentile,
+    run_benchmark,
+    save_results,
+    type_params,
+)
+from sksmithy import _cache
+from sksmithy._models import EstimatorType
+from sksmithy._skeletons import skeleton_render_template
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [(0, 1.0), (50, 5.0), (99, 10.0), (100, 10.0)],
+)
+def test_percentile(q: float, expected: float) -> None:
+    values = [float(v) for v in range(10, 0, -1)]
+    assert percentile(values, q) == expected
+    assert math.isnan(percentile([], q))
+
+
+async def test_run_benchmark(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Smoke test of the harness, on short sessions."""
+    monkeypatch.setattr(_cache, "_render_cache", _cache.get_render_cache())
+    sessions = {"type_params": type_params, "forge_and_save": lambda pilot: forge_and_save(pilot, tmp_path)}
+    with (
+        patch("benchmarks.tui.PARAMS_LENGTHS", (2,)),
+        patch("sksmithy._cache.skeleton_render_template", side_effect=skeleton_render_template) as render,
+    ):
+        results = await run_benchmark(sessions, repeat=2)
+
+    # Each run (two measuring latency, one memory) forges every estimator type from a cold render cache
+    assert render.call_count == 3 * len(EstimatorType)
+
+    assert set(results) == {
+        "type_params/type_required[2]",
+        "type_params/type_optional[2]",
+        "forge_and_save/select_estimator",
+        "forge_and_save/forge",
+        "forge_and_save/save",
+    }
+    assert results["type_params/type_required[2]"].samples == 2 * len("alpha_0,alpha_1")
+    assert results["forge_and_save/forge"].samples == 2 * len(EstimatorType)
+    for stats in results.values():
+        assert 0 < stats.p50_ms <= stats.p99_ms
+        assert 0 <= stats.p50_kib <= stats.p99_kib
+
+    assert all((tmp_path / f"{e.name.lower()}.py").exists() for e in EstimatorType)
+    assert "forge_and_save/forge" in format_results(results)
+
+
+def test_save_and_compare(tmp_path: Path) -> None:
+    baseline = {
+        "a": InteractionStats(samples=10, p50_ms=1.0, p99_ms=2.0, p50_kib=10.0, p99_kib=20.0),
+        "b": InteractionStats(samples=10, p50_ms=1.0, p99_ms=2.0, p50_kib=10.0, p99_kib=20.0),
+    }
+    path = save_results(baseline, tmp_path, commit="abc123")
+
+    assert path == tmp_path / "abc123.json"
+    assert load_results(path) == baseline
+
+    current = {
+        "a": InteractionStats(samples=10, p50_ms=1.0, p99_ms=2.2, p50_kib=10.0, p99_kib=30.0),
+        "b": InteractionStats(samples=10, p50_ms=1.0, p99_ms=4.0, p50_kib=10.0, p99_kib=20.0),
+        "c": InteractionStats(samples=10, p50_ms=9.0, p99_ms=9.0, p50_kib=90.0, p99_kib=90.0),
+    }
+    assert compare(baseline, current) == ["a: p99_kib 20.00KiB -> 30.00KiB", "b: p99_ms 2.00ms -> 4.00ms"]
+    assert compare(baseline, current, threshold=1.0) == []
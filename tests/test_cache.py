@@ -0,0 +1,89 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from sksmithy import _cache
+from sksmithy._cache import RenderCache, cached_render_template, configure_render_cache, get_render_cache, render_key
+from sksmithy._models import EstimatorType
+from sksmithy._utils import render_template
+
+
+@pytest.fixture()
+def render_cache() -> RenderCache:
+    return configure_render_cache(maxsize=8)
+
+
+def test_render_key(name: str, estimator: EstimatorType) -> None:
+    key = render_key(name=name, estimator_type=estimator, required=["a"], optional=["b"])
+
+    assert key == render_key(name=name, estimator_type=estimator, required=["a"], optional=["b"])
+    assert key != render_key(name=name, estimator_type=estimator, required=["a"], optional=["c"])
+    assert key != render_key(name=name, estimator_type=estimator, required=["a"], optional=["b"], sample_weight=True)
+
+
+def test_lru_eviction() -> None:
+    cache = RenderCache(maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.put("c", "3")  # "b" is the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+    assert cache.info()[:4] == (2, 1, 0, 2)
+
+
+def test_disk_store(tmp_path: Path) -> None:
+    RenderCache(directory=tmp_path).put("abc", "forged")
+
+    cache = RenderCache(directory=tmp_path)
+    assert cache.get("abc") == "forged"
+    assert cache.info().disk_hits == 1
+
+    cache.clear()
+    assert RenderCache(directory=tmp_path).get("abc") is None
+
+
+def test_disk_eviction(tmp_path: Path) -> None:
+    max_disk_size = 25
+    cache = RenderCache(maxsize=1, directory=tmp_path, max_disk_size=max_disk_size)
+    for key in ("k1", "k2", "k3"):
+        cache.put(key, "x" * 10)
+
+    assert cache.info().disk_size <= max_disk_size
+    assert sorted(p.stem for p in tmp_path.glob("*/*.py")) == ["k2", "k3"]
+    assert RenderCache(directory=tmp_path).get("k1") is None
+
+
+@pytest.mark.usefixtures("render_cache")
+def test_cached_render_template(name: str, estimator: EstimatorType) -> None:
+    kwargs = {"name": name, "estimator_type": estimator, "required": ["alpha"], "optional": [], "tags": ["allow_nan"]}
+    expected = render_template(**kwargs)  # type: ignore[arg-type]
+
+    assert cached_render_template(**kwargs) == expected  # type: ignore[arg-type]
+
+    with patch("sksmithy._cache.skeleton_render_template") as mock_render:
+        assert cached_render_template(**kwargs) == expected  # type: ignore[arg-type]
+
+    mock_render.assert_not_called()
+    assert get_render_cache().info()[:2] == (1, 1)
+
+
+def test_cached_render_template_ruff_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changing the ruff configuration of the working directory invalidates the cached renders, on disk too."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(_cache, "_render_cache", get_render_cache())  # Restored afterwards
+    configure_render_cache(maxsize=8, directory=tmp_path / "cache")
+    kwargs = {"name": "Mighty" * 12, "estimator_type": EstimatorType.ClassifierMixin, "required": [], "optional": []}
+
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[tool.ruff]\nline-length = 120\n")
+    wide = cached_render_template(**kwargs)  # type: ignore[arg-type]
+
+    pyproject.write_text("[tool.ruff]\nline-length = 60\n")
+    configure_render_cache(maxsize=8, directory=tmp_path / "cache")  # Empty memory, same disk store
+    narrow = cached_render_template(**kwargs)  # type: ignore[arg-type]
+
+    assert narrow != wide
+    assert narrow == render_template(**kwargs)  # type: ignore[arg-type]
@@ -0,0 +1,57 @@
+import pytest
+
+from sksmithy._capabilities import (
+    CAPABILITIES,
+    TAG_MASKS,
+    Capability,
+    capabilities,
+    compatibility_errors,
+    incompatible_tags,
+    supported_tags,
+    supports,
+)
+from sksmithy._models import EstimatorType, TagType
+
+
+def test_tables_cover_all_types() -> None:
+    assert set(CAPABILITIES) == set(TAG_MASKS) == set(EstimatorType)
+
+
+def test_capabilities(estimator: EstimatorType) -> None:
+    assert supports(estimator, Capability.sample_weight)
+    assert supports(estimator, Capability.linear) == (
+        estimator in {EstimatorType.ClassifierMixin, EstimatorType.RegressorMixin}
+    )
+    assert supports(estimator.value, Capability.predict_proba) == (
+        estimator in {EstimatorType.ClassifierMixin, EstimatorType.OutlierMixin}
+    )
+    assert supports(estimator, Capability.decision_function) == (estimator == EstimatorType.ClassifierMixin)
+    assert Capability.decision_function not in capabilities(estimator, linear=True)
+
+
+@pytest.mark.parametrize(
+    ("estimator", "tag", "expected"),
+    [
+        (EstimatorType.ClassifierMixin, TagType.binary_only, True),
+        (EstimatorType.TransformerMixin, TagType.binary_only, False),
+        (EstimatorType.RegressorMixin, TagType.multioutput, True),
+        (EstimatorType.ClusterMixin, TagType.multioutput, False),
+        (EstimatorType.SelectorMixin, TagType.preserves_dtype, True),
+        (EstimatorType.OutlierMixin, TagType.preserves_dtype, False),
+        (EstimatorType.OutlierMixin, TagType.allow_nan, True),
+    ],
+)
+def test_tags(estimator: EstimatorType, tag: TagType, expected: bool) -> None:
+    assert (tag.value in supported_tags(estimator)) == expected
+    assert incompatible_tags(estimator, [tag.value, "not-a-tag"]) == (() if expected else (tag.value,))
+
+
+def test_compatibility_errors() -> None:
+    assert list(compatibility_errors("classifier", linear=True, predict_proba=True, tags=["binary_only"])) == []
+    assert list(compatibility_errors("classifier", linear=True, decision_function=True)) == [
+        ("decision_function", "`decision_function` is not available for linear classifier estimators")
+    ]
+    assert list(compatibility_errors("cluster", linear=True, sample_weight=True, tags=["multilabel"])) == [
+        ("linear", "`linear` is not available for cluster estimators"),
+        ("tags", "`multilabel` tag is not available for cluster estimators"),
+    ]
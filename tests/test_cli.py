@@ -1,9 +1,14 @@
+import json
+import subprocess
+import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from typer.testing import CliRunner
 
 from sksmithy import __version__
+from sksmithy._formatter import configure_formatter
 from sksmithy._models import EstimatorType
 from sksmithy._prompts import (
     PROMPT_DECISION_FUNCTION,
@@ -17,10 +22,25 @@ from sksmithy._prompts import (
     PROMPT_SAMPLE_WEIGHT,
     PROMPT_TAGS,
 )
+from sksmithy._skeletons import configure_skeletons
 from sksmithy.cli import cli
 
 runner = CliRunner()
 
+# Time (in microseconds) spent importing `sksmithy.cli`, on top of the time spent importing typer itself.
+IMPORT_TIME_BUDGET = 50_000
+HEAVY_MODULES = (
+    "asyncio",
+    "importlib.metadata",
+    "jinja2",
+    "rich.console",
+    "rich.table",
+    "sksmithy._batch",
+    "sksmithy._cache",
+    "sksmithy._formatter",
+    "sksmithy._utils",
+)
+
 
 def test_version() -> None:
     result = runner.invoke(cli, ["version"])
@@ -28,6 +48,21 @@ def test_version() -> None:
     assert f"sklearn-smithy={__version__}" in result.stdout
 
 
+def test_import_time() -> None:
+    """Heavy modules should be imported only by the commands that need them."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import sksmithy.cli"], capture_output=True, text=True, check=True
+    )
+    # Each line has the format "import time: <self us> | <cumulative us> | <indented module name>"
+    cumulative = {
+        module.strip(): int(cumulative_us)
+        for _, cumulative_us, module in (line.split("|") for line in result.stderr.splitlines()[1:])
+    }
+
+    assert not set(HEAVY_MODULES) & set(cumulative)
+    assert cumulative["sksmithy.cli"] - cumulative.get("typer", 0) < IMPORT_TIME_BUDGET
+
+
 @pytest.mark.parametrize("linear", ["y", "N"])
 def test_forge_estimator(tmp_path: Path, name: str, estimator: EstimatorType, linear: str) -> None:
     """Tests that prompts are correct for classifier estimator."""
@@ -133,7 +168,8 @@ def test_forge_invalid_args(
             "c,d\n",  # optional params, valid attempt
             "\n",  # sample_weight
             f"{invalid_tags}\n",  # tags, invalid attempt
-            "binary_only\n",  # valid attempt
+            "binary_only\n",  # tag not available for transformers
+            "allow_nan\n",  # valid attempt
             f"{output_file!s}\n",
         ]
     )
@@ -152,3 +188,321 @@ def test_forge_invalid_args(
     assert all(
         err_msg in result.stdout for err_msg in (name_err_msg, required_err_msg, duplicated_err_msg, tags_err_msg)
     )
+    assert "The following tags are not available for transformer estimators: ('binary_only',)" in result.stdout
+
+
+def test_forge_linear_before_estimator_type(tmp_path: Path, name: str) -> None:
+    """Options are processed in the order they are given, `--linear` does not require the estimator type yet."""
+    output_file = tmp_path / f"{name.lower()}.py"
+    result = runner.invoke(
+        app=cli,
+        args=[
+            "forge",
+            "--linear",
+            "--name",
+            name,
+            "--estimator-type",
+            "regressor",
+            "--required-params",
+            "",
+            "--optional-params",
+            "",
+            "--no-sample-weight",
+            "--tags",
+            "",
+            "--output-file",
+            str(output_file),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "LinearModel" in output_file.read_text()
+
+
+@pytest.mark.parametrize(
+    ("args", "err_msg"),
+    [
+        (["--estimator-type", "transformer", "--linear"], "`linear` is not available"),
+        (["--estimator-type", "regressor", "--predict-proba"], "`predict_proba` is not available"),
+        (
+            ["--linear", "--decision-function", "--estimator-type", "classifier"],
+            "`decision_function` is not available",
+        ),
+        (["--tags", "binary_only", "--estimator-type", "regressor"], "`binary_only` tag is not available"),
+    ],
+)
+def test_forge_incompatible_args(tmp_path: Path, name: str, args: list[str], err_msg: str) -> None:
+    """Incompatible options are rejected whatever their order, before anything is forged."""
+    output_file = tmp_path / f"{name.lower()}.py"
+    result = runner.invoke(
+        app=cli,
+        args=[
+            "forge",
+            "--name",
+            name,
+            "--required-params",
+            "",
+            "--optional-params",
+            "",
+            "--no-sample-weight",
+            "--no-linear",
+            "--no-predict-proba",
+            "--no-decision-function",
+            "--tags",
+            "",
+            "--output-file",
+            str(output_file),
+            *args,  # Given last, they override the options above
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert err_msg in result.output
+    assert not output_file.exists()
+
+
+def test_forge_batch(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.json"
+    specs = [
+        {"name": "MightyEstimator", "estimator_type": "classifier", "output_file": str(tmp_path / "mighty.py")},
+        {"name": "class", "estimator_type": "regressor"},
+    ]
+    spec_file.write_text(json.dumps(specs))
+
+    result = runner.invoke(cli, ["forge-batch", str(spec_file), "--jobs", "1"])
+
+    assert result.exit_code == 1
+    assert (tmp_path / "mighty.py").exists()
+    assert "1 out of 2 estimators failed" in result.stdout
+
+    specs.pop()
+    spec_file.write_text(json.dumps(specs))
+    result = runner.invoke(cli, ["forge-batch", str(spec_file)])
+
+    assert result.exit_code == 0
+    assert "0 estimators forged, 1 unchanged" in result.stdout
+    assert (tmp_path / ".specs.json.manifest.json").exists()
+
+    (tmp_path / "mighty.py").write_text("")
+    result = runner.invoke(cli, ["forge-batch", str(spec_file), "--force"])
+
+    assert result.exit_code == 0
+    assert "1 estimators forged, 0 unchanged" in result.stdout
+
+
+def test_forge_batch_module(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.json"
+    spec_file.write_text(
+        json.dumps(
+            [
+                {"name": "MightyClassifier", "estimator_type": "classifier", "output_file": "ignored.py"},
+                {"name": "MightyRegressor", "estimator_type": "regressor", "output_file": "ignored.py"},
+            ]
+        )
+    )
+    module = tmp_path / "estimators.py"
+
+    result = runner.invoke(cli, ["forge-batch", str(spec_file), "--module", str(module)])
+
+    assert result.exit_code == 0
+    assert "2 estimators forged, 0 unchanged" in result.stdout
+    assert "class MightyRegressor(" in module.read_text()
+    assert not (tmp_path / "ignored.py").exists()
+
+
+def test_forge_batch_invalid_file(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.txt"
+    spec_file.write_text("")
+
+    result = runner.invoke(cli, ["forge-batch", str(spec_file)])
+
+    assert result.exit_code == 1
+    assert "Unsupported spec file extension" in result.stdout
+
+
+@pytest.mark.parametrize("command", ["forge-batch", "validate"])
+def test_invalid_yaml_file(tmp_path: Path, command: str) -> None:
+    pytest.importorskip("yaml")
+    spec_file = tmp_path / "specs.yaml"
+    spec_file.write_text("estimators:\n  - name: [MightyClassifier\n")
+
+    result = runner.invoke(cli, [command, str(spec_file)])
+
+    assert result.exit_code == 1
+    assert "Unable to load" in result.stdout
+    assert "Invalid YAML" in result.stdout
+
+
+def test_forge_stdin_jsonl() -> None:
+    _input = "\n".join(
+        [
+            json.dumps({"name": "MightyEstimator", "estimator_type": "classifier", "required": "alpha,beta"}),
+            "not-a-json",
+            "",
+            json.dumps(["not-an-object"]),
+            json.dumps({"name": "class", "estimator_type": "cluster"}),
+        ]
+    )
+    result = runner.invoke(cli, ["forge", "--stdin-jsonl"], input=_input)
+
+    assert result.exit_code == 1
+    assert not any(_prompt in result.stdout for _prompt in (PROMPT_NAME, PROMPT_ESTIMATOR))
+
+    r1, r2, r3, r4 = (json.loads(line) for line in result.stdout.splitlines())
+
+    assert r1["name"] == "MightyEstimator"
+    assert "class MightyEstimator(ClassifierMixin, BaseEstimator)" in r1["source"]
+    assert "self.alpha = alpha" in r1["source"]
+    assert r1["errors"] == []
+
+    assert r2["source"] is None
+    assert r2["errors"][0].startswith("Invalid JSON")
+
+    assert r3["errors"] == ["Each spec should be a JSON object"]
+
+    assert r4 == {"name": "class", "source": None, "errors": ["`class` is a python reserved keyword!"]}
+
+
+def test_forge_stdin_jsonl_wrong_types() -> None:
+    """Specs with values of the wrong type are reported in their record, without aborting the following ones."""
+    _input = "\n".join(
+        [
+            json.dumps({"name": 7, "estimator_type": "regressor"}),
+            json.dumps({"name": "Mighty", "estimator_type": "regressor", "required": 5, "tags": [1]}),
+            json.dumps({"name": "MightyEstimator", "estimator_type": "regressor"}),
+        ]
+    )
+    result = runner.invoke(cli, ["forge", "--stdin-jsonl"], input=_input)
+
+    assert result.exit_code == 1
+
+    r1, r2, r3 = (json.loads(line) for line in result.stdout.splitlines())
+
+    assert r1 == {"name": 7, "source": None, "errors": ["`name` should be a string, found `7`"]}
+    assert r2["errors"] == [
+        "`required` should be a string or a list of strings, found `5`",
+        "`tags` should be a string or a list of strings, found `[1]`",
+    ]
+    assert "class MightyEstimator(RegressorMixin, BaseEstimator)" in r3["source"]
+    assert r3["errors"] == []
+
+
+def test_forge_stdin_jsonl_unexpected_error() -> None:
+    _input = json.dumps({"name": "MightyEstimator", "estimator_type": "regressor"})
+    with patch("sksmithy._batch.parse_spec", side_effect=RuntimeError("boom")):
+        result = runner.invoke(cli, ["forge", "--stdin-jsonl"], input=_input)
+
+    assert result.exit_code == 1
+    assert json.loads(result.stdout) == {"name": "MightyEstimator", "source": None, "errors": ["Invalid spec: boom"]}
+
+
+@pytest.mark.parametrize("profile_format", ["table", "json"])
+def test_forge_profile(tmp_path: Path, name: str, profile_format: str) -> None:
+    output_file = tmp_path / f"{name.lower()}.py"
+    result = runner.invoke(
+        app=cli,
+        args=[
+            "forge",
+            "--name",
+            name,
+            "--estimator-type",
+            "transformer",
+            "--required-params",
+            "",
+            "--optional-params",
+            "",
+            "--no-sample-weight",
+            "--tags",
+            "",
+            "--output-file",
+            str(output_file),
+            "--profile",
+            "--profile-format",
+            profile_format,
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert output_file.exists()
+
+    phases = ("template load", "jinja render", "ruff format", "file write", "total")
+    if profile_format == "json":
+        report = json.loads(result.stdout[result.stdout.index("{") :])
+        assert tuple(report) == phases
+        assert all(stats["wall_time_ms"] > 0 for stats in report.values())
+    else:
+        assert "Forge profile" in result.stdout
+        assert all(phase in result.stdout for phase in phases)
+
+
+def test_serve() -> None:
+    try:
+        with patch("socketserver.BaseServer.serve_forever", side_effect=KeyboardInterrupt):
+            result = runner.invoke(cli, ["serve", "--port", "0", "--workers", "1"])
+    finally:
+        configure_formatter("subprocess")
+        configure_skeletons(enabled=False)
+
+    assert result.exit_code == 0
+    assert "Serving on http://127.0.0.1:0" in result.stdout
+    assert "Request latency" in result.stdout
+
+
+def test_watch(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.json"
+    spec_file.write_text(
+        json.dumps(
+            [
+                {"name": "MightyEstimator", "estimator_type": "classifier", "output_file": str(tmp_path / "mighty.py")},
+                {"name": "class", "estimator_type": "regressor"},
+            ]
+        )
+    )
+
+    try:
+        with patch("sksmithy._watch.PollingWatcher.wait", side_effect=KeyboardInterrupt):
+            result = runner.invoke(cli, ["watch", str(spec_file)])
+    finally:
+        configure_formatter("subprocess")
+        configure_skeletons(enabled=False)
+
+    assert result.exit_code == 0
+    assert f"Watching {spec_file}" in result.stdout
+    assert "1 forged, 0 unchanged, 1 failed" in result.stdout
+    assert "#1 class: `class` is a python reserved keyword!" in result.stdout
+    assert (tmp_path / "mighty.py").exists()
+
+
+def test_templates(tmp_path: Path, name: str) -> None:
+    result = runner.invoke(cli, ["templates"])
+
+    assert result.exit_code == 0
+    assert "default" in result.stdout
+
+    output_file = tmp_path / "out.py"
+    args = ["forge", "--name", name, "--estimator-type", "transformer", "--output-file", str(output_file)]
+    result = runner.invoke(cli, [*args, "--template", "madeup"], input="\n\n\n\n")
+
+    assert result.exit_code == 2  # noqa: PLR2004
+    assert "`madeup` is not an available template" in result.output
+    assert not output_file.exists()
+
+
+def test_validate(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.json"
+    specs = [
+        {"name": "MightyEstimator", "estimator_type": "classifier"},
+        {"name": "MightyEstimator", "estimator_type": "regressor", "required": "a,a"},
+    ]
+    spec_file.write_text(json.dumps(specs))
+
+    result = runner.invoke(cli, ["validate", str(spec_file)])
+
+    assert result.exit_code == 1
+    assert "Found 3 errors in 1 estimators" in result.stdout
+
+    spec_file.write_text(json.dumps(specs[:1]))
+    result = runner.invoke(cli, ["validate", str(spec_file)])
+
+    assert result.exit_code == 0
+    assert "1 estimators are valid" in result.stdout
@@ -0,0 +1,218 @@
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from sksmithy import _formatter
+from sksmithy._formatter import (
+    FormatterBusyError,
+    FormatterError,
+    RuffServerPool,
+    configure_formatter,
+    get_formatter,
+    ruff_config_files,
+    ruff_config_hash,
+    ruff_default_style,
+    ruff_line_length,
+    subprocess_format,
+)
+from sksmithy._models import EstimatorType
+from sksmithy._utils import render_template
+
+UNFORMATTED = "def f( a,b ):\n  return {'a':a,\n'b':b}\n"
+
+
+@pytest.fixture()
+def pool() -> Generator[RuffServerPool, None, None]:
+    with RuffServerPool(size=2, timeout=10) as pool:
+        yield pool
+
+
+def test_pool_same_as_subprocess(pool: RuffServerPool) -> None:
+    assert pool(UNFORMATTED) == subprocess_format(UNFORMATTED)
+
+    formatted = subprocess_format(UNFORMATTED)
+    assert pool(formatted) == formatted
+
+
+def test_pool_reuses_workers(pool: RuffServerPool) -> None:
+    for _ in range(5):
+        pool(UNFORMATTED)
+
+    assert pool.workers == 1
+
+
+def test_pool_invalid_source(pool: RuffServerPool) -> None:
+    with pytest.raises(FormatterError, match="Unable to format source code"):
+        pool("def f(:\n    pass\n")
+
+
+def test_pool_restarts_dead_worker(pool: RuffServerPool) -> None:
+    pool(UNFORMATTED)
+    (worker,) = pool._idle  # noqa: SLF001
+    worker._process.kill()  # noqa: SLF001
+    worker._process.wait()  # noqa: SLF001
+
+    assert pool(UNFORMATTED) == subprocess_format(UNFORMATTED)
+    assert pool.restarts == 1
+    assert pool.workers == 1
+
+
+def _die_while_formatting(pool: RuffServerPool) -> None:
+    """Make the idle worker of `pool` die while serving its next request."""
+    (worker,) = pool._idle  # noqa: SLF001
+
+    def format_(source: str) -> str:  # noqa: ARG001
+        worker._process.kill()  # noqa: SLF001
+        worker._process.wait()  # noqa: SLF001
+        msg = "ruff server exited"
+        raise FormatterError(msg)
+
+    worker.format = format_  # type: ignore[method-assign]
+
+
+def test_pool_retries_on_fresh_worker(pool: RuffServerPool) -> None:
+    pool(UNFORMATTED)
+    _die_while_formatting(pool)
+
+    assert pool(UNFORMATTED) == subprocess_format(UNFORMATTED)
+    assert pool.restarts == 1
+    assert pool.workers == len(pool._idle) == 1  # noqa: SLF001
+
+
+def test_pool_retry_invalid_source(pool: RuffServerPool) -> None:
+    """The fresh worker of a retry is checked back in even if it cannot format the source."""
+    pool(UNFORMATTED)
+    _die_while_formatting(pool)
+
+    with pytest.raises(FormatterError, match="Unable to format source code"):
+        pool("def f(:\n    pass\n")
+    assert pool.restarts == 1
+    assert pool.workers == len(pool._idle) == 1  # noqa: SLF001
+
+
+def test_pool_retry_fallback(pool: RuffServerPool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """If the worker of a retry cannot be started, the single-shot subprocess is used."""
+    pool(UNFORMATTED)
+    _die_while_formatting(pool)
+    monkeypatch.setattr(_formatter, "RUFF_SERVER_COMMAND", ("ruff", "not-a-command"))
+
+    assert pool(UNFORMATTED) == subprocess_format(UNFORMATTED)
+    assert pool.workers == 0
+
+
+def test_pool_backpressure() -> None:
+    with RuffServerPool(size=1, acquire_timeout=0.01) as pool:
+        pool._slots.acquire()  # noqa: SLF001  # Simulate a saturated pool
+        with pytest.raises(FormatterBusyError):
+            pool(UNFORMATTED)
+
+        pool._slots.release()  # noqa: SLF001
+        assert pool(UNFORMATTED) == subprocess_format(UNFORMATTED)
+
+
+def test_pool_concurrent_callers(pool: RuffServerPool) -> None:
+    results: list[str] = []
+
+    def target() -> None:
+        results.append(pool(UNFORMATTED))
+
+    threads = [threading.Thread(target=target) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [subprocess_format(UNFORMATTED)] * 8
+    assert pool.workers <= pool.size
+
+
+def test_pool_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """If ruff server cannot start, the single-shot subprocess is used."""
+    monkeypatch.setattr(_formatter, "RUFF_SERVER_COMMAND", ("ruff", "not-a-command"))
+
+    with RuffServerPool(size=1, timeout=2) as pool:
+        assert pool(UNFORMATTED) == subprocess_format(UNFORMATTED)
+        assert pool.workers == 0
+
+
+def test_render_with_pool(name: str, estimator: EstimatorType) -> None:
+    kwargs = {"name": name, "estimator_type": estimator, "required": ["alpha"], "optional": ["beta"]}
+    expected = render_template(**kwargs)  # type: ignore[arg-type]
+
+    try:
+        pool = configure_formatter("pool", size=1)
+        assert isinstance(pool, RuffServerPool)
+        assert get_formatter() is pool
+        assert render_template(**kwargs) == expected  # type: ignore[arg-type]
+    finally:
+        configure_formatter("subprocess")
+
+    assert get_formatter() is subprocess_format
+    assert pool.workers == 0
+
+
+def test_configure_invalid_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown formatter backend"):
+        configure_formatter("not-a-backend")  # type: ignore[arg-type]
+
+
+def test_ruff_config_hash(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The hash changes whenever a configuration file in the folder, its parents or the user folder changes."""
+    project = tmp_path / "project" / "src"
+    project.mkdir(parents=True)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.chdir(project)
+
+    initial = ruff_config_hash()
+    assert initial == ruff_config_hash(project)
+
+    pyproject = tmp_path / "project" / "pyproject.toml"
+    pyproject.write_text("[tool.ruff]\nline-length = 60\n")
+    assert ruff_config_files() == (pyproject,)
+    with_pyproject = ruff_config_hash()
+    assert with_pyproject != initial
+
+    pyproject.write_text("[tool.ruff]\nline-length = 100\n")
+    assert ruff_config_hash() not in {initial, with_pyproject}
+
+    user_config = tmp_path / "config" / "ruff" / "ruff.toml"
+    user_config.parent.mkdir(parents=True)
+    user_config.write_text("line-length = 70\n")
+    assert ruff_config_files() == (pyproject, user_config)
+
+
+@pytest.mark.parametrize(("config", "line_length"), [(None, 88), ("line-length = 60", 60), ("line-length = 150", 150)])
+def test_ruff_line_length(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config: str | None, line_length: int
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    if config is not None:
+        (tmp_path / "ruff.toml").write_text(config)
+
+    assert ruff_line_length() == line_length
+
+
+@pytest.mark.parametrize(
+    ("config", "expected"),
+    [
+        (None, True),
+        ("line-length = 150", True),
+        ("[format]\ndocstring-code-format = true", True),
+        ('[format]\nquote-style = "single"', False),
+        ('[format]\nindent-style = "tab"', False),
+        ("[format]\nskip-magic-trailing-comma = true", False),
+        ("indent-width = 2", False),
+    ],
+)
+def test_ruff_default_style(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config: str | None, expected: bool
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    if config is not None:
+        (tmp_path / "ruff.toml").write_text(config)
+
+    assert ruff_default_style() is expected
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sksmithy._manifest import (
+    Manifest,
+    ManifestEntry,
+    content_hash,
+    default_manifest_path,
+    spec_hash,
+)
+from sksmithy._models import EstimatorType
+
+
+def test_default_manifest_path() -> None:
+    assert default_manifest_path(Path("specs") / "estimators.toml") == Path("specs") / ".estimators.toml.manifest.json"
+
+
+def test_spec_hash() -> None:
+    kwargs = {"name": "Mighty", "estimator_type": EstimatorType.ClassifierMixin, "required": ["alpha"]}
+
+    assert spec_hash(kwargs) == spec_hash({**kwargs, "estimator_type": "classifier", "output_file": "mighty.py"})
+    assert spec_hash(kwargs) != spec_hash({**kwargs, "required": ["beta"]})
+
+
+def test_manifest_roundtrip(tmp_path: Path) -> None:
+    output_file = tmp_path / "mighty.py"
+    output_file.write_text("content")
+    entry = ManifestEntry("spec", "template", "ruff", content_hash("content"))
+
+    Manifest(tmp_path / "manifest.json", {str(output_file): entry}).save()
+    manifest = Manifest.load(tmp_path / "manifest.json")
+
+    assert manifest.entries == {str(output_file): entry}
+    assert manifest.is_fresh(str(output_file), ManifestEntry("spec", "template", "ruff"))
+    assert not manifest.is_fresh(str(output_file), ManifestEntry("spec", "template", "other-ruff"))
+    assert not manifest.is_fresh(str(tmp_path / "missing.py"), entry)
+
+    output_file.write_text("edited")
+    assert not manifest.is_fresh(str(output_file), entry)
+
+
+@pytest.mark.parametrize("content", ["", "not-a-json", json.dumps({"version": 0, "entries": {}}), json.dumps([1])])
+def test_manifest_load_invalid(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "manifest.json"
+    path.write_text(content)
+
+    assert Manifest.load(path).entries == {}
@@ -1,9 +1,19 @@
 from collections.abc import Callable
+from typing import Any
 
 import pytest
 from result import Err, Ok, is_err, is_ok
 
-from sksmithy._parsers import check_duplicates, name_parser, params_parser, tags_parser
+from sksmithy._models import EstimatorType
+from sksmithy._parsers import (
+    SpecError,
+    check_duplicates,
+    name_parser,
+    params_parser,
+    tags_parser,
+    template_parser,
+    validate_specs,
+)
 
 
 @pytest.mark.parametrize(
@@ -71,3 +81,90 @@ def test_tags_parser(tags: str, checker: Callable, expected: str) -> None:
             assert value == expected
         case Err(msg):
             assert msg.startswith(expected)
+
+
+@pytest.mark.parametrize(
+    ("template", "checker", "expected"),
+    [
+        ("default", is_ok, "default"),
+        ("", is_ok, "default"),
+        (None, is_ok, "default"),
+        ("madeup", is_err, "`madeup` is not an available template. Available templates are: ('default',)"),
+    ],
+)
+def test_template_parser(template: str | None, checker: Callable, expected: str) -> None:
+    result = template_parser(template)
+    assert checker(result)
+    match result:
+        case Ok(value):
+            assert value == expected
+        case Err(msg):
+            assert msg == expected
+
+
+def test_validate_specs() -> None:
+    specs: list[dict[str, Any]] = [
+        {"name": "Mighty", "estimator_type": "classifier", "required": "alpha,beta", "tags": ["allow_nan"]},
+        {"name": "Mighty", "estimator_type": "regressor", "output_file": "other.py"},
+        {"name": "class", "estimator_type": "nope", "required": ["a", "a", "1b"], "optional": "a,def", "unknown": 1},
+        {"name": "Another", "estimator_type": "outlier", "tags": "allow_nan,nope", "output_file": "./mighty.py"},
+        {"name": "Templated", "estimator_type": "cluster", "template": "madeup"},
+    ]
+
+    assert validate_specs(specs) == [
+        SpecError(1, "name", "`Mighty` is already the name of spec #0"),
+        SpecError(2, "keys", "Unknown keys: ['unknown']"),
+        SpecError(2, "name", "`class` is a python reserved keyword!"),
+        SpecError(
+            2,
+            "estimator_type",
+            f"`nope` is not a valid estimator type. Available types are: {tuple(e.value for e in EstimatorType)}",
+        ),
+        SpecError(2, "required", "`a` is repeated"),
+        SpecError(2, "required", "`1b` is not a valid python identifier"),
+        SpecError(2, "optional", "`a` is both required and optional"),
+        SpecError(2, "optional", "`def` is a python reserved keyword"),
+        SpecError(3, "tags", "`nope` is not an available tag"),
+        SpecError(3, "output_file", "`./mighty.py` is already the output file of spec #0"),
+        SpecError(4, "template", "`madeup` is not an available template. Available templates are: ('default',)"),
+    ]
+
+
+def test_validate_specs_many() -> None:
+    specs = [{"name": f"Mighty{idx}", "estimator_type": "transformer", "required": "alpha"} for idx in range(5_000)]
+    assert validate_specs(specs) == []
+
+    specs.append({"name": "Mighty0", "estimator_type": "transformer", "output_file": "new.py"})
+    assert validate_specs(specs) == [SpecError(5_000, "name", "`Mighty0` is already the name of spec #0")]
+
+
+def test_validate_specs_compatibility() -> None:
+    specs = [
+        {"name": "Mighty", "estimator_type": "regressor", "predict_proba": True, "tags": "binary_only,allow_nan"},
+        {"name": "Linear", "estimator_type": "classifier", "linear": True, "decision_function": True},
+    ]
+
+    assert validate_specs(specs) == [
+        SpecError(0, "predict_proba", "`predict_proba` is not available for regressor estimators"),
+        SpecError(0, "tags", "`binary_only` tag is not available for regressor estimators"),
+        SpecError(1, "decision_function", "`decision_function` is not available for linear classifier estimators"),
+    ]
+
+
+def test_validate_specs_types() -> None:
+    specs: list[dict[str, Any]] = [
+        {"name": 7, "estimator_type": "classifier", "required": 5, "optional": ["mu", 1], "tags": {"allow_nan": True}},
+        {"name": "Mighty", "estimator_type": "regressor", "linear": "false", "output_file": ["mighty.py"]},
+        {"name": "Other", "estimator_type": "classifier", "linear": True, "sample_weight": 1, "predict_proba": None},
+    ]
+
+    assert validate_specs(specs) == [
+        SpecError(0, "name", "`name` should be a string, found `7`"),
+        SpecError(0, "required", "`required` should be a string or a list of strings, found `5`"),
+        SpecError(0, "optional", "`optional` should be a string or a list of strings, found `['mu', 1]`"),
+        SpecError(0, "tags", "`tags` should be a string or a list of strings, found `{'allow_nan': True}`"),
+        SpecError(1, "output_file", "`output_file` should be a string, found `['mighty.py']`"),
+        SpecError(1, "linear", "`linear` should be a boolean, found `'false'`"),
+        SpecError(2, "sample_weight", "`sample_weight` should be a boolean, found `1`"),
+        SpecError(2, "predict_proba", "`predict_proba` should be a boolean, found `None`"),
+    ]
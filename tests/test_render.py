@@ -1,5 +1,17 @@
+import ast
+import asyncio
+import subprocess
+import sys
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from sksmithy import _formatter
 from sksmithy._models import EstimatorType
-from sksmithy._utils import render_template
+from sksmithy._profiling import Profiler
+from sksmithy._utils import arender_many, arender_template, render_many, render_module, render_template
 
 
 def test_params(name: str, required: list[str], optional: list[str]) -> None:
@@ -233,3 +245,130 @@ def test_cluster(name: str) -> None:
     assert "class MightyEstimator(ClusterMixin, BaseEstimator)" in result
     assert "self.labels_ = ..." in result
     assert "def predict(self, X)" in result
+
+
+def test_render_many(name: str, sample_weight: bool, tags: list[str] | None) -> None:
+    """Tests that batch rendering matches one-by-one rendering, with a single ruff invocation."""
+    specs = [
+        {
+            "name": f"{name}{idx}",
+            "estimator_type": estimator,
+            "required": ["alpha"],
+            "optional": ["beta", "max_iter"],
+            "sample_weight": sample_weight,
+            "tags": tags,
+        }
+        for idx, estimator in enumerate(EstimatorType)
+    ]
+
+    with patch("sksmithy._formatter.subprocess.run", wraps=subprocess.run) as mock_run:
+        result = render_many(specs)
+
+    assert mock_run.call_count == 1
+    assert result == [render_template(**spec) for spec in specs]  # type: ignore[arg-type]
+
+
+def test_render_many_empty() -> None:
+    assert render_many([]) == []
+
+
+def test_render_module(name: str, sample_weight: bool) -> None:
+    """Tests that a module renders the same classes of one-by-one rendering, importing each name once."""
+    specs: list[dict[str, Any]] = [
+        {
+            "name": f"{name}{idx}",
+            "estimator_type": estimator,
+            "required": ["alpha"],
+            "optional": [],
+            "sample_weight": sample_weight,
+        }
+        for idx, estimator in enumerate(EstimatorType)
+    ]
+
+    with patch("sksmithy._utils.format_source", wraps=_formatter.format_source) as mock_format:
+        module = ast.parse(render_module(specs))
+
+    assert mock_format.call_count == 1
+
+    imports = [node for node in module.body if isinstance(node, ast.Import | ast.ImportFrom)]
+    classes = [node for node in module.body if isinstance(node, ast.ClassDef)]
+    assert len(imports) + len(classes) == len(module.body)
+
+    imported = [(getattr(node, "module", None), alias.name) for node in imports for alias in node.names]
+    assert len(imported) == len(set(imported))
+    assert len({getattr(node, "module", None) for node in imports if isinstance(node, ast.ImportFrom)}) == len(
+        [node for node in imports if isinstance(node, ast.ImportFrom)]
+    )
+
+    for spec, class_node in zip(specs, classes, strict=True):
+        (expected,) = (node for node in ast.parse(render_template(**spec)).body if isinstance(node, ast.ClassDef))
+        assert ast.dump(class_node) == ast.dump(expected)
+
+
+def test_render_module_duplicated_names(name: str) -> None:
+    spec = {"name": name, "estimator_type": EstimatorType.ClassifierMixin, "required": [], "optional": []}
+
+    with pytest.raises(ValueError, match="Estimator names should be unique within a module"):
+        render_module([spec, spec])
+
+
+async def test_arender_template(name: str, estimator: EstimatorType, sample_weight: bool) -> None:
+    kwargs = {"name": name, "estimator_type": estimator, "required": ["alpha"], "optional": ["beta"]}
+    result = await arender_template(**kwargs, sample_weight=sample_weight, timeout=30)  # type: ignore[arg-type]
+    assert result == render_template(**kwargs, sample_weight=sample_weight)  # type: ignore[arg-type]
+
+
+async def test_arender_many(name: str) -> None:
+    specs = [
+        {"name": f"{name}{idx}", "estimator_type": e, "required": [], "optional": []}
+        for idx, e in enumerate(EstimatorType)
+    ]
+
+    assert await arender_many(specs) == render_many(specs)
+    assert await arender_many([]) == []
+
+
+@pytest.fixture()
+def slow_ruff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_formatter, "RUFF_FORMAT_COMMAND", (sys.executable, "-c", "import time; time.sleep(30)"))
+
+
+@pytest.mark.usefixtures("slow_ruff")
+async def test_arender_template_timeout() -> None:
+    start = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        await arender_template(
+            name="Mighty", estimator_type=EstimatorType.ClassifierMixin, required=[], optional=[], timeout=0.2
+        )
+    assert time.perf_counter() - start < 10  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("slow_ruff")
+async def test_arender_template_cancel() -> None:
+    task = asyncio.create_task(
+        arender_template(name="Mighty", estimator_type=EstimatorType.ClassifierMixin, required=[], optional=[])
+    )
+    await asyncio.sleep(0.2)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_arender_template_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_formatter, "RUFF_FORMAT_COMMAND", (sys.executable, "-c", "import sys; sys.exit(2)"))
+
+    with pytest.raises(subprocess.CalledProcessError):
+        await arender_template(name="Mighty", estimator_type=EstimatorType.ClassifierMixin, required=[], optional=[])
+
+
+def test_render_profiler(name: str, estimator: EstimatorType) -> None:
+    kwargs = {"name": name, "estimator_type": estimator, "required": ["alpha"], "optional": []}
+    profiler = Profiler()
+
+    assert render_template(**kwargs, profiler=profiler) == render_template(**kwargs)  # type: ignore[arg-type]
+    assert [stats.phase for stats in profiler.phases] == ["template load", "jinja render", "ruff format"]
+    assert all(stats.wall_time > 0 and stats.peak_memory >= 0 for stats in profiler.phases)
+
+    report = profiler.to_dict()
+    assert report["total"]["wall_time_ms"] == pytest.approx(sum(1000 * stats.wall_time for stats in profiler.phases))
@@ -0,0 +1,150 @@
+import http.client
+import json
+import socket
+import sys
+import tempfile
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from sksmithy._server import LatencyStats, make_server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self) -> None:
+        """Connect to the Unix socket."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def request(
+    conn: http.client.HTTPConnection, method: str, path: str, body: dict[str, Any] | None = None
+) -> tuple[int, dict[str, Any]]:
+    conn.request(method, path, body=json.dumps(body) if body is not None else None)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+@pytest.fixture()
+def stats() -> LatencyStats:
+    return LatencyStats()
+
+
+@pytest.fixture()
+def address(stats: LatencyStats) -> Generator[tuple[str, int], None, None]:
+    server = make_server(host="127.0.0.1", port=0, stats=stats)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server.server_address  # type: ignore[misc]
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_forge(address: tuple[str, int], stats: LatencyStats, name: str) -> None:
+    conn = http.client.HTTPConnection(*address)
+
+    status, record = request(conn, "POST", "/forge", {"name": name, "estimator_type": "classifier", "required": "a"})
+    assert status == http.client.OK
+    assert record["name"] == name
+    assert f"class {name}(ClassifierMixin, BaseEstimator)" in record["source"]
+    assert record["errors"] == []
+
+    status, record = request(conn, "POST", "/forge", {"name": "class", "estimator_type": "classifier"})
+    assert status == http.client.UNPROCESSABLE_ENTITY
+    assert record["errors"] == ["`class` is a python reserved keyword!"]
+
+    status, summary = request(conn, "GET", "/stats")
+    assert status == http.client.OK
+    assert summary["count"] == stats.count == 2  # noqa: PLR2004
+    assert summary["errors"] == 1
+    assert 0 < summary["p50_ms"] <= summary["max_ms"]
+
+
+def test_forge_wrong_type(address: tuple[str, int], stats: LatencyStats) -> None:
+    """A spec with a value of the wrong type gets an error record, and is counted as an error."""
+    conn = http.client.HTTPConnection(*address, timeout=5)
+
+    status, record = request(conn, "POST", "/forge", {"name": 7, "estimator_type": "classifier"})
+    assert status == http.client.UNPROCESSABLE_ENTITY
+    assert record == {"name": 7, "source": None, "errors": ["`name` should be a string, found `7`"]}
+    assert (stats.count, stats.errors) == (1, 1)
+
+
+def test_concurrent_clients(address: tuple[str, int], stats: LatencyStats) -> None:
+    def forge(idx: int) -> int:
+        conn = http.client.HTTPConnection(*address)
+        status, _ = request(conn, "POST", "/forge", {"name": f"Estimator{idx}", "estimator_type": "regressor"})
+        return status
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(forge, range(16)))
+
+    assert statuses == [http.client.OK] * 16
+    assert stats.count == 16  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(("method", "path"), [("GET", "/not-found"), ("POST", "/not-found")])
+def test_not_found(address: tuple[str, int], method: str, path: str) -> None:
+    status, _ = request(http.client.HTTPConnection(*address), method, path, {})
+    assert status == http.client.NOT_FOUND
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_invalid_content_length(address: tuple[str, int], content_length: str) -> None:
+    conn = http.client.HTTPConnection(*address, timeout=5)
+    conn.putrequest("POST", "/forge")
+    conn.putheader("Content-Length", content_length)
+    conn.endheaders()
+    response = conn.getresponse()
+
+    assert response.status == http.client.BAD_REQUEST
+    assert json.loads(response.read()) == {"errors": ["Invalid Content-Length header"]}
+
+
+def test_health(address: tuple[str, int]) -> None:
+    assert request(http.client.HTTPConnection(*address), "GET", "/health") == (http.client.OK, {"status": "ok"})
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets are not available on Windows")
+def test_unix_socket() -> None:
+    # pytest `tmp_path` can exceed the maximum length of a Unix socket path.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = Path(tmp_dir) / "smithy.sock"
+        server = make_server(socket_path=socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            status, record = request(
+                UnixHTTPConnection(str(socket_path)), "POST", "/forge", {"name": "Mighty", "estimator_type": "outlier"}
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    assert status == http.client.OK
+    assert "class Mighty(OutlierMixin, BaseEstimator)" in record["source"]
+
+
+def test_latency_stats() -> None:
+    stats = LatencyStats(window=2)
+    assert stats.summary()["max_ms"] == 0.0
+
+    for latency in (0.003, 0.001, 0.002):
+        stats.record(latency)
+
+    summary = stats.summary()
+    assert summary["count"] == 3  # noqa: PLR2004
+    assert summary["max_ms"] == pytest.approx(2.0)  # first latency is out of the window
@@ -0,0 +1,135 @@
+from collections.abc import Generator
+from itertools import product
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from sksmithy import _skeletons
+from sksmithy._models import EstimatorType
+from sksmithy._skeletons import (
+    SkeletonTable,
+    configure_skeletons,
+    get_skeleton_table,
+    skeleton_key,
+    skeleton_render_template,
+    valid_keys,
+)
+from sksmithy._utils import render_many, render_template
+
+
+@pytest.fixture()
+def table() -> Generator[SkeletonTable, None, None]:
+    table = configure_skeletons()
+    assert table is not None
+    yield table
+    configure_skeletons(enabled=False)
+
+
+def test_valid_keys() -> None:
+    keys = list(valid_keys())
+
+    assert len(keys) == len(set(keys)) == 364  # noqa: PLR2004
+    assert all(not key.has_max_iter or key.has_required or key.has_optional for key in keys)
+    assert not any(key.linear and key.decision_function for key in keys)
+
+
+def test_verify() -> None:
+    table = SkeletonTable()
+
+    assert table.verify() == []
+    assert len(table) == table.warm_up() == 364  # noqa: PLR2004
+
+
+def test_render(
+    table: SkeletonTable,
+    name: str,
+    estimator: EstimatorType,
+    required: list[str],
+    optional: list[str],
+    tags: list[str] | None,
+) -> None:
+    kwargs = {"name": name, "estimator_type": estimator, "required": required, "optional": optional, "tags": tags}
+
+    with patch.object(_skeletons, "format_many", wraps=_skeletons.format_many) as mock_format_many:
+        assert skeleton_render_template(**kwargs) == render_template(**kwargs)  # type: ignore[arg-type]
+        assert skeleton_render_template(**kwargs) == render_template(**kwargs)  # type: ignore[arg-type]
+
+    # The skeleton is built only once
+    assert mock_format_many.call_count == 1
+    assert len(table) == 1
+
+
+def test_render_fallback(table: SkeletonTable) -> None:
+    """Lines which would be wrapped by ruff fall back to the full pipeline."""
+    kwargs = {
+        "name": "MightyEstimator",
+        "estimator_type": EstimatorType.RegressorMixin,
+        "required": [f"parameter_{i}" for i in range(10)],
+        "optional": [],
+    }
+
+    assert table.render(**kwargs) is None  # type: ignore[arg-type]
+    assert skeleton_render_template(**kwargs) == render_template(**kwargs)  # type: ignore[arg-type]
+
+
+def test_unsupported_skeleton(table: SkeletonTable) -> None:
+    """Skeletons with sentinels in lines which cannot be expanded are never used."""
+    key = skeleton_key(estimator_type=EstimatorType.ClusterMixin, required=["a"], optional=["b"])
+
+    with patch.object(
+        _skeletons,
+        "format_many",
+        side_effect=lambda sources: [
+            f"def __init__(self, {_skeletons.REQUIRED_SENTINEL}, *, {_skeletons.OPTIONAL_SENTINEL}=...): ...\n"
+            for _ in sources
+        ],
+    ):
+        assert (
+            table.render(name="Mighty", estimator_type=EstimatorType.ClusterMixin, required=["a"], optional=["b"])
+            is None
+        )
+
+    assert table._skeletons[key] is None  # noqa: SLF001
+
+
+def test_disabled() -> None:
+    assert configure_skeletons(enabled=False) is None
+    assert get_skeleton_table() is None
+
+    kwargs = {"name": "Mighty", "estimator_type": EstimatorType.OutlierMixin, "required": ["a"], "optional": []}
+    assert skeleton_render_template(**kwargs) == render_template(**kwargs)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("line_length", [None, 60, 100])
+def test_ruff_line_length(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, line_length: int | None) -> None:
+    """Splicing follows the line length of the ruff configuration in effect, including the default one."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    if line_length is not None:
+        (tmp_path / "pyproject.toml").write_text(f"[tool.ruff]\nline-length = {line_length}\n")
+
+    table = SkeletonTable()
+    specs: list[dict[str, Any]] = [
+        {
+            "name": name,
+            "estimator_type": estimator,
+            "required": required,
+            "optional": ["gamma_tolerance", "max_iter"],
+            "sample_weight": True,
+            "tags": ["allow_nan"],
+        }
+        for name, estimator, required in product(
+            ("Mighty", "Mighty" * 6, "Mighty" * 10),
+            EstimatorType,
+            ([], ["alpha"], ["alpha_regularization_strength", "beta"]),
+        )
+    ]
+
+    assert all(
+        spliced == expected
+        for spec, expected in zip(specs, render_many(specs), strict=True)
+        if (spliced := table.render(**spec)) is not None
+    )
+    assert table.verify() == []
@@ -0,0 +1,49 @@
+import ast
+from unittest.mock import patch
+
+import pytest
+
+from sksmithy import ForgeResult, ForgeSpec
+from sksmithy._models import EstimatorType
+from sksmithy._utils import render_template
+
+
+def test_spec(name: str, estimator: EstimatorType) -> None:
+    spec = ForgeSpec(name=name, estimator_type=estimator.value, required=["alpha"], tags=None)  # type: ignore[arg-type]
+
+    assert spec == ForgeSpec(name=name, estimator_type=estimator, required=("alpha",))
+    assert hash(spec) == hash(ForgeSpec(name=name, estimator_type=estimator, required=("alpha",)))
+    assert spec.estimator_type is estimator
+    assert spec.tags == ()
+    assert not hasattr(spec, "__dict__")
+
+    with pytest.raises(AttributeError):
+        spec.name = "Other"  # type: ignore[misc]
+
+
+@pytest.mark.parametrize("field", ["required", "optional", "tags"])
+def test_spec_string(name: str, field: str) -> None:
+    with pytest.raises(TypeError, match=f"`{field}` should be a sequence of strings, not a string"):
+        ForgeSpec(name=name, estimator_type=EstimatorType.ClassifierMixin, **{field: "alpha"})  # type: ignore[arg-type]
+
+
+def test_result(name: str, estimator: EstimatorType, tags: list[str] | None) -> None:
+    spec = ForgeSpec(name=name, estimator_type=estimator, required=("alpha",), optional=("beta",), tags=tags)  # type: ignore[arg-type]
+    result = spec.forge()
+
+    assert isinstance(result, ForgeResult)
+    assert result.source == render_template(**spec.to_kwargs())
+    assert "raw" in result.__dict__
+    assert isinstance(result.tree, ast.Module)
+    assert result.tree is result.tree
+
+
+def test_result_lazy(name: str) -> None:
+    """Raw render and digest do not require formatting."""
+    result = ForgeSpec(name=name, estimator_type=EstimatorType.TransformerMixin).forge()
+
+    with patch("sksmithy._formatter.format_source") as mock_format:
+        assert f"class {name}(" in result.raw
+        assert len(result.digest) == 64  # noqa: PLR2004
+
+    mock_format.assert_not_called()
@@ -0,0 +1,158 @@
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from jinja2 import FileSystemLoader, Template, TemplateNotFound
+
+from sksmithy import _templates
+from sksmithy._cache import render_key
+from sksmithy._models import EstimatorType
+from sksmithy._skeletons import skeleton_render_template
+from sksmithy._templates import (
+    TEMPLATE_NAME,
+    TEMPLATE_PATH,
+    TemplateRegistry,
+    clear_template_cache,
+    configure_registry,
+    configure_template_cache,
+    get_registry,
+    get_template,
+    template_cache_info,
+    template_hash,
+)
+from sksmithy._utils import render_template
+
+CUSTOM_TEMPLATE = "class {{ name }}:\n    pass\n"
+
+
+@pytest.fixture()
+def fresh_cache() -> Generator[None, None, None]:
+    clear_template_cache()
+    yield
+    configure_template_cache(None)
+
+
+@pytest.mark.usefixtures("fresh_cache")
+def test_compiled_once() -> None:
+    """The template is compiled at the first call only."""
+    first = get_template()
+    second = get_template()
+
+    assert first is second
+    assert template_cache_info() == (1, 1, 0, 0)
+
+
+def test_same_output_as_plain_template() -> None:
+    values = {"name": "MightyEstimator", "estimator_type": "classifier", "mixin": "ClassifierMixin", "parameters": []}
+
+    expected = Template(TEMPLATE_PATH.read_text()).render(values)
+    assert get_template().render(values) == expected
+
+
+@pytest.mark.usefixtures("fresh_cache")
+def test_bytecode_cache(tmp_path: Path) -> None:
+    configure_template_cache(tmp_path)
+
+    get_template()
+    assert template_cache_info().bytecode_misses == 1
+    assert any(tmp_path.iterdir())
+
+    # Drop the in-process cache, compiled bytecode is then loaded from disk.
+    clear_template_cache()
+    get_template()
+    assert template_cache_info() == (0, 1, 1, 0)
+
+
+@pytest.mark.usefixtures("fresh_cache")
+def test_bytecode_cache_invalidation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changing the template source invalidates the bytecode stored on disk."""
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    template_file = template_dir / "custom.jinja"
+    template_file.write_text("Hello {{ name }}")
+
+    monkeypatch.setattr(_templates._ENVIRONMENT, "loader", FileSystemLoader(template_dir))  # noqa: SLF001
+    configure_template_cache(tmp_path / "bytecode")
+
+    assert get_template("custom.jinja").render(name="smithy") == "Hello smithy"
+
+    template_file.write_text("Goodbye {{ name }}")
+    clear_template_cache()
+
+    assert get_template("custom.jinja").render(name="smithy") == "Goodbye smithy"
+    assert template_cache_info().bytecode_misses == 1
+
+
+@pytest.fixture()
+def user_dir(tmp_path: Path) -> Generator[Path, None, None]:
+    """Registry with a user templates directory holding a `custom` template."""
+    previous = get_registry().user_dir
+    (tmp_path / "custom.py.jinja").write_text(CUSTOM_TEMPLATE)
+    configure_registry(tmp_path)
+    yield tmp_path
+    configure_registry(previous)
+
+
+def test_user_dir(user_dir: Path, name: str, estimator: EstimatorType) -> None:
+    registry = get_registry()
+
+    assert registry.names() == ["custom", TEMPLATE_NAME]
+    assert registry.path("custom") == user_dir / "custom.py.jinja"
+    assert registry.path(TEMPLATE_NAME) == TEMPLATE_PATH
+    assert "unknown" not in registry
+
+    kwargs: dict[str, Any] = {"name": name, "estimator_type": estimator, "required": [], "optional": []}
+    assert render_template(**kwargs, template="custom") == f"class {name}:\n    pass\n"
+    assert skeleton_render_template(**kwargs, template="custom") == f"class {name}:\n    pass\n"
+    assert render_key(**kwargs, template="custom") != render_key(**kwargs)
+
+    with pytest.raises(TemplateNotFound):
+        get_template("unknown")
+
+
+@pytest.mark.usefixtures("fresh_cache")
+def test_recompile_on_change(user_dir: Path) -> None:
+    """A compiled template is reused until its source file changes."""
+    first = get_template("custom")
+    assert get_template("custom") is first
+    digest = template_hash("custom")
+
+    (user_dir / "custom.py.jinja").write_text("class {{ name }}(object):\n    pass\n")
+
+    assert get_template("custom") is not first
+    assert get_template("custom").render(name="Smithy") == "class Smithy(object):\n    pass"
+    assert template_hash("custom") != digest
+    assert template_cache_info()[:2] == (2, 2)
+
+
+def test_entry_points(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entry points are discovered lazily, and loaded only when their template is requested."""
+    template_file = tmp_path / "plugin.py.jinja"
+    template_file.write_text(CUSTOM_TEMPLATE)
+    loaded: list[str] = []
+
+    class FakeEntryPoint:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def load(self) -> object:
+            loaded.append(self.name)
+            return lambda: template_file
+
+    discovered: list[str] = []
+
+    def entry_points(group: str) -> list[FakeEntryPoint]:
+        discovered.append(group)
+        return [FakeEntryPoint("plugin"), FakeEntryPoint("other")]
+
+    monkeypatch.setattr("importlib.metadata.entry_points", entry_points)
+    registry = TemplateRegistry()
+
+    assert registry.path(TEMPLATE_NAME) == TEMPLATE_PATH
+    assert registry.names() == [TEMPLATE_NAME, "other", "plugin"]
+    assert registry.path("plugin") == template_file
+    assert registry.path("plugin") == template_file
+
+    assert discovered == ["sksmithy.templates"]
+    assert loaded == ["plugin"]
@@ -1,10 +1,24 @@
+import statistics
+import threading
+import time
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 
 import pytest
-from textual.widgets import Button, Input, Select, Switch
+from result import Err, Ok
+from textual.widgets import Button, Input, Markdown, Select, Switch, TextArea
 
+from sksmithy._cache import cached_render_template
+from sksmithy._capabilities import Capability
 from sksmithy._models import EstimatorType
+from sksmithy._spec import ForgeSpec
+from sksmithy._templates import get_template
+from sksmithy._utils import render_template
 from sksmithy.tui import ForgeTUI
+from sksmithy.tui._components import CodeEditor, Sidebar
+from sksmithy.tui._state import FormState, parse_name, parse_params
+from sksmithy.tui._tui import FORMAT_DEBOUNCE
 
 
 async def test_smoke() -> None:
@@ -18,6 +32,36 @@ async def test_smoke() -> None:
         await pilot.exit(0)
 
 
+# Maximum number of seconds from the app creation to its first rendered frame, headless.
+STARTUP_BUDGET = 2.0
+
+
+async def test_startup() -> None:
+    """The first frame renders within budget, the code editor and the sidebar content are mounted once shown."""
+    start = time.perf_counter()
+    app = ForgeTUI()
+    async with app.run_test(size=None) as pilot:
+        await pilot.pause()
+        assert time.perf_counter() - start < STARTUP_BUDGET
+
+        assert not pilot.app.query(TextArea)
+        assert not pilot.app.query(Markdown)
+
+        app.action_toggle_sidebar()
+        pilot.app.query_one(CodeEditor).collapsed = False
+        await pilot.pause()
+
+        assert pilot.app.query_one(Sidebar).query_one(Markdown)
+        assert pilot.app.query_one("#code-area", TextArea) is pilot.app.query_one(CodeEditor).code_area()
+
+        # Showing them again does not mount anything new
+        app.action_toggle_sidebar()
+        app.action_toggle_sidebar()
+        await pilot.pause()
+        assert len(pilot.app.query(Markdown)) == 1
+        assert len(pilot.app.query(TextArea)) == 1
+
+
 @pytest.mark.parametrize(
     ("name_", "err_msg"),
     [
@@ -68,6 +112,16 @@ async def test_estimator_interaction(estimator: EstimatorType) -> None:
             await pilot.pause()
             assert pilot.app.query_one("#decision_function", Switch).disabled
 
+        if estimator == EstimatorType.RegressorMixin:
+            linear = pilot.app.query_one("#linear", Switch)
+            linear.value = True
+            await pilot.pause()
+            linear.value = False
+            await pilot.pause()
+
+            # Turning off linear does not enable decision_function for a regressor
+            assert pilot.app.query_one("#decision_function", Switch).disabled
+
 
 async def test_valid_params() -> None:
     """Test required and optional params interaction."""
@@ -182,3 +236,185 @@ async def test_forge_and_save(tmp_path: Path, name: str, estimator: EstimatorTyp
         assert "Saved at" in m2
 
         assert output_file.exists()
+
+
+async def test_forge_in_background(tmp_path: Path, estimator: EstimatorType) -> None:
+    """Forging does not block the interface, only the latest forge is applied, and saving waits for it."""
+    release = threading.Event()
+    rendered: list[str] = []
+
+    def slow_render(**kwargs: Any) -> str:  # noqa: ANN401
+        if kwargs["name"] == "Stale":
+            release.wait(timeout=10)
+        rendered.append(kwargs["name"])
+        return f"# {kwargs['name']}\n"
+
+    app = ForgeTUI()
+    with patch("sksmithy.tui._components.cached_render_template", side_effect=slow_render):
+        async with app.run_test(size=None) as pilot:
+            name_comp = pilot.app.query_one("#name", Input)
+            code_area = pilot.app.query_one(CodeEditor).code_area()
+            output_file = tmp_path / "latest.py"
+            pilot.app.query_one("#estimator", Select).value = estimator.value
+
+            name_comp.value = "Stale"
+            await pilot.pause()
+            pilot.app.query_one("#forge-btn", Button).press()
+            await pilot.pause()
+
+            # The stale forge is still running, yet the interface keeps processing events. Buttons are pressed with
+            # `press`, since `action_press` ignores presses while the button shows its active effect
+            assert code_area.loading
+            name_comp.value = "Latest"
+            await pilot.pause()
+            pilot.app.query_one("#output-file", Input).value = str(output_file)
+            pilot.app.query_one("#forge-btn", Button).press()
+            await pilot.pause()
+            pilot.app.query_one("#save-btn", Button).press()
+            await pilot.pause()
+            release.set()
+
+            await pilot.app.workers.wait_for_complete([w for w in pilot.app.workers if not w.is_cancelled])
+            await pilot.pause()
+
+            assert rendered == ["Latest", "Stale"]
+            assert not code_area.loading
+            assert code_area.text == "# Latest\n"
+            assert output_file.read_text() == "# Latest\n"
+            assert [n.message for n in pilot.app._notifications] == ["Template forged!", f"Saved at {output_file}"]  # noqa: SLF001
+
+
+# Maximum number of seconds from a keystroke to the live preview showing it (median over the keystrokes, so that a
+# single scheduling hiccup of the test machine does not fail the test), and hard timeout of a single keystroke.
+PREVIEW_LATENCY_TARGET = 0.2
+PREVIEW_TIMEOUT = 2.0
+
+
+async def test_live_preview(name: str) -> None:
+    """The preview follows each keystroke within the latency target, and is formatted once the inputs settle."""
+    app = ForgeTUI()
+    async with app.run_test(size=None) as pilot:
+        name_comp = pilot.app.query_one("#name", Input)
+        code_area = pilot.app.query_one(CodeEditor).code_area()
+        pilot.app.query_one("#estimator", Select).value = EstimatorType.ClassifierMixin.value
+        app.action_toggle_live_preview()
+        await pilot.pause()
+        get_template()  # Latency is measured with the template already compiled
+
+        with (
+            patch("sksmithy.tui._tui.cached_render_template", side_effect=cached_render_template) as formatter,
+            patch.object(ForgeTUI, "_show_preview", autospec=True, side_effect=ForgeTUI._show_preview) as show,  # noqa: SLF001
+        ):
+            # A slow typist: keystrokes are well within the format debounce, yet far apart for the preview one
+            with patch("sksmithy.tui._tui.FORMAT_DEBOUNCE", 10):
+                latencies = []
+                for char in name:
+                    start = time.perf_counter()
+                    name_comp.insert_text_at_cursor(char)
+                    while f"class {name_comp.value}(" not in code_area.text:
+                        assert time.perf_counter() - start < PREVIEW_TIMEOUT
+                        await pilot.pause(0.005)
+                    latencies.append(time.perf_counter() - start)
+
+                assert statistics.median(latencies) < PREVIEW_LATENCY_TARGET
+
+                # Nothing is formatted while typing
+                assert formatter.call_count == 0
+                assert show.call_count == len(name)
+
+            # Once the inputs settle, the preview is formatted
+            pilot.app.query_one("#sample_weight", Switch).value = True
+            expected = render_template(
+                name=name, estimator_type=EstimatorType.ClassifierMixin, required=[], optional=[], sample_weight=True
+            )
+            start = time.perf_counter()
+            while code_area.text != expected:
+                assert time.perf_counter() - start < FORMAT_DEBOUNCE + 10
+                await pilot.pause(0.05)
+            assert formatter.call_count == 1
+
+            # Going back to a state already previewed does not render anything
+            sample_weight = pilot.app.query_one("#sample_weight", Switch)
+            sample_weight.value = False
+            sample_weight.value = True
+            await pilot.pause(FORMAT_DEBOUNCE + 0.1)
+            await pilot.app.workers.wait_for_complete()
+
+            assert formatter.call_count == 1
+            assert show.call_count == len(name) + 2
+
+            app.action_toggle_live_preview()
+            name_comp.value = "Another"
+            await pilot.pause(FORMAT_DEBOUNCE + 0.1)
+
+            assert code_area.text == expected
+
+
+def test_form_state() -> None:
+    form = FormState()
+    assert form.errors == ["Name cannot be empty!", "Estimator cannot be empty!"]
+    assert form.capabilities() == Capability(0)
+
+    form = (
+        form.update("name", "Mighty")
+        .update("estimator", EstimatorType.ClassifierMixin.value)
+        .update("required", "a,b")
+        .update("optional", "b")
+    )
+    assert form.spec() == Err(["The following parameters are duplicated between required and optional: {'b'}"])
+
+    form = form.update("optional", "c").update("linear", True)  # noqa: FBT003
+    assert form == FormState().update("name", "Mighty").update("estimator", "classifier").update(
+        "required", "a,b"
+    ).update("optional", "c").update("linear", True)  # noqa: FBT003
+    assert form.capabilities() == Capability.linear | Capability.sample_weight | Capability.predict_proba
+    assert form.spec() == Ok(
+        ForgeSpec(
+            name="Mighty",
+            estimator_type=EstimatorType.ClassifierMixin,
+            required=("a", "b"),
+            optional=("c",),
+            linear=True,
+        )
+    )
+
+    with pytest.raises(KeyError):
+        form.update("output_file", "mighty.py")
+
+
+def test_form_state_incremental() -> None:
+    """Only the updated field is parsed."""
+    form = FormState().update("required", "a,b")
+
+    with (
+        patch("sksmithy.tui._state.parse_params", wraps=parse_params) as params,
+        patch("sksmithy.tui._state.parse_name", wraps=parse_name) as name,
+    ):
+        form = form.update("name", "Mighty").update("sample_weight", True)  # noqa: FBT003
+
+    assert name.call_count == 1
+    assert params.call_count == 0
+    assert form.required == Ok(("a", "b"))
+
+
+async def test_save_live_preview(tmp_path: Path, name: str) -> None:
+    """Saving while the live preview is still unformatted saves (and shows) the formatted code."""
+    app = ForgeTUI()
+    async with app.run_test(size=None) as pilot:
+        code_area = pilot.app.query_one(CodeEditor).code_area()
+        output_file = tmp_path / "preview.py"
+        pilot.app.query_one("#estimator", Select).value = EstimatorType.RegressorMixin.value
+        app.action_toggle_live_preview()
+
+        with patch("sksmithy.tui._tui.FORMAT_DEBOUNCE", 10):
+            pilot.app.query_one("#name", Input).value = name
+            while f"class {name}(" not in code_area.text:
+                await pilot.pause(0.01)
+            pilot.app.query_one("#output-file", Input).value = str(output_file)
+
+            await pilot.press("ctrl+s")
+            await pilot.pause()
+
+        expected = render_template(name=name, estimator_type=EstimatorType.RegressorMixin, required=[], optional=[])
+        assert output_file.read_text() == expected
+        assert code_area.text == expected
@@ -0,0 +1,97 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from sksmithy._watch import PollingWatcher, WatchUpdate, forge_update, watch
+
+SPECS: list[dict[str, Any]] = [
+    {"name": "MightyClassifier", "estimator_type": "classifier", "required": ["alpha"]},
+    {"name": "MightyRegressor", "estimator_type": "regressor"},
+]
+
+
+def test_polling_watcher(tmp_path: Path) -> None:
+    path = tmp_path / "specs.json"
+    watcher = PollingWatcher([path], interval=0.01, debounce=0.05)
+    assert watcher.poll() == set()
+
+    path.write_text("created")
+    assert watcher.poll() == {path}
+    assert watcher.poll() == set()
+
+    stop = threading.Event()
+    stop.set()
+    assert watcher.wait(stop) == set()
+
+
+def test_polling_watcher_debounce(tmp_path: Path) -> None:
+    path = tmp_path / "specs.json"
+    watcher = PollingWatcher([path], interval=0.01, debounce=0.05)
+
+    def burst() -> None:
+        for idx in range(5):
+            path.write_text("x" * idx)
+            threading.Event().wait(0.01)
+
+    thread = threading.Thread(target=burst)
+    thread.start()
+    changed = watcher.wait()
+    thread.join()
+
+    assert changed == {path}
+    assert watcher.poll() == set()  # The whole burst is reported at once
+
+
+def test_forge_update(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.json"
+    spec_file.write_text("{not-a-json")
+
+    update = forge_update(spec_file, tmp_path / "manifest.json")
+    assert update.outcomes == []
+    assert update.error is not None
+    assert update.error.startswith("Unable to load")
+
+
+def test_watch(tmp_path: Path) -> None:
+    spec_file = tmp_path / "specs.json"
+    specs: list[dict[str, Any]] = [
+        {**spec, "output_file": str(tmp_path / f"{idx}.py")} for idx, spec in enumerate(SPECS)
+    ]
+    spec_file.write_text(json.dumps(specs))
+
+    updates: list[WatchUpdate] = []
+    stop = threading.Event()
+    first_update, second_update = threading.Event(), threading.Event()
+
+    def on_update(update: WatchUpdate) -> None:
+        updates.append(update)
+        (second_update if first_update.is_set() else first_update).set()
+
+    thread = threading.Thread(
+        target=watch,
+        kwargs={
+            "spec_file": spec_file,
+            "manifest": tmp_path / "manifest.json",
+            "on_update": on_update,
+            "stop": stop,
+            "interval": 0.01,
+            "debounce": 0.05,
+        },
+    )
+    thread.start()
+    try:
+        assert first_update.wait(timeout=30)
+        specs[0]["optional"] = ["mu"]
+        spec_file.write_text(json.dumps(specs))
+        assert second_update.wait(timeout=30)
+    finally:
+        stop.set()
+        thread.join()
+
+    first, second = updates
+    assert [o.unchanged for o in first.outcomes] == [False, False]
+    assert second.changed == {spec_file}
+    assert [o.unchanged for o in second.outcomes] == [False, True]
+    assert second.latency > 0
+    assert "self.mu = mu" in (tmp_path / "0.py").read_text()
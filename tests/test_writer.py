@@ -0,0 +1,61 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from sksmithy._writer import atomic_write, write_if_changed, write_many
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "mighty.py"
+
+    assert write_if_changed(path, "content")
+    mtime = path.stat().st_mtime_ns
+
+    assert not write_if_changed(path, "content")
+    assert path.stat().st_mtime_ns == mtime
+
+    assert write_if_changed(path, "new content")
+    assert path.read_text() == "new content"
+    assert [p.name for p in path.parent.iterdir()] == ["mighty.py"]
+
+
+def test_atomic_write_failure(tmp_path: Path) -> None:
+    """A failing write leaves the previous content in place, and no temporary file behind."""
+    path = tmp_path / "mighty.py"
+    path.write_text("content")
+    path.chmod(0o640)
+
+    with patch.object(Path, "replace", side_effect=OSError("disk full")), pytest.raises(OSError, match="disk full"):
+        atomic_write(path, "new content")
+
+    assert path.read_text() == "content"
+    assert list(tmp_path.iterdir()) == [path]
+
+    atomic_write(path, "new content")
+    assert path.read_text() == "new content"
+    assert path.stat().st_mode & 0o777 == 0o640  # noqa: PLR2004
+
+
+def test_write_many(tmp_path: Path) -> None:
+    (tmp_path / "blocked").write_text("not a folder")
+    files = {
+        str(tmp_path / "a" / "first.py"): "first",
+        str(tmp_path / "a" / "second.py"): "second",
+        str(tmp_path / "b" / "third.py"): "third",
+        str(tmp_path / "blocked" / "fourth.py"): "fourth",
+    }
+
+    with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir:
+        results = write_many(files)
+
+    assert mkdir.call_count == 3  # One per distinct folder  # noqa: PLR2004
+    assert list(results) == list(files)
+    assert [results[path] for path in list(files)[:3]] == [True, True, True]
+    assert isinstance(results[str(tmp_path / "blocked" / "fourth.py")], OSError)
+
+    files[str(tmp_path / "a" / "second.py")] = "new second"
+    results = write_many(dict(list(files.items())[:3]))
+
+    assert list(results.values()) == [False, True, False]
+    assert (tmp_path / "a" / "second.py").read_text() == "new second"